@@ -0,0 +1,108 @@
+""" benchmark of CycleGuard on deep payloads and long reference chains
+
+usage: python benchmarks/bench_cycle_guard.py [depth]
+"""
+from pyswagg import App, utils
+import sys
+import os
+import json
+import shutil
+import tempfile
+import threading
+import timeit
+
+
+def _create(definitions):
+    folder = tempfile.mkdtemp()
+    try:
+        path = os.path.join(folder, 'swagger.json')
+        with open(path, 'w') as f:
+            json.dump({
+                'swagger': '2.0',
+                'info': {'title': 'bench', 'version': '1.0'},
+                'paths': {},
+                'definitions': definitions,
+            }, f)
+        return App.create(path, strict=False)
+    finally:
+        shutil.rmtree(folder)
+
+
+def bench_produce(depth):
+    """ produce a linked-list style payload with a recursive Schema """
+    app = _create({
+        'Node': {
+            'type': 'object',
+            'properties': {
+                'value': {'type': 'integer'},
+                'next': {'$ref': '#/definitions/Node'},
+            }
+        }
+    })
+
+    payload = {'value': 0}
+    for i in range(1, depth):
+        payload = {'value': i, 'next': payload}
+
+    s = app.resolve('#/definitions/Node')
+    begin = timeit.default_timer()
+    app.prim_factory.produce(s, payload)
+    return timeit.default_timer() - begin
+
+
+def bench_produce_flat(depth):
+    """ produce a flat payload, an array of Model(s) of primitives """
+    app = _create({
+        'Item': {
+            'type': 'object',
+            'properties': {
+                'id': {'type': 'integer'},
+                'name': {'type': 'string'},
+                'price': {'type': 'number'},
+            }
+        },
+        'Items': {
+            'type': 'array',
+            'items': {'$ref': '#/definitions/Item'},
+        }
+    })
+
+    payload = [{'id': i, 'name': str(i), 'price': 1.5} for i in range(depth)]
+
+    s = app.resolve('#/definitions/Items')
+    begin = timeit.default_timer()
+    app.prim_factory.produce(s, payload)
+    return timeit.default_timer() - begin
+
+
+class _Ref(object):
+    """ an object referring to another one, like a Schema with $ref """
+
+    def __init__(self, ref_obj=None):
+        self.ref_obj = ref_obj
+
+
+def bench_deref(depth):
+    """ dereference a long chain of references """
+    s = _Ref()
+    for _ in range(depth):
+        s = _Ref(s)
+
+    begin = timeit.default_timer()
+    utils.deref(s)
+    return timeit.default_timer() - begin
+
+
+def main(depth):
+    # nested values are produced recursively
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), depth * 10))
+
+    for fn in (bench_produce, bench_produce_flat, bench_deref):
+        print('{0}(depth={1}): {2:.3f} sec'.format(fn.__name__, depth, fn(depth)))
+
+
+if __name__ == '__main__':
+    threading.stack_size(512 * 1024 * 1024)
+    t = threading.Thread(target=main, args=(int(sys.argv[1]) if len(sys.argv) > 1 else 10000,))
+    t.start()
+    t.join()
@@ -0,0 +1,62 @@
+""" benchmark of loading and preparing an App eagerly and lazily, for
+synthetic specs of different sizes with only 1% of Operations used.
+
+usage: python benchmarks/bench_lazy.py [count of definitions ...]
+"""
+from pyswagg import App
+from bench_parse import synthetic_spec
+import os
+import sys
+import json
+import shutil
+import tempfile
+import timeit
+import tracemalloc
+
+
+# (parse definitions lazily, prepare lazily)
+MODES = [(False, False), (False, True), (True, True)]
+
+
+def run(path, lazy_load, lazy_prepare, used):
+    """ seconds to load, to prepare, and to access 'used' Operations """
+    begin = timeit.default_timer()
+    app = App.load(path, lazy=lazy_load)
+    loaded = timeit.default_timer()
+    app.prepare(lazy=lazy_prepare)
+    prepared = timeit.default_timer()
+    for i in range(used):
+        app.op['getModel{0}'.format(i)]
+    return app, (loaded - begin, prepared - loaded, timeit.default_timer() - prepared)
+
+
+def bench(path, lazy_load, lazy_prepare, used):
+    """ timings of 'run', and memory allocated in MB by it, measured in another run """
+    _, t = run(path, lazy_load, lazy_prepare, used)
+
+    tracemalloc.start()
+    app, _ = run(path, lazy_load, lazy_prepare, used)
+    size = tracemalloc.get_traced_memory()[0] / 1e6
+    tracemalloc.stop()
+    return t + (size,)
+
+
+def main(counts):
+    folder = tempfile.mkdtemp()
+    try:
+        for count in counts:
+            path = os.path.join(folder, 'swagger{0}.json'.format(count))
+            with open(path, 'w') as f:
+                json.dump(synthetic_spec(count), f)
+
+            used = max(count // 100, 1)
+            for lazy_load, lazy_prepare in MODES:
+                print('{0} definitions, load {1}, prepare {2}: load {4:.3f} s, prepare {5:.3f} s, access {3} operations {6:.3f} s, {7:.1f} MB'.format(
+                    count, 'lazy' if lazy_load else 'eager', 'lazy' if lazy_prepare else 'eager', used,
+                    *bench(path, lazy_load, lazy_prepare, used)))
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == '__main__':
+    main([int(c) for c in sys.argv[1:]] or [1000, 5000, 20000])
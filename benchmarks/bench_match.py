@@ -0,0 +1,48 @@
+""" benchmark of matching requests to Operation(s) with PathTrie, compared
+with looping over every path template, for different counts of Operations.
+
+usage: python benchmarks/bench_match.py [count of operations ...]
+"""
+from pyswagg import utils
+import re
+import sys
+import timeit
+
+
+def templates(count):
+    """ path templates with a literal prefix and a templated segment """
+    return ['/v1/model{0}/{{id}}/items/{{item}}'.format(i) for i in range(count)]
+
+
+def loop_over(ts):
+    """ what's done without a trie, a regex for each template """
+    regexes = [(re.compile('^' + re.sub(r'{([^{}/]+)}', r'(?P<\1>[^/]+)', t) + '$'), t) for t in ts]
+
+    def match(path):
+        for r, t in regexes:
+            m = r.match(path)
+            if m:
+                return t, m.groupdict()
+    return match
+
+
+def main(counts):
+    for count in counts:
+        ts = templates(count)
+        trie = utils.PathTrie()
+        for t in ts:
+            trie.add('get', t, t)
+        loop = loop_over(ts)
+
+        # the worst case of looping, the last template
+        path = '/v1/model{0}/42/items/7'.format(count - 1)
+        assert trie.match('get', path)[0] == loop(path)[0]
+
+        n = 1000
+        t_trie = min(timeit.repeat(lambda: trie.match('get', path), number=n, repeat=3)) / n
+        t_loop = min(timeit.repeat(lambda: loop(path), number=n, repeat=3)) / n
+        print('{0} operations: trie {1:.2f} us, loop {2:.2f} us'.format(count, t_trie * 1e6, t_loop * 1e6))
+
+
+if __name__ == '__main__':
+    main([int(c) for c in sys.argv[1:]] or [10, 100, 1000, 10000])
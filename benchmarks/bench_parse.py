@@ -0,0 +1,92 @@
+""" benchmark of parsing Swagger 2.0 documents into spec objects,
+for bundled test specs and a large synthetic spec.
+
+usage: python benchmarks/bench_parse.py [count of definitions]
+"""
+from pyswagg.spec.v2_0.parser import SwaggerContext
+import os
+import sys
+import json
+import timeit
+
+
+DATA = os.path.join(os.path.dirname(__file__), '..', 'pyswagg', 'tests', 'data', 'v2_0')
+
+
+def bundled_specs():
+    """ json documents of Swagger 2.0 in test data """
+    ret = []
+    for root, _, files in os.walk(DATA):
+        for f in files:
+            if not f.endswith('.json'):
+                continue
+            with open(os.path.join(root, f)) as fp:
+                try:
+                    obj = json.load(fp)
+                except ValueError:
+                    continue
+            if isinstance(obj, dict) and obj.get('swagger', None) == '2.0':
+                ret.append(obj)
+    return ret
+
+
+def synthetic_spec(count):
+    """ a spec with 'count' definitions and one path for each of them """
+    spec = {
+        'swagger': '2.0',
+        'info': {'title': 'synthetic', 'version': '1.0'},
+        'paths': {},
+        'definitions': {
+            'Owner': {'type': 'object', 'properties': {'name': {'type': 'string'}}},
+        },
+    }
+    for i in range(count):
+        name = 'Model{0}'.format(i)
+        spec['definitions'][name] = {
+            'type': 'object',
+            'required': ['id'],
+            'properties': {
+                'id': {'type': 'integer', 'format': 'int64'},
+                'name': {'type': 'string'},
+                'tags': {'type': 'array', 'items': {'type': 'string'}},
+                'owner': {'$ref': '#/definitions/Owner'},
+            },
+        }
+        spec['paths']['/model{0}/{{id}}'.format(i)] = {
+            'parameters': [{'name': 'id', 'in': 'path', 'type': 'integer', 'required': True}],
+            'get': {
+                'operationId': 'get' + name,
+                'tags': ['group{0}'.format(i % 100)],
+                'parameters': [{'name': 'q', 'in': 'query', 'type': 'string'}],
+                'responses': {
+                    '200': {'description': 'ok', 'schema': {'$ref': '#/definitions/' + name}},
+                    'default': {'description': 'error', 'headers': {'X-Rate': {'type': 'integer'}}},
+                },
+            },
+        }
+    return spec
+
+
+def parse(obj):
+    tmp = {'_tmp_': {}}
+    with SwaggerContext(tmp, '_tmp_') as ctx:
+        ctx.parse(obj)
+    return tmp['_tmp_']
+
+
+def bench(specs, number):
+    """ seconds to parse all specs once """
+    return min(timeit.repeat(lambda: [parse(s) for s in specs], number=number, repeat=3)) / number
+
+
+def main(count):
+    specs = bundled_specs()
+    print('bundled: {0} specs, {1:.2f} ms'.format(len(specs), bench(specs, 20) * 1e3))
+
+    spec = synthetic_spec(count)
+    t = bench([spec], 1)
+    print('synthetic: {0} definitions, {1:.3f} s, {2:.0f} definitions/s'.format(count, t, count / t))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
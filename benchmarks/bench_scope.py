@@ -0,0 +1,34 @@
+""" benchmark of looking up Operation(s) from ScopeDict by short names,
+full names, scoped tuples and missing names.
+
+usage: python benchmarks/bench_scope.py [count of keys]
+"""
+from pyswagg import utils
+import sys
+import timeit
+
+
+def main(count):
+    d = utils.ScopeDict(('tag{0}!##!getModel{1}'.format(i % 30, i), i) for i in range(count))
+    d.sep = '!##!'
+
+    for name, key in [
+        ('full name', 'tag7!##!getModel7'),
+        ('short name', 'getModel7'),
+        ('tuple', ('tag7', 'getModel7')),
+        ('miss', 'getNothing'),
+    ]:
+        def lookup():
+            try:
+                d[key]
+            except KeyError:
+                pass
+
+        lookup()
+        n = 10000 if name == 'full name' else 1000
+        t = min(timeit.repeat(lookup, number=n, repeat=3)) / n
+        print('{0}: {1} keys, {2:.2f} us'.format(name, count, t * 1e6))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3000)
@@ -0,0 +1,70 @@
+""" benchmark of memory per object and attribute access of spec objects
+
+usage: python benchmarks/bench_spec_objects.py [count]
+"""
+from pyswagg.spec.v2_0.parser import SchemaContext, ParameterContext, OperationContext
+import sys
+import gc
+import timeit
+import tracemalloc
+
+
+CASES = [
+    ('Schema', SchemaContext, {
+        'type': 'object',
+        'required': ['id'],
+        'description': 'a pet',
+    }, ['type', 'format', 'properties', 'ref_obj']),
+    ('Parameter', ParameterContext, {
+        'name': 'id',
+        'in': 'query',
+        'type': 'integer',
+        'required': True,
+    }, ['name', 'type', 'required', 'final']),
+    ('Operation', OperationContext, {
+        'operationId': 'getPet',
+        'summary': 'get a pet',
+        'produces': ['application/json'],
+    }, ['operationId', 'produces', 'parameters', 'method']),
+]
+
+
+def _parse(ctx, data):
+    tmp = {'_tmp_': {}}
+    with ctx(tmp, '_tmp_') as c:
+        c.parse(dict(data))
+    return tmp['_tmp_']
+
+
+def bench_memory(ctx, data, count):
+    """ bytes allocated for each object """
+    gc.collect()
+    tracemalloc.start()
+    begin, _ = tracemalloc.get_traced_memory()
+    objs = [_parse(ctx, data) for _ in range(count)]
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # exclude the list holding them
+    return float(end - begin - sys.getsizeof(objs)) / len(objs)
+
+
+def bench_access(ctx, data, names, count):
+    """ seconds for each attribute access """
+    obj = _parse(ctx, data)
+    stmt = '; '.join('o.{0}'.format(n) for n in names)
+    t = min(timeit.repeat(stmt, globals=dict(o=obj), number=count, repeat=5))
+    return t / (count * len(names))
+
+
+def main(count):
+    for name, ctx, data, names in CASES:
+        print('{0}: {1:.0f} bytes/object, {2:.1f} ns/access'.format(
+            name,
+            bench_memory(ctx, data, count),
+            bench_access(ctx, data, names, count) * 1e9
+        ))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
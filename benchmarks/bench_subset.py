@@ -0,0 +1,49 @@
+""" benchmark of creating an App with subsets of a synthetic spec, selected by
+tags, each tag is attached to 1% of Operations.
+
+usage: python benchmarks/bench_subset.py [count of definitions]
+"""
+from pyswagg import App
+from pyswagg.subset import Subset
+from bench_parse import synthetic_spec
+import os
+import sys
+import json
+import shutil
+import tempfile
+import timeit
+import tracemalloc
+
+
+def bench(path, subset):
+    """ seconds to create an App, and memory allocated in MB by it, measured in another run """
+    begin = timeit.default_timer()
+    App.create(path, subset=subset)
+    t = timeit.default_timer() - begin
+
+    tracemalloc.start()
+    app = App.create(path, subset=subset)
+    size = tracemalloc.get_traced_memory()[0] / 1e6
+    tracemalloc.stop()
+    return len(app.op), t, size
+
+
+def main(count):
+    folder = tempfile.mkdtemp()
+    try:
+        path = os.path.join(folder, 'swagger.json')
+        with open(path, 'w') as f:
+            json.dump(synthetic_spec(count), f)
+
+        for name, subset in [
+            ('all', None),
+            ('10%', Subset(tags=['group{0}'.format(i) for i in range(10)])),
+            ('1%', Subset(tags=['group0'])),
+        ]:
+            print('{0}: {1} operations, {2:.3f} s, {3:.1f} MB'.format(name, *bench(path, subset)))
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
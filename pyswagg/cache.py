@@ -0,0 +1,184 @@
+from __future__ import absolute_import
+from .utils import jp_split, JsonPointerTrie
+from .spec.base import BaseObj
+import six
+import threading
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+class SharedCache(object):
+    """ a thread-safe cache shared by Resolver(s) and App(s) in one process,
+    external documents referenced by many Apps are loaded, parsed and prepared once.
+
+    - loaded json/yaml is shared by Resolver(s)
+    - prepared objects are shared by App(s), only those not referring to any
+      object owned by an App, ex. objects of its root document.
+
+    Everything cached here should be read-only.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+
+        # a map from url to (loaded json/yaml, size in bytes, content hash)
+        self.__raw = {}
+
+        # a map from url to
+        # - spec.BaseObj
+        # - utils.JsonPointerTrie, a map from json-pointer to spec.BaseObj
+        self.__objs = {}
+
+        # a map from url to urls it depends on, through prepared objects
+        self.__deps = {}
+
+        self.__stats = dict(raw_hits=0, raw_misses=0, obj_hits=0, obj_misses=0, bytes_saved=0)
+
+    def get_raw(self, url):
+        """ loaded json/yaml of 'url'
+
+        :param str url: the location used to load the document
+        :return: the document, with its size and content hash, None when missing.
+        :rtype: tuple of (dict, int, str)
+        """
+        with self.__lock:
+            ret = self.__raw.get(url, None)
+            if ret:
+                self.__stats['raw_hits'] += 1
+                self.__stats['bytes_saved'] += ret[1] or 0
+            else:
+                self.__stats['raw_misses'] += 1
+            return ret
+
+    def put_raw(self, url, obj, size=None, digest=None):
+        """ share loaded json/yaml, the first one is kept when already shared.
+
+        :param str url: the location used to load the document
+        :param dict obj: the document
+        :param int size: size in bytes of the document
+        :param str digest: content hash of the document
+        :return: the shared document
+        :rtype: dict
+        """
+        with self.__lock:
+            return self.__raw.setdefault(url, (obj, size, digest))[0]
+
+    def get_obj(self, url, jp):
+        """ a prepared object
+
+        :param str url: the location used to load the document
+        :param str jp: JSON pointer to the object
+        :return: the object, None when missing.
+        :rtype: spec.BaseObj
+        """
+        obj = None
+        with self.__lock:
+            o = self.__objs.get(url, None)
+            if isinstance(o, BaseObj):
+                obj = o.resolve(jp_split(jp)[1:])
+            elif isinstance(o, JsonPointerTrie):
+                found = o.longest_prefix(jp)
+                if found:
+                    obj = found[0].resolve(found[1])
+
+            if obj == None:
+                self.__stats['obj_misses'] += 1
+            else:
+                # parsing and preparing of the document is skipped
+                self.__stats['obj_hits'] += 1
+                self.__stats['bytes_saved'] += (self.__raw.get(url, None) or (None, 0))[1] or 0
+        return obj
+
+    def put_obj(self, url, jp, obj, deps=None):
+        """ share a prepared object, the first one is kept when already shared.
+
+        :param str url: the location used to load the document
+        :param str jp: JSON pointer to the object
+        :param spec.BaseObj obj: the object
+        :param set deps: urls of documents referred by this object
+        :return: the shared object
+        :rtype: spec.BaseObj
+        """
+        with self.__lock:
+            o = self.__objs.get(url, None)
+            if o == None:
+                if jp == '#':
+                    self.__objs[url] = obj
+                else:
+                    o = self.__objs[url] = JsonPointerTrie()
+                    o[jp] = obj
+            elif isinstance(o, BaseObj):
+                found = o.resolve(jp_split(jp)[1:])
+                return obj if found == None else found
+            elif jp in o:
+                return o[jp]
+            elif jp == '#':
+                # the whole document, replace those fragments
+                self.__objs[url] = obj
+            else:
+                o[jp] = obj
+
+            self.__deps.setdefault(url, set()).update(deps or [])
+            return obj
+
+    def invalidate(self, urls=None):
+        """ drop shared documents and objects, along with those depending on them.
+
+        :param list urls: urls of documents, all of them when None
+        :return: urls of dropped documents
+        :rtype: set of str
+        """
+        with self.__lock:
+            if urls == None:
+                dropped = set(self.__raw.keys()) | set(self.__objs.keys())
+            else:
+                dropped, found = set(urls), True
+                while found:
+                    found = False
+                    for u, d in six.iteritems(self.__deps):
+                        if u not in dropped and not d.isdisjoint(dropped):
+                            dropped.add(u)
+                            found = True
+
+            for u in dropped:
+                self.__raw.pop(u, None)
+                self.__objs.pop(u, None)
+                self.__deps.pop(u, None)
+
+        logger.info('invalidate shared documents: {0}'.format(sorted(dropped)))
+        return dropped
+
+    def clear(self):
+        """ drop everything, including statistics
+        """
+        self.invalidate()
+        with self.__lock:
+            for k in self.__stats:
+                self.__stats[k] = 0
+
+    @property
+    def stats(self):
+        """ statistics of this cache
+        - raw_hits/raw_misses: lookups of loaded json/yaml
+        - obj_hits/obj_misses: lookups of prepared objects
+        - hit_rate: ratio of hits among all lookups
+        - bytes_saved: total size of documents not loaded again, or not parsed
+          and prepared again, which is also an estimation of memory not duplicated.
+        - documents: count of shared documents
+
+        :type: dict
+        """
+        with self.__lock:
+            ret = dict(self.__stats)
+            ret['documents'] = len(set(self.__raw.keys()) | set(self.__objs.keys()))
+
+        lookups = ret['raw_hits'] + ret['raw_misses'] + ret['obj_hits'] + ret['obj_misses']
+        ret['hit_rate'] = float(ret['raw_hits'] + ret['obj_hits']) / lookups if lookups else 0.0
+        return ret
+
+
+# the process-wide cache, Apps opt into it by
+# App.create(url, shared_cache=default_cache)
+default_cache = SharedCache()
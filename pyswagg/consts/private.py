@@ -4,6 +4,14 @@ SCHEMA_PATH = 'path'
 FILE_EXT_JSON = 'json'
 FILE_EXT_YAML = 'yaml'
 FILE_EXT_YML = 'yml'
+FILE_EXT_GZ = 'gz'
+
+ARCHIVE_EXTS = [
+    '.zip',
+    '.tar',
+    '.tar.gz',
+    '.tgz',
+]
 
 VALID_FILE_EXT = [
     '.'+FILE_EXT_JSON,
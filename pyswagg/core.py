@@ -1,15 +1,22 @@
 from __future__ import absolute_import
-from .resolve import Resolver
+from .resolve import Resolver, CachePolicy
+from .getter import locate_in_archive
 from .primitives import Primitive, MimeCodec
 from .spec.v1_2.parser import ResourceListContext
-from .spec.v2_0.parser import SwaggerContext
-from .spec.v2_0.objects import Operation
-from .spec.base import BaseObj
-from .scan import Scanner
-from .scanner import TypeReduce, CycleDetector
+from .spec.v2_0.parser import SwaggerContext, PathItemContext
+from .spec.v2_0.objects import Operation, PathItem
+from .spec.base import BaseObj, ContainerType
+from .scan import Scanner, Pipeline, NodeIndex, default_tree_traversal, shallow_traversal
+from .snapshot import SNAPSHOT_FORMAT, snapshot_path, read_snapshot, write_snapshot
+from .scanner import TypeReduce, CycleDetector, CycleDetection
 from .scanner.v1_2 import Upgrade
 from .scanner.v2_0 import AssignParent, Merge, Resolve, PatchObject, YamlFixer, Aggregate, NormalizeRef
 from pyswagg import utils, errs, consts
+import pyswagg
+import collections
+import threading
+import inspect
+import timeit
 import copy
 import base64
 import six
@@ -33,7 +40,7 @@ class App(object):
         sc_path: ('/', '#/paths')
     }
 
-    def __init__(self, url=None, url_load_hook=None, sep=consts.private.SCOPE_SEPARATOR, prim=None, mime_codec=None, resolver=None):
+    def __init__(self, url=None, url_load_hook=None, sep=consts.private.SCOPE_SEPARATOR, prim=None, mime_codec=None, resolver=None, max_workers=1, shared_cache=None):
         """ constructor
 
         :param url str: url of swagger.json
@@ -41,29 +48,25 @@ class App(object):
         :param sep str: separator used by pyswagger.utils.ScopeDict
         :param prim pyswagg.primitives.Primitive: factory for primitives in Swagger.
         :param resolver: pyswagg.resolve.Resolver: customized resolver used as default when none is provided when resolving
+        :param int max_workers: maximum number of documents loaded concurrently by the default resolver
+        :param shared_cache pyswagg.cache.SharedCache: cache of documents and prepared objects shared with other Apps
         """
 
         logger.info('init with url: {0}'.format(url))
 
-        self.__root = None
-        self.__raw = None
-        self.__version = ''
-
-        self.__op = None
-        self.__m = None
-        self.__schemes = []
+        # everything loaded and prepared, replaced as a whole when reloaded
+        self.__state = _State()
         self.__url=url
 
-        # a map from json-reference to
-        # - spec.BaseObj
-        # - a map from json-pointer to spec.BaseObj
-        self.__objs = {}
-
         if url_load_hook and resolver:
             raise ValueError('when use customized Resolver, please pass url_load_hook to that one')
+        if max_workers != 1 and resolver:
+            raise ValueError('when use customized Resolver, please pass max_workers to that one')
+        if shared_cache and resolver:
+            raise ValueError('when use customized Resolver, please pass shared_cache to that one')
 
         # the start-point when you want to traverse the code to laod new object
-        self.__resolver = resolver or Resolver(url_load_hook)
+        self.__resolver = resolver or Resolver(url_load_hook, max_workers=max_workers, shared_cache=shared_cache)
 
         # allow init App-wised SCOPE_SEPARATOR
         self.__sep = sep
@@ -74,6 +77,16 @@ class App(object):
         # MIME codec
         self.__mime_codec = mime_codec or MimeCodec()
 
+        # how this App is loaded and prepared, used when reloading
+        self.__getter = None
+        self.__parser = None
+        self.__stream = False
+        self.__lazy_parse = False
+        self.__subset = None
+        self.__strict = True
+        self.__cycle_detection = CycleDetection.eager_
+        self.__reload_lock = threading.Lock()
+
     @property
     def root(self):
         """ schema representation of Swagger API, its structure may
@@ -84,7 +97,7 @@ class App(object):
 
         :type: pyswagg.spec.v2_0.objects.Swagger
         """
-        return self.__root
+        return self.__state.root
 
     @property
     def raw(self):
@@ -93,7 +106,7 @@ class App(object):
 
         :type: ex. when loading Swagger 1.2, the type is pyswagg.spec.v1_2.objects.ResourceList
         """
-        return self.__raw
+        return self.__state.raw
 
     @property
     def op(self):
@@ -108,7 +121,7 @@ class App(object):
 
         :type: pyswagg.utils.ScopeDict of pyswagg.spec.v2_0.objects.Operation
         """
-        return self.__op
+        return self.__state.op
 
     @property
     def m(self):
@@ -120,7 +133,7 @@ class App(object):
 
         :type: pyswagg.utils.ScopeDict
         """
-        return self.__m
+        return self.__state.m
 
     @property
     def version(self):
@@ -128,7 +141,7 @@ class App(object):
 
         :type: str
         """
-        return self.__version
+        return self.__state.version
 
     @property
     def schemes(self):
@@ -136,7 +149,7 @@ class App(object):
 
         :type: list of str, ex. ['http', 'https']
         """
-        return self.__schemes
+        return self.__state.schemes
 
     @property
     def url(self):
@@ -144,6 +157,64 @@ class App(object):
         """
         return self.__url
 
+    @property
+    def index(self):
+        """ flat index of objects under root, grouped by classes. ex. to go through
+        all Schema objects:
+
+        .. code-block:: python
+
+            for path, schema in app.index.nodes(Schema):
+                pass
+
+        For an App prepared lazily, objects are prepared before returned by 'get', and
+        the whole App is prepared before going through it, refer to App.warm_up.
+
+        :type: pyswagg.scan.NodeIndex
+        """
+        st = self.__state
+        return st.lazy.index if st.lazy != None else st.index
+
+    @property
+    def cycles(self):
+        """ cycles among references in this App, a map from 'schema', 'parameter',
+        'response' and 'path_item' to list of cycles. Each cycle is a list of JSON
+        references, started and ended with the minimum one.
+
+        Depends on how this App is prepared, they might be detected on the first access,
+        or wait until the detection in background is done. When prepared lazily, the whole
+        App is prepared first, refer to App.warm_up.
+
+        :type: dict of str to list of lists
+        """
+        self.warm_up()
+        st = self.__state
+        if st.cycle_detector == None:
+            # ex. restored from snapshot
+            cy = CycleDetector()
+            Scanner(self).scan(route=[cy], root=st.root)
+            st.cycle_detector = cy
+
+        return st.cycle_detector.cycles
+
+    @property
+    def timing(self):
+        """ time spent in each stage of preparation, in seconds. Time to prepare
+        external documents is also counted in the stage triggering the loading.
+
+        :type: collections.OrderedDict of str to float
+        """
+        return self.__state.timing
+
+    def __update_timing(self, pipeline):
+        """ accumulate timing of a finished Pipeline
+        """
+        for k, v in six.iteritems(pipeline.timing):
+            self.__state.timing[k] = self.__state.timing.get(k, 0) + v
+
+        for names, t in pipeline.passes:
+            logger.info('pass [{0}] takes {1:.6f} sec'.format(', '.join(names), t))
+
     @property
     def prim_factory(self):
         """ primitive factory used by this app
@@ -160,24 +231,70 @@ class App(object):
         """
         return self.__mime_codec
 
-    def load_obj(self, jref, getter=None, parser=None):
+    def load_obj(self, jref, getter=None, parser=None, stream=False, lazy=False, subset=None):
         """ load a object(those in spec._version_.objects) from a JSON reference.
+
+        :param bool stream: the document of 'jref' is not cached by resolver, and
+         parsed along loading when it's a Swagger 2.0 json document and ijson is installed:
+         members of 'paths', 'definitions', ... are built one by one, their raw json
+         are dropped once built. Otherwise, its raw json is dropped subtree by subtree
+         during parsing. Only applied to the whole document, ie. the JSON pointer of
+         'jref' is '#', and not along with 'subset'.
+        :param bool lazy: Schema Object(s) under '#/definitions' of a Swagger 2.0 document
+         are placeholders, parsed on their first access.
+        :param pyswagg.subset.Subset subset: only a slice of a Swagger 2.0 document is parsed
         """
-        obj = self.__resolver.resolve(jref, getter)
+        url, jp = utils.jr_split(jref)
+        tmp = {'_tmp_': {}}
+
+        consume, obj, refs = False, None, None
+        if stream and jp == '#':
+            items = None
+            if not subset:
+                refs = set()
+                keys = [k for k, (ct, _) in six.iteritems(SwaggerContext.__swagger_child__) if ct == ContainerType.dict_]
+                items = self.__resolver.stream(url, keys, refs, getter)
+
+            if items != None:
+                # parsed along streaming, once it's known as a Swagger 2.0 document
+                with SwaggerContext(tmp, '_tmp_') as ctx:
+                    ctx._lazy = ('definitions',) if lazy else ()
+                    obj = ctx.parse_items(items, accept=lambda o: utils.get_swagger_version(o) == '2.0')
+                    if obj != None:
+                        ctx._obj = None
+                consume = True
+            else:
+                obj, consume = self.__resolver.load(url, getter)
+        else:
+            obj = self.__resolver.resolve(jref, getter)
 
         # get root document to check its swagger version.
-        tmp = {'_tmp_': {}}
-        version = utils.get_swagger_version(obj)
+        version = utils.get_swagger_version(obj) if obj != None else '2.0'
+        if subset and version != '2.0':
+            raise NotImplementedError('Subset is only supported for Swagger 2.0, not: {0}'.format(version))
+
         if version == '1.2':
             # swagger 1.2
             with ResourceListContext(tmp, '_tmp_') as ctx:
                 ctx.parse(obj, jref, self.__resolver, getter)
         elif version == '2.0':
-            # swagger 2.0
-            with SwaggerContext(tmp, '_tmp_') as ctx:
-                ctx.parse(obj)
+            # the cached document is not modified, only the subset is parsed
+            if subset:
+                obj = subset.apply(obj, url)
+
+            # load external documents before parsing, it might be done concurrently,
+            # depends on the resolver.
+            self.__resolver.prefetch(jref, raw=obj if stream or subset else None, refs=refs if obj == None else None)
+
+            # swagger 2.0, unless it's parsed along streaming
+            if obj != None:
+                with SwaggerContext(tmp, '_tmp_') as ctx:
+                    ctx._consume = consume
+                    ctx._lazy = ('definitions',) if lazy else ()
+                    ctx.parse(obj)
         elif version == None and parser:
             with parser(tmp, '_tmp_') as ctx:
+                ctx._consume = consume
                 ctx.parse(obj)
 
             version = tmp['_tmp_'].__swagger_version__ if hasattr(tmp['_tmp_'], '__swagger_version__') else version
@@ -202,43 +319,85 @@ class App(object):
         if self.version == '1.2':
             # upgrade from 1.2 to 2.0
             converter = Upgrade(self.__sep)
-            s.scan(root=obj, route=[converter])
+            p = Pipeline(s).add('upgrade', [converter])
+            p.run(obj)
+            self.__update_timing(p)
             obj = converter.swagger
 
             if not obj:
                 raise Exception('unable to upgrade from 1.2: {0}'.format(jref))
 
-            s.scan(root=obj, route=[AssignParent()])
+        url, jp = utils.jr_split(jref)
+        # cache this object
+        self.__cache_obj(url, jp, obj)
+
+        # not shared until all objects it refers are known
+        pending = url not in self.__state.private
+        self.__state.private.add(url)
 
+        # objects of the root document are indexed while traversing,
+        # local references could be resolved by a lookup.
+        p = Pipeline(s, index=self.__state.index if url == self.__url and jp == '#' else None)
+        if self.version == '1.2':
+            p.add('assign_parent', [AssignParent()])
         # fix for yaml that treat response code as number
-        s.scan(root=obj, route=[YamlFixer()], leaves=[Operation])
+        p.add('yaml_fixer', [YamlFixer()], leaves=[Operation])
         # normalize $ref
-        url, jp = utils.jr_split(jref)
-        s.scan(root=obj, route=[NormalizeRef(url)])
-        # cache this object
-        if url not in self.__objs:
+        p.add('normalize_ref', [NormalizeRef(url)])
+        # pre resolve Schema Object, only the $ref of the object itself
+        # should be normalized.
+        # note: make sure this object is cached before using 'Resolve' scanner
+        p.add('resolve', [Resolve()])
+        p.run(obj)
+        self.__update_timing(p)
+
+        if pending:
+            self.__share_obj(url, jp, obj)
+
+        return obj
+
+    def __cache_obj(self, url, jp, obj):
+        """ cache an object by its JSON reference
+        """
+        if url not in self.__state.objs:
             if jp == '#':
-                self.__objs[url] = obj
+                self.__state.objs[url] = obj
             else:
-                self.__objs[url] = {jp: obj}
+                self.__state.objs[url] = utils.JsonPointerTrie()
+                self.__state.objs[url][jp] = obj
         else:
-            if not isinstance(self.__objs[url], dict):
+            if not isinstance(self.__state.objs[url], utils.JsonPointerTrie):
                 raise Exception('it should be able to resolve with BaseObj')
-            self.__objs[url].update({jp: obj})
-
-        # pre resolve Schema Object
-        # note: make sure this object is cached before using 'Resolve' scanner
-        s.scan(root=obj, route=[Resolve()])
-        return obj
-
-    def _validate(self):
-        """ check if this Swagger API valid or not.
+            self.__state.objs[url][jp] = obj
 
-        :param bool strict: when in strict mode, exception would be raised if not valid.
-        :return: validation errors
-        :rtype: list of tuple(where, type, msg).
+    def __share_obj(self, url, jp, obj):
+        """ share a prepared object with other Apps, when it doesn't refer
+        to any object owned by this App.
+        """
+        shared = self.__resolver.shared_cache
+        if not shared or url == self.__url:
+            return
+
+        deps = set()
+        for _, o in default_tree_traversal(obj, []):
+            r = getattr(o, '$ref', None)
+            if not r:
+                continue
+
+            ru, rjp = utils.jr_split(r)
+            if ru == url and (jp == '#' or (rjp + '/').startswith(jp + '/')):
+                # inside this object
+                continue
+            if ru == self.__url or ru in self.__state.private:
+                return
+            deps.add(self.__resolver.location(ru))
+
+        self.__state.private.discard(url)
+        shared.put_obj(self.__resolver.location(url), jp, obj, deps)
+
+    def __validator(self):
+        """ the validation scanner for this version of spec
         """
-
         v_mod = utils.import_string('.'.join([
             'pyswagg',
             'scanner',
@@ -249,16 +408,27 @@ class App(object):
         if not v_mod:
             # there is no validation module
             # for this version of spec
+            return None
+
+        return v_mod.Validate()
+
+    def _validate(self):
+        """ check if this Swagger API valid or not.
+
+        :param bool strict: when in strict mode, exception would be raised if not valid.
+        :return: validation errors
+        :rtype: list of tuple(where, type, msg).
+        """
+        v = self.__validator()
+        if not v:
             return []
 
         s = Scanner(self)
-        v = v_mod.Validate()
-
-        s.scan(route=[v], root=self.__raw)
+        s.scan(route=[v], root=self.__state.raw)
         return v.errs
 
     @classmethod
-    def load(kls, url, getter=None, parser=None, url_load_hook=None, sep=consts.private.SCOPE_SEPARATOR, prim=None, mime_codec=None, resolver=None):
+    def load(kls, url, getter=None, parser=None, url_load_hook=None, sep=consts.private.SCOPE_SEPARATOR, prim=None, mime_codec=None, resolver=None, max_workers=1, stream=False, shared_cache=None, lazy=False, subset=None):
         """ load json as a raw App
 
         :param str url: url of path of Swagger API definition
@@ -272,19 +442,31 @@ class App(object):
         :param prim pyswagger.primitives.Primitive: factory for primitives in Swagger
         :param mime_codec pyswagg.primitives.MimeCodec: MIME codec
         :param resolver: pyswagg.resolve.Resolver: customized resolver used as default when none is provided when resolving
+        :param int max_workers: maximum number of documents loaded concurrently, ex. resources in Swagger 1.2
+        :param bool stream: lower the peak memory usage when loading a large Swagger 2.0 document, it's not
+         cached by resolver and its raw json is released subtree by subtree once parsed.
+        :param shared_cache pyswagg.cache.SharedCache: cache of documents and prepared objects shared with other Apps,
+         ex. pyswagg.cache.default_cache
+        :param bool lazy: Schema Object(s) under '#/definitions' are kept as placeholders of their json, and parsed
+         when first accessed or traversed. Dumping, comparing and validating behave the same as they are parsed eagerly.
+        :param pyswagg.subset.Subset subset: only keep Operation(s) selected, along with objects they refer to,
+         everything else in '#/paths', '#/definitions', '#/parameters' and '#/responses' is dropped before parsing.
         :return: the created App object
         :rtype: App
         :raises ValueError: if url is wrong
         :raises NotImplementedError: the swagger version is not supported.
+        :raises pyswagg.errs.LoadError: when documents failed to load concurrently
         """
 
         logger.info('load with [{0}]'.format(url))
 
-        url = utils.normalize_url(url)
-        app = kls(url, url_load_hook=url_load_hook, sep=sep, prim=prim, mime_codec=mime_codec, resolver=resolver)
-        app.__raw, app.__version = app.load_obj(url, getter=getter, parser=parser)
-        if app.__version not in ['1.2', '2.0']:
-            raise NotImplementedError('Unsupported Version: {0}'.format(self.__version))
+        url = locate_in_archive(utils.normalize_url(url))
+        app = kls(url, url_load_hook=url_load_hook, sep=sep, prim=prim, mime_codec=mime_codec, resolver=resolver, max_workers=max_workers, shared_cache=shared_cache)
+        app.__state.raw, app.__state.version = app.load_obj(url, getter=getter, parser=parser, stream=stream, lazy=lazy, subset=subset)
+        app.__getter = getter if inspect.isclass(getter) else None
+        app.__parser, app.__stream, app.__lazy_parse, app.__subset = parser, stream, lazy, subset
+        if app.__state.version not in ['1.2', '2.0']:
+            raise NotImplementedError('Unsupported Version: {0}'.format(self.__state.version))
 
         # update scheme if any
         p = six.moves.urllib.parse.urlparse(url)
@@ -301,7 +483,11 @@ class App(object):
         :rtype: list of tuple(where, type, msg).
         """
 
-        result = self._validate()
+        return self.__check_validation(self._validate(), strict)
+
+    def __check_validation(self, result, strict):
+        """ report validation errors
+        """
         if strict and len(result):
             for r in result:
                 logger.error(r)
@@ -309,61 +495,715 @@ class App(object):
 
         return result
 
-    def prepare(self, strict=True):
+    def prepare(self, strict=True, cycle_detection=CycleDetection.eager_, lazy=False):
         """ preparation for loaded json
 
         :param bool strict: when in strict mode, exception would be raised if not valid.
+        :param int cycle_detection: when to detect cycles if not in strict mode, refer to CycleDetection
+        :param bool lazy: only collect Operation(s), each of them is prepared, along with objects
+         it reaches, on its first access via App.op, App.s or App.resolve. Validation errors and
+         cycles are reported at that time in strict mode. Only applied to Swagger 2.0 documents,
+         refer to App.warm_up for preparing everything.
         """
 
-        self.__root = self.prepare_obj(self.raw, self.__url)
-        self.validate(strict=strict)
+        self.__strict, self.__cycle_detection = strict, cycle_detection
+        self.__state.lazy = self.__state.routes = None
+        if lazy and self.__state.version == '2.0':
+            self.__prepare_lazily()
+            return
 
-        if hasattr(self.__root, 'schemes') and self.__root.schemes:
-            if len(self.__root.schemes) > 0:
-                self.__schemes = self.__root.schemes
-            else:
-                # extract schemes from the url to load spec
-                self.__schemes = [six.moves.urlparse(self.__url).schemes]
+        self.__state.root = self.prepare_obj(self.raw, self.__url)
 
         s = Scanner(self)
-        s.scan(root=self.__root, route=[Merge()])
-        s.scan(root=self.__root, route=[PatchObject()])
-        s.scan(root=self.__root, route=[Aggregate()])
+        p = Pipeline(s, index=self.__state.index)
+
+        # when the loaded document is the latest version, validation
+        # could be done in the same pipeline, errors are raised before other stages.
+        v = None
+        if self.__state.raw is self.__state.root:
+            v = self.__validator()
+            if v:
+                p.add('validate', [v], check=lambda: self.__check_validation(v.errs, strict))
+        else:
+            self.validate(strict=strict)
+
+        self.__update_schemes()
 
         # reducer for Operation
         tr = TypeReduce(self.__sep)
         cy = CycleDetector()
-        s.scan(root=self.__root, route=[tr, cy])
+
+        p.add('merge', [Merge()], requires=['validate'] if v else None)
+        # Operation(s) from referenced PathItem(s) are attached by 'merge'
+        p.add('type_reduce', [tr], requires=['merge'])
+        p.add('cycle_detector', [cy], requires=['merge'])
+        # 'final' of Parameter(s) from PathItem should be ready
+        p.add('patch_object', [PatchObject()], requires=['merge'])
+        # 'name' of Schema(s) under '#/definitions' should be ready
+        p.add('aggregate', [Aggregate()], requires=['patch_object'])
+        p.run(self.__state.root)
+        self.__update_timing(p)
 
         # 'op' -- shortcut for Operation with tag and operaionId
-        self.__op = utils.ScopeDict(tr.op)
+        self.__state.op = utils.ScopeDict(tr.op)
         # 'm' -- shortcut for model in Swagger 1.2
-        if hasattr(self.__root, 'definitions') and self.__root.definitions != None:
-            self.__m = utils.ScopeDict(self.__root.definitions)
+        if hasattr(self.__state.root, 'definitions') and self.__state.root.definitions != None:
+            self.__state.m = utils.ScopeDict(self.__state.root.definitions)
         else:
-            self.__m = utils.ScopeDict({})
+            self.__state.m = utils.ScopeDict({})
         # update scope-separater
-        self.__m.sep = self.__sep
-        self.__op.sep = self.__sep
+        self.__state.m.sep = self.__sep
+        self.__state.op.sep = self.__sep
+
+        if self.__resolver.cache_policy == CachePolicy.release_after_prepare_:
+            self.release_raw()
 
         # cycle detection
-        if len(cy.cycles['schema']) > 0 and strict:
-            raise errs.CycleDetectionError('Cycles detected in Schema Object: {0}'.format(cy.cycles['schema']))
+        self.__state.cycle_detector = cy
+        if strict or cycle_detection == CycleDetection.eager_:
+            begin = timeit.default_timer()
+            cycles = cy.cycles
+            self.__state.timing['cycle_detector'] = self.__state.timing.get('cycle_detector', 0) + timeit.default_timer() - begin
+
+            if len(cycles['schema']) > 0 and strict:
+                raise errs.CycleDetectionError('Cycles detected in Schema Object: {0}'.format(cycles['schema']))
+        elif cycle_detection == CycleDetection.background_:
+            cy.detect_in_background()
+
+    def __update_schemes(self):
+        if hasattr(self.__state.root, 'schemes') and self.__state.root.schemes:
+            if len(self.__state.root.schemes) > 0:
+                self.__state.schemes = self.__state.root.schemes
+            else:
+                # extract schemes from the url to load spec
+                self.__state.schemes = [six.moves.urlparse(self.__url).schemes]
+
+    def __prepare_lazily(self):
+        """ the startup of lazy preparation, Operation(s) are collected without
+        going through their children.
+        """
+        self.__state.root = self.__state.raw
+        self.__cache_obj(self.__url, '#', self.__state.root)
+        self.__state.private.add(self.__url)
+        self.__update_schemes()
+
+        lazy = self.__state.lazy = _LazyState()
+        lazy.index = _LazyNodeIndex(self.__state.index, self.__prepare_jp, self.warm_up)
+        self.__state.op = _LazyScopeDict(self.__prepare_lazily_on_access, self.__collect_lazily())
+        self.__state.m = _LazyScopeDict(self.__prepare_lazily_on_access, self.__state.root.definitions or {})
+        self.__state.m.sep = self.__sep
+        self.__state.op.sep = self.__sep
+
+        if self.__resolver.cache_policy == CachePolicy.release_after_prepare_:
+            self.release_raw()
+
+        # detected over the whole App when accessed
+        self.__state.cycle_detector = None
+
+    def __collect_lazily(self):
+        """ collect Operation(s) and Schema(s) under '#/definitions' to be prepared
+        on access, PathItem(s) with $ref are prepared here.
+
+        :return: Operation(s) keyed like App.op
+        :rtype: dict
+        """
+        lazy = self.__state.lazy
+        paths = self.__state.root.paths or {}
+
+        # Operation(s) would be attached to PathItem(s) with $ref when merged
+        self.__prepare_units([utils.jp_compose(k, '#/paths') for k, v in six.iteritems(paths) if getattr(v, '$ref')])
+
+        ops = []
+        for k, v in six.iteritems(paths):
+            for n in six.iterkeys(PathItemContext.__swagger_child__):
+                o = getattr(v, n)
+                if isinstance(o, Operation):
+                    lazy.jps[id(o)] = utils.jp_compose([k, n], base='#/paths')
+                    ops.append((lazy.jps[id(o)], o))
+
+        tr = TypeReduce(self.__sep)
+        Scanner(self).scan(route=[tr], root=self.__state.root, nexter=lambda root, leaves: iter(ops))
+
+        definitions = self.__state.root.definitions or {}
+        for k, v in six.iteritems(definitions):
+            lazy.jps[id(v)] = utils.jp_compose(k, '#/definitions')
+
+        return tr.op
+
+    def __prepare_lazily_on_access(self, obj):
+        """ prepare an object from App.op or App.m
+        """
+        lazy = self.__state.lazy
+        if lazy != None and id(obj) in lazy.jps:
+            self.__prepare_jp(lazy.jps[id(obj)])
+        return obj
+
+    def __unit_of(self, jp):
+        """ the key of what's prepared together for an object in the root document,
+        - an Operation: '#/paths/~1pets/get'
+        - a PathItem, without its Operation(s): '#/paths/~1pets'
+        - others, ex. '#/definitions/Pet'
+        None is returned when the whole document is involved, ex. '#/paths'.
+        """
+        ts = utils.jp_split(jp)[1:]
+        if len(ts) < 2:
+            return None
+        if ts[0] == 'paths' and len(ts) > 2 and ts[2] != 'parameters' and ts[2] in PathItemContext.__swagger_child__:
+            return utils.jp_compose(ts[:3], base='#')
+        return utils.jp_compose(ts[:2], base='#')
+
+    def __prepare_jp(self, jp):
+        """ prepare what's needed to access an object in the root document lazily
+        """
+        lazy = self.__state.lazy
+        if lazy == None or getattr(lazy.local, 'busy', False):
+            return
+
+        key = self.__unit_of(jp)
+        if key == None:
+            self.warm_up()
+        elif key not in lazy.units or lazy.units[key] != None:
+            self.__prepare_units([key])
+
+    def __prepare_units(self, keys):
+        """ prepare objects in the root document, along with those they reach. The
+        same stages of App.prepare are applied to them, but only those objects are visited.
+
+        :param list keys: keys of objects, refer to App.__unit_of
+        """
+        lazy = self.__state.lazy
+        if lazy == None:
+            return
+
+        with lazy.lock:
+            # the lock is shared with the state swapped in by App.reload
+            lazy = self.__state.lazy
+            if lazy == None:
+                return
+
+            for k in keys:
+                if lazy.units.get(k, None) != None:
+                    # failed before
+                    raise lazy.units[k]
+
+            lazy.local.busy = True
+            try:
+                self.__prepare_units_locked(keys)
+            finally:
+                lazy.local.busy = False
+
+    def __prepare_units_locked(self, keys):
+        lazy, s = self.__state.lazy, Scanner(self)
+
+        todo, seen, subtrees = list(keys), set(), []
+        while todo:
+            key = todo.pop()
+            if key in lazy.units or key in seen:
+                continue
+
+            ts = utils.jp_split(key)[1:]
+            try:
+                obj = self.__state.root.resolve(ts)
+            except (AttributeError, KeyError, IndexError):
+                obj = None
+            if obj == None:
+                # reported when resolving
+                continue
+            seen.add(key)
+
+            if ts[0] == 'paths' and len(ts) == 3:
+                # Parameter(s) of PathItem are required by Operation
+                todo.append(utils.jp_compose(ts[:2], base='#'))
+                batch = [(key, obj, False)]
+            elif ts[0] == 'paths':
+                batch = [(key, obj, True)] + [
+                    (utils.jp_compose(str(i), base=key + '/parameters'), p, False) for i, p in enumerate(obj.parameters or [])
+                ]
+            else:
+                batch = [(key, obj, False)]
+
+            # $ref should be normalized before looking for objects reached by it
+            p = Pipeline(s)
+            p.add('yaml_fixer', [YamlFixer()], leaves=[Operation])
+            p.add('normalize_ref', [NormalizeRef(self.__url)])
+            p.add('resolve', [Resolve()])
+            p.run_subtrees(batch)
+            self.__update_timing(p)
+
+            for base, o, shallow in batch:
+                if shallow:
+                    self.__state.index.add(base, o)
+                else:
+                    self.__state.index.update(base, o)
+
+                for _, oo in (shallow_traversal if shallow else default_tree_traversal)(o, []):
+                    r = getattr(oo, '$ref', None)
+                    if not r:
+                        continue
+                    u, jp = utils.jr_split(r)
+                    if u != self.__url:
+                        continue
+                    k = self.__unit_of(jp)
+                    if k == None:
+                        raise ValueError('unable to prepare lazily for $ref: {0}'.format(r))
+                    todo.append(k)
+
+                    # Operation(s) of a referenced PathItem are merged into the referrer
+                    if isinstance(oo, PathItem):
+                        ro = self.__state.root.resolve(utils.jp_split(k)[1:])
+                        todo.extend(
+                            utils.jp_compose(n, base=k) for n in PathItemContext.__swagger_child__
+                            if isinstance(getattr(ro, n, None), Operation)
+                        )
+
+            subtrees.extend(batch)
+
+        if not subtrees:
+            return
+
+        v = self.__validator()
+        cy = CycleDetector()
+
+        p = Pipeline(s)
+        if v:
+            p.add('validate', [v], check=lambda: self.__check_validation(v.errs, self.__strict))
+        p.add('merge', [Merge()], requires=['validate'] if v else None)
+        p.add('cycle_detector', [cy])
+        p.add('patch_object', [PatchObject()], requires=['merge'])
+        p.add('aggregate', [Aggregate()], requires=['patch_object'])
+
+        error = None
+        try:
+            try:
+                p.run_subtrees(subtrees)
+            finally:
+                self.__update_timing(p)
+
+            begin = timeit.default_timer()
+            cycles = cy.cycles
+            self.__state.timing['cycle_detector'] = self.__state.timing.get('cycle_detector', 0) + timeit.default_timer() - begin
+
+            if len(cycles['schema']) > 0 and self.__strict:
+                raise errs.CycleDetectionError('Cycles detected in Schema Object: {0}'.format(cycles['schema']))
+        except (errs.ValidationError, errs.CycleDetectionError) as e:
+            error = e
+
+        for k in seen:
+            lazy.units[k] = error
+        if error:
+            raise error
+
+    def warm_up(self):
+        """ prepare everything not prepared yet for an App prepared lazily,
+        it's the same as one prepared eagerly afterward. Nothing is done otherwise.
+        """
+        lazy = self.__state.lazy
+        if lazy == None:
+            return
+
+        keys = []
+        for n in ['paths', 'definitions', 'parameters', 'responses']:
+            for k, v in six.iteritems(getattr(self.__state.root, n) or {}):
+                keys.append(utils.jp_compose([n, k], base='#'))
+                if n == 'paths':
+                    keys.extend(
+                        utils.jp_compose([n, k, m], base='#') for m in PathItemContext.__swagger_child__
+                        if isinstance(getattr(v, m), Operation)
+                    )
+        self.__prepare_units(keys)
+
+        with lazy.lock:
+            if self.__state.lazy is lazy:
+                self.__state.index.update('#', self.__state.root)
+                self.__state.lazy = None
+
+    def __dependents(self, urls):
+        """ documents depending on any of 'urls', including themselves
+
+        :param list urls: urls of documents
+        :rtype: set of str
+        """
+        # urls referenced by each parsed document
+        deps = {}
+        for u, o in six.iteritems(self.__state.objs):
+            if u == self.__url:
+                nodes = (obj for _, obj in self.__state.index.nodes())
+            else:
+                roots = [o] if isinstance(o, BaseObj) else [v for _, v in o.items()]
+                nodes = (obj for r in roots for _, obj in default_tree_traversal(r, []))
+
+            refs = deps.setdefault(u, set())
+            for obj in nodes:
+                r = getattr(obj, '$ref', None)
+                if r:
+                    refs.add(utils.jr_split(r)[0])
+
+        dirty = set(urls)
+        if self.__state.version == '1.2':
+            # resources of Swagger 1.2 are parsed into the root document
+            dirty.add(self.__url)
+
+        found = True
+        while found:
+            found = False
+            for u, refs in six.iteritems(deps):
+                if u not in dirty and not refs.isdisjoint(dirty):
+                    dirty.add(u)
+                    found = True
+
+        return dirty
+
+    def __member_of(self, jp):
+        """ the key of the member of '#/paths', '#/definitions', '#/parameters'
+        or '#/responses' containing an object in the root document, ex. '#/paths/~1pets'
+        for '#/paths/~1pets/get/responses/200'. None is returned for others.
+        """
+        ts = utils.jp_split(jp)[1:]
+        if len(ts) < 2 or ts[0] not in ('paths', 'definitions', 'parameters', 'responses'):
+            return None
+        return utils.jp_compose(ts[:2], base='#')
+
+    def __reload_members(self, dirty):
+        """ prepare again members of the root document depending on 'dirty' documents,
+        directly or via other members. They are parsed again from the root document and
+        prepared in a new state, everything else is shared with the current state. The
+        new state is swapped in once it's ready.
+
+        :param set dirty: urls of documents to be reloaded, refer to App.__dependents
+        :return: False when the whole root document should be reloaded
+        :rtype: bool
+        """
+        old = self.__state
+        if old.version != '2.0':
+            return False
+
+        # objects are not prepared lazily in the meantime
+        lazy = _LazyState()
+        if old.lazy != None:
+            lazy.lock = old.lazy.lock
+
+        with lazy.lock:
+            st = self.__prepare_members(old, lazy, dirty)
+            if st == None:
+                return False
+
+            # swap in by one assignment, the same as a full reload
+            self.__state = st
+        return True
+
+    def __prepare_members(self, old, lazy, dirty):
+        """ the new state for App.__reload_members, None when unable to make it
+        """
+        # members to prepare again, and a map from a member to those referring to it
+        affected, referrers = set(), {}
+        for jp, obj in old.index.nodes():
+            r = getattr(obj, '$ref', None)
+            if not r:
+                continue
+
+            key = self.__member_of(jp)
+            u, rjp = utils.jr_split(r)
+            if u == self.__url:
+                k = self.__member_of(rjp)
+                if k != None and k != key:
+                    referrers.setdefault(k, set()).add(key)
+            elif u in dirty:
+                affected.add(key)
+
+        todo = list(affected)
+        while todo:
+            for k in referrers.get(todo.pop(), []):
+                if k not in affected:
+                    affected.add(k)
+                    todo.append(k)
+        if None in affected:
+            # referred by something not a member
+            return None
+
+        raw = self.__resolver.load(self.__url, self.__getter)[0] if self.__stream else self.__resolver.resolve(self.__url, self.__getter)
+        if self.__subset:
+            raw = self.__subset.apply(raw, self.__url)
+
+        # a copy of the root, with new members parsed from json
+        root = copy.copy(old.root)
+        members = {}
+        for key in affected:
+            n, k = utils.jp_split(key)[1:]
+            v = (raw.get(n, None) or {}).get(k, None)
+            if not isinstance(v, dict):
+                # the root document is changed after checked
+                return None
+
+            tmp = {'_tmp_': {}}
+            with SwaggerContext.__swagger_child__[n][1](tmp, '_tmp_') as ctx:
+                ctx.parse(v)
+            members.setdefault(n, {})[k] = tmp['_tmp_']
+
+        for n, objs in six.iteritems(members):
+            d = dict(root._peek_(n))
+            d.update(objs)
+            root.update_field(n, d)
+            for o in six.itervalues(objs):
+                o._parent__ = root
+
+        st = _State()
+        st.root = st.raw = root
+        st.version, st.schemes = old.version, old.schemes
+        st.objs = dict((u, o) for u, o in six.iteritems(old.objs) if u not in dirty)
+        st.objs[self.__url] = root
+        st.private = set(u for u in old.private if u not in dirty or u == self.__url)
+        st.index = old.index.copy(excludes=affected)
+        if '#' in st.index:
+            st.index.add('#', root)
+
+        # members not affected are known as prepared
+        st.lazy = lazy
+        if old.lazy != None:
+            lazy.units = dict((k, e) for k, e in six.iteritems(old.lazy.units) if self.__member_of(k) not in affected)
+        else:
+            for n in ('paths', 'definitions', 'parameters', 'responses'):
+                for k, v in six.iteritems(getattr(root, n) or {}):
+                    key = utils.jp_compose([n, k], base='#')
+                    if key in affected:
+                        continue
+                    lazy.units[key] = None
+                    if n == 'paths':
+                        lazy.units.update(
+                            (utils.jp_compose(m, base=key), None) for m in PathItemContext.__swagger_child__
+                            if isinstance(getattr(v, m), Operation)
+                        )
+
+        # prepared by a copy of this App working on the new state
+        app = copy.copy(self)
+        app.__state = st
+        lazy.index = _LazyNodeIndex(st.index, app.__prepare_jp, app.warm_up)
+        ops = app.__collect_lazily()
+
+        if old.lazy != None:
+            st.op = _LazyScopeDict(app.__prepare_lazily_on_access, ops)
+            st.m = _LazyScopeDict(app.__prepare_lazily_on_access, root.definitions or {})
+        else:
+            keys = []
+            for key in affected:
+                keys.append(key)
+                n, k = utils.jp_split(key)[1:]
+                if n == 'paths':
+                    keys.extend(
+                        utils.jp_compose(m, base=key) for m in PathItemContext.__swagger_child__
+                        if isinstance(getattr(root.paths[k], m), Operation)
+                    )
+            app.__prepare_units(keys)
+
+            st.op, st.m = utils.ScopeDict(ops), utils.ScopeDict(root.definitions or {})
+            st.lazy = None
+        st.m.sep = st.op.sep = self.__sep
+
+        if self.__resolver.cache_policy == CachePolicy.release_after_prepare_:
+            self.release_raw()
+
+        # detected over the whole App when accessed
+        st.cycle_detector = None
+        return st
+
+    def reload(self):
+        """ reload documents changed since they were loaded. Only changed documents
+        are loaded and parsed again, objects of documents not depending on them are reused.
+
+        Those depending on them are prepared in a new object graph, then swapped in
+        as a whole, readers see either the old one or the new one. Objects already
+        referred, ex. by requests in flight, are not modified.
+
+        When the root document is not changed, only members of '#/paths', '#/definitions',
+        '#/parameters' and '#/responses' depending on changed documents, directly or via
+        other members, are parsed and prepared again. Others are shared with objects
+        prepared before. The whole root document is parsed and prepared again when it's
+        changed, or it's a Swagger 1.2 document.
+
+        Documents are checked by (mtime, size) reported by getters first, only those
+        changed or without them are loaded and hashed.
+
+        :return: urls of changed documents
+        :rtype: list of str
+        """
+        with self.__reload_lock:
+            changed = []
+            for url, digest in six.iteritems(self.__resolver.digests):
+                d = self.__resolver.digest(url, self.__getter if url == self.__url else None)
+                if d != None and d != digest:
+                    changed.append(url)
+
+            if not changed:
+                return changed
+
+            logger.info('reload changed documents: {0}'.format(changed))
+
+            self.__resolver.release(changed)
+            if self.__resolver.shared_cache:
+                self.__resolver.shared_cache.invalidate([self.__resolver.location(u) for u in changed])
+            dirty = self.__dependents(changed)
+            if self.__url not in dirty:
+                # not referenced by the root document, they would be loaded again on demand
+                self.__state.objs = dict((u, o) for u, o in six.iteritems(self.__state.objs) if u not in dirty)
+                return changed
+
+            if self.__url not in changed and self.__reload_members(dirty):
+                return changed
+
+            app = self.__class__.load(
+                self.__url,
+                getter=self.__getter,
+                parser=self.__parser,
+                sep=self.__sep,
+                prim=self.__prim,
+                mime_codec=self.__mime_codec,
+                resolver=self.__resolver,
+                stream=self.__stream,
+                lazy=self.__lazy_parse,
+                subset=self.__subset
+            )
+            app.__state.objs.update((u, o) for u, o in six.iteritems(self.__state.objs) if u not in dirty)
+            app.__state.private.update(u for u in self.__state.private if u not in dirty)
+            app.prepare(strict=self.__strict, cycle_detection=self.__cycle_detection, lazy=self.__state.lazy != None)
+            if app.__state.lazy != None and self.__state.lazy != None:
+                app.__state.lazy.lock = self.__state.lazy.lock
+
+            # swap in the new object graph by one assignment, readers see
+            # either the old state or the new one, not a mix of them.
+            self.__state = app.__state
+
+            return changed
+
+    def watch(self, interval=1.0, on_reload=None):
+        """ poll documents loaded by this App in a daemon thread, and reload
+        when any of them changed.
+
+        :param float interval: seconds between each polling
+        :param func on_reload: called with urls of changed documents after reloaded
+        :return: the watcher, call its 'stop' to stop watching
+        :rtype: Watcher
+        """
+        w = Watcher(self, interval=interval, on_reload=on_reload)
+        w.start()
+        return w
+
+    def release_raw(self):
+        """ drop loaded json/yaml documents kept by resolver. Objects are all
+        prepared, those documents would be loaded again only when resolving
+        something not loaded yet.
+        """
+        self.__resolver.release()
 
     @classmethod
-    def create(kls, url, strict=True):
+    def create(kls, url, strict=True, cache_dir=None, stream=False, shared_cache=None, cycle_detection=CycleDetection.eager_, lazy=False, subset=None):
         """ factory of App
 
         :param str url: url of path of Swagger API definition
         :param bool strict: when in strict mode, exception would be raised if not valid.
+        :param str cache_dir: folder to keep snapshots of prepared App, when provided,
+         the App would be restored from the snapshot when none of loaded documents changed.
+        :param bool stream: load in streaming mode, refer to App.load for details
+        :param shared_cache pyswagg.cache.SharedCache: cache shared with other Apps, refer to App.load for details
+        :param int cycle_detection: when to detect cycles if not in strict mode, refer to App.prepare for details
+        :param bool lazy: parse definitions and prepare Operation(s) on their first access, refer to
+         App.load and App.prepare for details. A snapshot is restored when available, but not dumped
+         for an App prepared lazily.
+        :param pyswagg.subset.Subset subset: only keep a slice of the document, refer to App.load for details
         :return: the created App object
         :rtype: App
         :raises ValueError: if url is wrong
         :raises NotImplementedError: the swagger version is not supported.
         """
-        app = kls.load(url)
-        app.prepare(strict=strict)
+        if cache_dir:
+            app = kls._load_snapshot(url, cache_dir, strict=strict, shared_cache=shared_cache, subset=subset)
+            if app:
+                return app
+
+        app = kls.load(url, stream=stream, shared_cache=shared_cache, lazy=lazy, subset=subset)
+        app.prepare(strict=strict, cycle_detection=cycle_detection, lazy=lazy)
+
+        if cache_dir and not lazy:
+            app._dump_snapshot(cache_dir, strict=strict)
+
+        return app
+
+    def __snapshot_external(self):
+        """ objects referenced by the prepared graph, but owned by this App
+        """
+        return {'prim': self.__prim, 'mime_codec': self.__mime_codec}
+
+    def _dump_snapshot(self, cache_dir, strict=True):
+        """ save the prepared object graph to 'cache_dir'
+
+        :param str cache_dir: folder to keep snapshots
+        :param bool strict: the mode used to prepare this App
+        """
+        header = dict(
+            format=SNAPSHOT_FORMAT,
+            pyswagg=pyswagg.__version__,
+            url=self.__url,
+            strict=strict,
+            subset=self.__subset,
+            digests=self.__resolver.digests,
+        )
+        state = dict(
+            root=self.__state.root,
+            raw=self.__state.raw,
+            version=self.__state.version,
+            op=self.__state.op,
+            m=self.__state.m,
+            schemes=self.__state.schemes,
+            objs=self.__state.objs,
+            index=self.__state.index,
+        )
+
+        logger.info('dump snapshot of [{0}]'.format(self.__url))
+        write_snapshot(snapshot_path(cache_dir, self.__url, self.__subset), header, state, self.__snapshot_external())
+
+    @classmethod
+    def _load_snapshot(kls, url, cache_dir, strict=True, shared_cache=None, subset=None):
+        """ restore a prepared App from 'cache_dir', no scanner would be involved.
 
+        :param str url: url of path of Swagger API definition
+        :param str cache_dir: folder to keep snapshots
+        :param bool strict: the mode used to prepare this App
+        :param shared_cache pyswagg.cache.SharedCache: cache shared with other Apps
+        :param pyswagg.subset.Subset subset: the subset used to load this App
+        :return: the restored App, None when there is no valid snapshot.
+        :rtype: App
+        """
+        url = utils.normalize_url(url)
+        app = kls(url, shared_cache=shared_cache)
+
+        def _check(header):
+            if (header.get('format') != SNAPSHOT_FORMAT or
+                header.get('pyswagg') != pyswagg.__version__ or
+                header.get('url') != url or
+                header.get('strict') != strict or
+                header.get('subset', None) != subset):
+                return False
+
+            # every loaded document should be the same
+            for u, d in six.iteritems(header.get('digests', {})):
+                if d == None or app.__resolver.digest(u) != d:
+                    return False
+            return True
+
+        state = read_snapshot(snapshot_path(cache_dir, url, subset), _check, app.__snapshot_external())
+        if not state:
+            return None
+
+        logger.info('restore snapshot of [{0}]'.format(url))
+
+        app.__state.root = state['root']
+        app.__state.raw = state['raw']
+        app.__state.version = state['version']
+        app.__state.op = state['op']
+        app.__state.m = state['m']
+        app.__state.schemes = state['schemes']
+        app.__state.objs = state['objs']
+        app.__state.index = state['index']
+        app.__strict = strict
+        app.__subset = subset
         return app
 
     """ for backward compatible, for later version,
@@ -389,22 +1229,37 @@ class App(object):
 
         obj = None
         url, jp = utils.jr_split(jref)
+        st = self.__state
+
+        # objects in the root document might not be prepared yet
+        if st.lazy != None and (not url or url == self.__url):
+            self.__prepare_jp(jp)
+
+        # objects in the root document are indexed by JSON pointer
+        if not url or url == self.__url:
+            obj = st.index.get(jp)
 
         # check cacahed object against json reference by
-        # comparing url first, and find those object prefixed with
-        # the JSON pointer.
-        o = self.__objs.get(url, None)
+        # comparing url first, and find the object with the longest
+        # JSON pointer prefixing this one.
+        o = st.objs.get(url, None) if obj == None else None
         if o:
             if isinstance(o, BaseObj):
                 obj = o.resolve(utils.jp_split(jp)[1:])
-            elif isinstance(o, dict):
-                for k, v in six.iteritems(o):
-                    if jp.startswith(k):
-                        obj = v.resolve(utils.jp_split(jp[len(k):])[1:])
-                        break
+            elif isinstance(o, utils.JsonPointerTrie):
+                found = o.longest_prefix(jp)
+                if found:
+                    obj = found[0].resolve(found[1])
             else:
                 raise Exception('Unknown Cached Object: {0}'.format(str(type(o))))
 
+        # prepared by other Apps
+        shared = self.__resolver.shared_cache
+        if obj == None and url and url != self.__url and shared:
+            obj = shared.get_obj(self.__resolver.location(url), jp)
+            if obj != None:
+                self.__cache_obj(url, jp, obj)
+
         # this object is not found in cache
         if obj == None:
             if url:
@@ -439,6 +1294,38 @@ class App(object):
         else:
             return self.resolve(utils.jp_compose(p, base=b[1]))
 
+    def match(self, method, url_or_path):
+        """ find the Operation describing an HTTP request, ex.
+        App.match('GET', 'http://petstore.swagger.io/v2/pet/1?x=1') returns
+        (Operation of '/pet/{petId}', {'petId': '1'}).
+
+        :param str method: HTTP method, case insensitive
+        :param str url_or_path: url, or path including the base path. Query and fragment are ignored.
+        :return: the Operation and decoded values of path parameters, None when not found.
+         An Operation of App prepared lazily is prepared before returned.
+        :rtype: tuple of (pyswagg.spec.v2_0.objects.Operation, dict of str to str)
+        """
+        st = self.__state
+        routes = st.routes
+        if routes == None:
+            routes = utils.PathTrie()
+            for k, v in six.iteritems(st.root.paths or {}):
+                for n in six.iterkeys(PathItemContext.__swagger_child__):
+                    o = getattr(v, n)
+                    if not isinstance(o, Operation):
+                        continue
+
+                    # Operation(s) of App prepared lazily might not be patched yet
+                    if o.path == None:
+                        routes.add(n, (st.root.basePath or '').rstrip('/') + k, o)
+                    else:
+                        routes.add(n, (o.base_path or '').rstrip('/') + o.path, o)
+            st.routes = routes
+
+        found = routes.match(method, six.moves.urllib.parse.urlsplit(url_or_path).path)
+        if found:
+            return self.__prepare_lazily_on_access(found[0]), found[1]
+
     def dump(self):
         """ dump into Swagger Document
 
@@ -449,6 +1336,171 @@ class App(object):
 
 
 
+class _State(object):
+    """ what's loaded and prepared for an App
+    """
+
+    def __init__(self):
+        self.root = None
+        self.raw = None
+        self.version = ''
+
+        self.op = None
+        self.m = None
+        self.schemes = []
+
+        # a map from json-reference to
+        # - spec.BaseObj
+        # - a map from json-pointer to spec.BaseObj
+        self.objs = {}
+
+        # urls of documents whose objects refer to those owned by this App,
+        # they are not shared with other Apps.
+        self.private = set()
+
+        # time spent in each stage of preparation
+        self.timing = collections.OrderedDict()
+
+        # flat index of objects under root, built when preparing
+        self.index = NodeIndex()
+
+        # cycles in the prepared object graph
+        self.cycle_detector = None
+
+        # state of lazy preparation, None when prepared eagerly
+        self.lazy = None
+
+        # a utils.PathTrie from HTTP method and path to Operation,
+        # built on the first call to App.match
+        self.routes = None
+
+
+class _LazyState(object):
+    """ state of lazy preparation of an App
+    """
+
+    def __init__(self):
+        # a map from keys of prepared objects to the error raised
+        # when preparing them, None when succeeded.
+        self.units = {}
+
+        # a map from id of Operation/Schema in App.op/App.m to its JSON pointer
+        self.jps = {}
+
+        self.lock = threading.RLock()
+
+        # App.index preparing objects on access
+        self.index = None
+
+        # objects are resolved when preparing, they should not trigger
+        # lazy preparation again.
+        self.local = threading.local()
+
+
+class _LazyScopeDict(utils.ScopeDict):
+    """ ScopeDict preparing objects on access
+    """
+
+    def __init__(self, prepare, *a, **k):
+        super(_LazyScopeDict, self).__init__(*a, **k)
+        self.__prepare = prepare
+
+    def __getitem__(self, *keys):
+        return self.__prepare(super(_LazyScopeDict, self).__getitem__(*keys))
+
+    def get(self, k, default=None):
+        return self.__prepare(super(_LazyScopeDict, self).get(k, default))
+
+    def setdefault(self, k, default=None):
+        return self.__prepare(super(_LazyScopeDict, self).setdefault(k, default))
+
+    def pop(self, k, *default):
+        return self.__prepare(super(_LazyScopeDict, self).pop(k, *default))
+
+    def popitem(self):
+        k, v = super(_LazyScopeDict, self).popitem()
+        return k, self.__prepare(v)
+
+    def itervalues(self):
+        for v in six.itervalues(super(_LazyScopeDict, self)):
+            yield self.__prepare(v)
+
+    def iteritems(self):
+        for k, v in six.iteritems(super(_LazyScopeDict, self)):
+            yield k, self.__prepare(v)
+
+    def values(self):
+        return list(self.itervalues())
+
+    def items(self):
+        return list(self.iteritems())
+
+
+class _LazyNodeIndex(object):
+    """ NodeIndex of an App prepared lazily, objects are prepared on access.
+    'in' and 'len' only report what's prepared so far.
+    """
+
+    def __init__(self, index, prepare, warm_up):
+        self.__index = index
+        self.__prepare = prepare
+        self.__warm_up = warm_up
+
+    def __getattr__(self, name):
+        return getattr(self.__index, name)
+
+    def __len__(self):
+        return len(self.__index)
+
+    def __contains__(self, path):
+        return path in self.__index
+
+    def get(self, path, default=None):
+        self.__prepare(path)
+        return self.__index.get(path, default)
+
+    def nodes(self, *classes):
+        self.__warm_up()
+        return self.__index.nodes(*classes)
+
+
+class Watcher(object):
+    """ poll documents of an App, and reload it when changed
+    """
+
+    def __init__(self, app, interval=1.0, on_reload=None):
+        """
+        :param App app: the App to watch
+        :param float interval: seconds between each polling
+        :param func on_reload: called with urls of changed documents after reloaded
+        """
+        self.__app = app
+        self.__interval = interval
+        self.__on_reload = on_reload
+        self.__stop = threading.Event()
+        self.__thread = threading.Thread(target=self.__run)
+        self.__thread.daemon = True
+
+    def __run(self):
+        while not self.__stop.wait(self.__interval):
+            try:
+                changed = self.__app.reload()
+            except Exception as e:
+                # keep serving with objects loaded last time
+                logger.warning('unable to reload [{0}]: {1}'.format(self.__app.url, e))
+                continue
+
+            if changed and self.__on_reload:
+                self.__on_reload(changed)
+
+    def start(self):
+        self.__thread.start()
+
+    def stop(self):
+        self.__stop.set()
+        self.__thread.join()
+
+
 class Security(object):
     """ security handler
     """
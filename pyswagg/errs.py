@@ -5,3 +5,13 @@ class CycleDetectionError(Exception): pass
 class ValidationError(Exception): pass
 class SchemaError(Exception): pass
 
+
+
+class LoadError(Exception):
+    """ failures when loading documents concurrently,
+    'errors' is a list of (url, exception)
+    """
+    def __init__(self, errors):
+        super(LoadError, self).__init__('failed to load {0} document(s): {1}'.format(
+            len(errors), ', '.join('{0} ({1})'.format(u, e) for u, e in errors)))
+        self.errors = errors
@@ -1,17 +1,259 @@
 from __future__ import absolute_import
 from .consts import private
-from .utils import patch_path
+from .utils import patch_path, replace_file, CaseInsensitiveDict
 import json
 import yaml
 import six
 import os
+import io
+import mmap
+import gzip
+import zipfile
+import tarfile
+import hashlib
+import threading
+import tempfile
 import logging
 import re
 
+try:
+    # optional, to parse json documents incrementally, refer to Getter.stream
+    import ijson
+except ImportError:
+    ijson = None
+
 
 logger = logging.getLogger(__name__)
 
 
+def _content_bytes(raw):
+    """ bytes (or buffer) of a loaded resource
+    """
+    if isinstance(raw, dict):
+        raw = json.dumps(raw, sort_keys=True, default=str)
+    if isinstance(raw, six.text_type):
+        raw = raw.encode('utf-8')
+    return raw
+
+
+def content_digest(raw):
+    """ content hash of a loaded resource, used to detect changes
+    between loadings.
+
+    :param raw: what Getter.load returns, a string or a dict
+    :rtype: str
+    """
+    return hashlib.sha1(_content_bytes(raw)).hexdigest()
+
+
+_gzip_magic = b'\x1f\x8b'
+
+
+def _strip_gz(path):
+    """ 'swagger.json.gz' -> 'swagger.json'
+    """
+    gz = '.' + private.FILE_EXT_GZ
+    return path[:-len(gz)] if path.endswith(gz) else path
+
+
+_json_start_text = re.compile(r'\s*[\[{]')
+_json_start_bin = re.compile(br'\s*[\[{]')
+
+
+def _json_decoder():
+    """ the fastest json decoder available, stdlib's json is the fallback
+    when the faster one refuses something, ex. integers over 64 bits.
+    """
+    def _std_loads(s):
+        # buffers, ex. mmap, are copied for stdlib's json
+        return json.loads(s if isinstance(s, (six.string_types, six.binary_type)) else s[:])
+
+    try:
+        import orjson
+    except ImportError:
+        return _std_loads
+
+    def _loads(s):
+        try:
+            if isinstance(s, (six.string_types, six.binary_type)):
+                return orjson.loads(s)
+            with memoryview(s) as m:
+                return orjson.loads(m)
+        except ValueError:
+            return _std_loads(s)
+    return _loads
+
+
+def _yaml_decoder():
+    """ use libyaml when available, buffers like mmap are read as streams
+    """
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    return lambda s: yaml.load(s, Loader=loader)
+
+
+def _iter_items(events, keys, refs=None):
+    """ top-level items of a json object from ijson's basic events, values
+    of 'keys' which are json objects are split into their members, each one
+    is built and yielded on its own.
+
+    :param events: iterator of (event, value) from ijson.basic_parse
+    :param keys: names of top-level values to be split
+    :param set refs: values of '$ref' are collected into it when provided
+    :return: generator of (key, name, json), 'name' is the key of a member
+    of a split value, or None when 'json' is the whole value of 'key'
+    """
+    def _value(ev, v):
+        b, depth, ref = ijson.ObjectBuilder(), 0, False
+        while True:
+            b.event(ev, v)
+            if ev in ('start_map', 'start_array'):
+                depth += 1
+            elif ev in ('end_map', 'end_array'):
+                depth -= 1
+            elif ref and ev == 'string':
+                refs.add(v)
+            ref = refs != None and ev == 'map_key' and v == '$ref'
+            if depth == 0:
+                return b.value
+            ev, v = six.advance_iterator(events)
+
+    ev, _ = six.advance_iterator(events)
+    if ev != 'start_map':
+        raise ValueError('json object is expected, not: {0}'.format(ev))
+
+    for ev, key in events:
+        if ev == 'end_map':
+            return
+
+        ev, v = six.advance_iterator(events)
+        if key in keys and ev == 'start_map':
+            for ev, name in events:
+                if ev == 'end_map':
+                    break
+                yield key, name, _value(*six.advance_iterator(events))
+        else:
+            yield key, None, _value(ev, v)
+
+
+class _DigestReader(object):
+    """ a binary file to be read in sequence, its content hash and size
+    are calculated along.
+    """
+
+    def __init__(self, f):
+        self.__f = f
+        self.__sha1 = hashlib.sha1()
+        self.size = 0
+
+    def read(self, n=-1):
+        b = self.__f.read(n)
+        self.__sha1.update(b)
+        self.size += len(b)
+        return b
+
+    @property
+    def digest(self):
+        return self.__sha1.hexdigest()
+
+    def close(self):
+        self.__f.close()
+
+
+class Parsers(object):
+    """ registry of parsers for loaded resources, a parser is a function
+    accepting a string (or bytes, mmap) and returning a dict. It's picked by, in order:
+    - the extension of path
+    - the content type reported by getter
+    - the first non-blank character, '{' or '[' for json, others for yaml
+    """
+
+    def __init__(self):
+        self.__parsers = {}
+        self.__exts = {}
+        self.__types = {}
+
+        self.register('json', _json_decoder(), exts=[private.FILE_EXT_JSON], content_types=[
+            'application/json', 'text/json'
+        ])
+        self.register('yaml', _yaml_decoder(), exts=[private.FILE_EXT_YAML, private.FILE_EXT_YML], content_types=[
+            'application/yaml', 'application/x-yaml', 'text/yaml', 'text/x-yaml'
+        ])
+
+    def register(self, name, loads, exts=None, content_types=None):
+        """ register a parser, or replace the one with the same name
+
+        :param str name: name of the parser, ex. 'json'
+        :param func loads: the function to parse a string
+        :param list exts: file extensions, without '.'
+        :param list content_types: content types
+        """
+        self.__parsers[name] = loads
+        for e in exts or []:
+            self.__exts[e.lower()] = name
+        for t in content_types or []:
+            self.__types[t.lower()] = name
+
+    def unregister(self, name):
+        self.__parsers.pop(name)
+
+    def parser(self, name):
+        return self.__parsers.get(name, None)
+
+    def find(self, data, path=None, content_type=None):
+        """ pick a parser for this resource
+
+        :param str data: the content
+        :param str path: where it's loaded from
+        :param str content_type: the content type, ex. from 'Content-Type' header
+        :return: name of the parser
+        :rtype: str
+        """
+        if path:
+            p = six.moves.urllib.parse.urlparse(path).path if '://' in path else path
+            e = os.path.splitext(_strip_gz(p))[1][1:].lower()
+            if self.__exts.get(e, None) in self.__parsers:
+                return self.__exts[e]
+
+        if content_type:
+            t = content_type.split(';', 1)[0].strip().lower()
+            if self.__types.get(t, None) in self.__parsers:
+                return self.__types[t]
+            if t.endswith('+json') and 'json' in self.__parsers:
+                return 'json'
+
+        m = (_json_start_text if isinstance(data, six.text_type) else _json_start_bin).match(data)
+        return 'json' if m else 'yaml'
+
+    def load(self, data, path=None, content_type=None):
+        """ parse a string. When json is expected but failed, it would be
+        parsed as yaml, which is a superset of json.
+
+        :return: name of the parser and the parsed object
+        :rtype: (str, dict)
+        """
+        name = self.find(data, path, content_type)
+        try:
+            return name, self.__parsers[name](data)
+        except Exception as e:
+            if name != 'json' or 'yaml' not in self.__parsers:
+                raise Exception('Unable to parse as {0}, startswith {1} ...: {2}'.format(name, data[:10], e))
+
+        try:
+            return 'yaml', self.__parsers['yaml'](data)
+        except Exception as e:
+            raise Exception('Unknown format startswith {0} ...: {1}'.format(data[:10], e))
+
+    def parse(self, data, path=None, content_type=None):
+        """ parse a string, refer to Parsers.load for details
+
+        :rtype: dict
+        """
+        return self.load(data, path, content_type)[1]
+
+
+parsers = Parsers()
+
+
 class Getter(six.Iterator):
     """ base of getter object
 
@@ -19,9 +261,30 @@ class Getter(six.Iterator):
     The part to extend getter would be finalized once Swagger 2.0 is ready.
     """
 
+    __parsers__ = parsers
+    """ parsers for loaded resources, refer to pyswagg.getter.Parsers
+    """
+
     def __init__(self, path):
         self.base_path = path
 
+        # content hash of the last loaded resource
+        self.digest = None
+
+        # size in bytes of the last loaded resource
+        self.size = None
+
+        # content type of the last loaded resource, if reported by 'load'
+        self.content_type = None
+
+        # True when the last loaded resource is parsed from json, the returned
+        # dict is a tree which is referred by nobody else.
+        self.exclusive = False
+
+        # (mtime, size) of the last loaded resource taken before loading it,
+        # None when the getter is unable to tell, refer to peek_stat.
+        self.stat = None
+
     def __iter__(self):
         return self
 
@@ -29,27 +292,38 @@ class Getter(six.Iterator):
         if len(self.urls) == 0:
             raise StopIteration
 
-        obj = self.load(self.urls.pop(0))
-
-        # make sure data is string type
-        if isinstance(obj, dict):
-            pass
-        elif isinstance(obj, six.binary_type):
-            obj = obj.decode('utf-8')
-        elif not isinstance(obj, six.string_types):
-            raise ValueError('Unknown types: [{0}]'.format(str(type(obj))))
-
-        # a very simple logic to distinguish json and yaml
-        if isinstance(obj, six.string_types):
-            try:
-                if obj.startswith('{'):
-                    obj = json.loads(obj)
-                else:
-                    obj = yaml.safe_load(obj)
-            except ValueError:
-                raise Exception('Unknown format startswith {0} ...'.format(obj[:10]))
-
-        return obj
+        self.stat = self.peek_stat()
+        path = self.urls.pop(0)
+        self.content_type = None
+        self.exclusive = False
+
+        raw = data = self.load(path)
+        try:
+            b = _content_bytes(data)
+            self.digest, self.size = hashlib.sha1(b).hexdigest(), len(b)
+
+            # gzip-ed resources are decompressed transparently
+            if isinstance(data, (six.binary_type, mmap.mmap)) and data[:2] == _gzip_magic:
+                with gzip.GzipFile(fileobj=io.BytesIO(data) if isinstance(data, six.binary_type) else data) as f:
+                    data = f.read()
+
+            # make sure data is string type
+            if isinstance(data, dict):
+                return data
+            elif isinstance(data, six.binary_type):
+                data = data.decode('utf-8')
+            elif isinstance(data, mmap.mmap):
+                # parsed in place, without copying into a string
+                pass
+            elif not isinstance(data, six.string_types):
+                raise ValueError('Unknown types: [{0}]'.format(str(type(data))))
+
+            name, obj = self.__parsers__.load(data, path=path, content_type=self.content_type)
+            self.exclusive = name == 'json'
+            return obj
+        finally:
+            if isinstance(raw, mmap.mmap):
+                raw.close()
 
     def load(self, path):
         """ load the resource, and return for parsing.
@@ -59,9 +333,86 @@ class Getter(six.Iterator):
         """
         raise NotImplementedError()
 
+    def open(self, path):
+        """ open the resource as a binary file, for those could be parsed
+        incrementally. Override it when the getter is able to do so.
+
+        :return: a file object, or None when not supported
+        """
+        return None
+
+    def stream(self, keys, refs=None):
+        """ parse the next resource incrementally, instead of loading it as
+        a whole. It's only applied to json resources, when ijson is installed
+        and the getter is able to open the resource as a file.
+
+        The resource is read when iterating the returned generator, 'digest',
+        'size' are updated once it's exhausted.
+
+        :param keys: names of top-level values split into members, refer to _iter_items
+        :param set refs: values of '$ref' are collected into it when provided
+        :return: generator of (key, name, json), None when unable to stream it
+        """
+        if ijson == None or len(self.urls) == 0:
+            return None
+
+        path = self.urls[0]
+        f = self.open(path)
+        if f == None:
+            return None
+        if self.__parsers__.find(f.read(64), path=path) != 'json':
+            f.close()
+            return None
+        f.seek(0)
+
+        self.stat = self.peek_stat()
+        self.urls.pop(0)
+        self.content_type = None
+        self.exclusive = True
+
+        def _items():
+            r = _DigestReader(f)
+            try:
+                for i in _iter_items(ijson.basic_parse(r, use_float=True), keys, refs):
+                    yield i
+                self.digest, self.size = r.digest, r.size
+            finally:
+                r.close()
+        return _items()
+
+    def peek_digest(self):
+        """ content hash of the next resource to load, without parsing it.
+
+        :rtype: str
+        """
+        if len(self.urls) == 0:
+            raise StopIteration
+
+        data = self.load(self.urls[0])
+        try:
+            return content_digest(data)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    def peek_stat(self):
+        """ (mtime, size) of the next resource to load, a cheap way to tell
+        it's not changed without reading it. Override it when the getter is
+        able to do so.
+
+        :return: a tuple, or None when not supported
+        """
+        return None
+
+
 class LocalGetter(Getter):
     """ default getter implmenetation for local resource file
     """
+
+    __mmap_threshold__ = 16 * 1024 * 1024
+    """ files not smaller than this size are memory-mapped and parsed in place,
+    instead of being read into a string. None to disable it.
+    """
     def __init__(self, path):
         super(LocalGetter, self).__init__(path)
 
@@ -71,7 +422,8 @@ class LocalGetter(Getter):
         if re.match('^/[A-Z]+:', path) is not None:
             path = os.path.abspath(path[1:])
 
-        for n in private.SWAGGER_FILE_NAMES:
+        gz = '.' + private.FILE_EXT_GZ
+        for n in private.SWAGGER_FILE_NAMES + [n + gz for n in private.SWAGGER_FILE_NAMES]:
             if self.base_path.endswith(n):
                 self.base_path = os.path.dirname(self.base_path)
                 self.urls = [path]
@@ -88,7 +440,7 @@ class LocalGetter(Getter):
             # in this case, we will locate them in this way:
             # - when 'path' points to a specific file, and its
             #   extension is either 'json' or 'yaml'.
-            _, ext = os.path.splitext(path)
+            _, ext = os.path.splitext(_strip_gz(path))
             for e in [private.FILE_EXT_JSON, private.FILE_EXT_YAML, private.FILE_EXT_YML]:
                 if ext.endswith(e):
                     self.base_path = os.path.dirname(path)
@@ -100,20 +452,184 @@ class LocalGetter(Getter):
                     if os.path.isfile(path + '.' + e):
                         self.urls = [path + '.' + e]
                         break
+                    if os.path.isfile(path + '.' + e + gz):
+                        self.urls = [path + '.' + e + gz]
+                        break
                 else:
                     raise ValueError('Unable to locate resource file: [{0}]'.format(path))
 
+    def __local_path(self, path):
+        """ the file to load for a path, the gzip-ed one is used when
+        the file doesn't exist.
+        """
+        path = patch_path(self.base_path, path)
+        gz = path + '.' + private.FILE_EXT_GZ
+        if not os.path.isfile(path) and os.path.isfile(gz):
+            path = gz
+        return path
+
     def load(self, path):
         logger.info('to load: [{0}]'.format(path))
 
-        path = patch_path(self.base_path, path)
+        path = self.__local_path(path)
         logger.info('final path to load: [{0}]'.format(path))
 
+        if self.__mmap_threshold__ != None and os.path.getsize(path) >= max(self.__mmap_threshold__, 1):
+            with open(path, 'rb') as f:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
         ret = None
-        with open(path, 'r') as f:
+        with open(path, 'rb' if path.endswith('.' + private.FILE_EXT_GZ) else 'r') as f:
             ret = f.read()
         return ret
 
+    def open(self, path):
+        path = self.__local_path(path)
+        if not os.path.isfile(path) or path.endswith('.' + private.FILE_EXT_GZ):
+            return None
+
+        logger.info('to stream: [{0}]'.format(path))
+        return open(path, 'rb')
+
+    def peek_stat(self):
+        if len(self.urls) == 0:
+            raise StopIteration
+
+        try:
+            st = os.stat(self.__local_path(self.urls[0]))
+        except OSError:
+            return None
+        return st.st_mtime, st.st_size
+
+
+def split_archive(path):
+    """ split a path going through an archive, ex. '/specs/api.zip/definitions/models.json'
+
+    :param str path: a local path
+    :return: path of the archive and the path of member in that archive, None when not in an archive
+    :rtype: (str, str)
+    """
+    parts = path.split('/')
+    for i in range(1, len(parts) + 1):
+        p = '/'.join(parts[:i])
+        if p.lower().endswith(tuple(private.ARCHIVE_EXTS)) and os.path.isfile(p):
+            return p, '/'.join(parts[i:])
+    return None
+
+
+def locate_in_archive(url):
+    """ when an url points to an archive, return the url of
+    the root document in it, otherwise return the url as it is.
+
+    :param str url: a normalized url
+    :rtype: str
+    """
+    p = six.moves.urllib.parse.urlparse(url)
+    if p.scheme != 'file' or not p.path.lower().endswith(tuple(private.ARCHIVE_EXTS)):
+        return url
+
+    g = ArchiveGetter(url)
+    return six.moves.urllib.parse.urlunparse(p[:2] + (p.path.rstrip('/') + '/' + g.urls[0],) + p[3:])
+
+
+class _Archives(object):
+    """ decompressed members of archives, each archive is read in one pass,
+    and dropped when modified.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__members = {}
+
+    def members(self, path):
+        """ get members of an archive
+
+        :param str path: path of the archive
+        :return: a map from name of member to its content
+        :rtype: dict of str to bytes
+        """
+        st = os.stat(path)
+        stamp = (st.st_mtime, st.st_size)
+        with self.__lock:
+            cached = self.__members.get(path, None)
+            if cached and cached[0] == stamp:
+                return cached[1]
+
+        logger.info('read archive: [{0}]'.format(path))
+
+        members = {}
+        if zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path) as z:
+                for info in z.infolist():
+                    if not info.filename.endswith('/'):
+                        members[info.filename] = z.read(info)
+        else:
+            with tarfile.open(path, 'r:*') as t:
+                for info in t:
+                    if info.isfile():
+                        members[info.name] = t.extractfile(info).read()
+
+        # './swagger.json' -> 'swagger.json'
+        members = dict((re.sub('^(\\./|/)+', '', k), v) for k, v in six.iteritems(members))
+        with self.__lock:
+            self.__members[path] = (stamp, members)
+        return members
+
+    def clear(self):
+        with self.__lock:
+            self.__members.clear()
+
+
+class ArchiveGetter(Getter):
+    """ getter for resource files bundled in a .zip/.tar(.gz) archive. An archive is
+    treated as a folder, ex. 'file:///specs/api.zip/swagger.json', relative $ref are
+    resolved inside it.
+
+    Members of an archive are decompressed and cached in one pass when
+    any of them is loaded.
+    """
+
+    _archives = _Archives()
+
+    def __init__(self, path):
+        super(ArchiveGetter, self).__init__(path)
+
+        if path.startswith('file://'):
+            path = six.moves.urllib.parse.unquote(six.moves.urllib.parse.urlparse(path).path)
+
+        split = split_archive(path)
+        if not split:
+            raise ValueError('Not in an archive: [{0}]'.format(path))
+
+        self.archive, member = split
+        self.urls = [self.__locate(member.strip('/'))]
+
+    def __locate(self, member):
+        """ find the member to load, like what LocalGetter did for files
+        """
+        members = self._archives.members(self.archive)
+        if member in members:
+            return member
+
+        gz = '.' + private.FILE_EXT_GZ
+        folder = member + '/' if member else ''
+        for n in private.SWAGGER_FILE_NAMES:
+            for c in [folder + n, folder + n + gz]:
+                if c in members:
+                    return c
+
+        for e in [private.FILE_EXT_JSON, private.FILE_EXT_YAML, private.FILE_EXT_YML]:
+            for c in [member + '.' + e, member + '.' + e + gz]:
+                if c in members:
+                    return c
+
+        raise ValueError('Unable to locate resource file: [{0}] in [{1}]'.format(member, self.archive))
+
+    def load(self, path):
+        logger.info('to load: [{0}] in [{1}]'.format(path, self.archive))
+
+        return self._archives.members(self.archive)[path]
+
 
 class SimpleGetter(Getter):
     """ the simple getter that don't have to concern file loading of LocalGetter
@@ -155,6 +671,181 @@ class UrlGetter(SimpleGetter):
     __simple_getter_callback__ = _url_load
 
 
+class _ConnectionPool(object):
+    """ idle keep-alive connections, grouped by (scheme, host)
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__idle = {}
+
+    def get(self, scheme, netloc, timeout):
+        with self.__lock:
+            conns = self.__idle.get((scheme, netloc), None)
+            if conns:
+                return conns.pop(), True
+
+        kls = six.moves.http_client.HTTPSConnection if scheme == 'https' else six.moves.http_client.HTTPConnection
+        return kls(netloc, timeout=timeout), False
+
+    def put(self, scheme, netloc, conn):
+        with self.__lock:
+            self.__idle.setdefault((scheme, netloc), []).append(conn)
+
+    def clear(self):
+        with self.__lock:
+            idle, self.__idle = self.__idle, {}
+
+        for conns in six.itervalues(idle):
+            for c in conns:
+                c.close()
+
+
+class HttpGetter(SimpleGetter):
+    """ getter for remote resource file over http(s), which
+    - reuses keep-alive connections to the same host.
+    - keeps loaded resources in '__cache_dir__', along with their ETag/Last-Modified,
+      and revalidates them with conditional requests.
+    - loads from '__cache_dir__' only when '__offline__' is True.
+
+    To configure it, subclass it:
+
+    .. code-block:: python
+
+        class MyGetter(HttpGetter):
+            __cache_dir__ = '/var/cache/specs'
+
+        app = App.load(url, getter=MyGetter)
+    """
+
+    __cache_dir__ = None
+    """ folder to keep loaded resources, no cache when None
+    """
+
+    __offline__ = False
+    """ load from cache only, without any request
+    """
+
+    __timeout__ = 30
+    """ timeout of connections, in seconds
+    """
+
+    __max_redirects__ = 5
+
+    _pool = _ConnectionPool()
+
+    def __cache_path(self, path):
+        return os.path.join(self.__cache_dir__, hashlib.sha1(path.encode('utf-8')).hexdigest())
+
+    def __read_cache(self, path):
+        """ get (metadata, body) of a cached resource, None when missing
+        """
+        if not self.__cache_dir__:
+            return None
+
+        p = self.__cache_path(path)
+        try:
+            with open(p + '.meta', 'r') as f:
+                meta = json.load(f)
+            with open(p + '.body', 'rb') as f:
+                return meta, f.read()
+        except (IOError, OSError, ValueError):
+            return None
+
+    def __write_cache(self, path, headers, body):
+        if not self.__cache_dir__:
+            return
+
+        if not os.path.isdir(self.__cache_dir__):
+            os.makedirs(self.__cache_dir__)
+
+        meta = dict(
+            url=path,
+            etag=headers.get('ETag', None),
+            last_modified=headers.get('Last-Modified', None),
+            content_type=headers.get('Content-Type', None),
+        )
+
+        # the body is written first, and both of them are renamed from temporary
+        # files, readers would never see a partial one.
+        p = self.__cache_path(path)
+        for ext, mode, data in [('.body', 'wb', body), ('.meta', 'w', json.dumps(meta))]:
+            fd, tmp = tempfile.mkstemp(dir=self.__cache_dir__)
+            with os.fdopen(fd, mode) as f:
+                f.write(data)
+            replace_file(tmp, p + ext)
+
+    def __request(self, url, headers):
+        """ perform a GET request with a pooled connection
+
+        :return: (status, headers, body)
+        """
+        p = six.moves.urllib.parse.urlparse(url)
+        target = six.moves.urllib.parse.urlunparse(('', '') + p[2:5] + ('',)) or '/'
+
+        while True:
+            conn, reused = self._pool.get(p.scheme, p.netloc, self.__timeout__)
+            try:
+                conn.request('GET', target, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+            except (six.moves.http_client.HTTPException, IOError, OSError):
+                conn.close()
+                if reused:
+                    # the idle connection might be closed by server, retry with a new one
+                    continue
+                raise
+            break
+
+        if resp.getheader('Connection', '').lower() == 'close' or resp.will_close:
+            conn.close()
+        else:
+            self._pool.put(p.scheme, p.netloc, conn)
+
+        resp_headers = CaseInsensitiveDict()
+        for k, v in resp.getheaders():
+            resp_headers[k] = v
+
+        return resp.status, resp_headers, body
+
+    def load(self, path):
+        logger.info('to load: [{0}]'.format(path))
+
+        cached = self.__read_cache(path)
+        if self.__offline__:
+            if not cached:
+                raise ValueError('not cached when offline: [{0}]'.format(path))
+            self.content_type = cached[0].get('content_type', None)
+            return cached[1]
+
+        headers = {}
+        if cached:
+            meta = cached[0]
+            if meta.get('etag', None):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified', None):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        url = path
+        for _ in range(self.__max_redirects__ + 1):
+            status, resp_headers, body = self.__request(url, headers)
+            if status in (301, 302, 303, 307, 308) and 'Location' in resp_headers:
+                url = six.moves.urllib.parse.urljoin(url, resp_headers['Location'])
+                continue
+            break
+
+        if status == 304 and cached:
+            logger.info('not modified: [{0}]'.format(path))
+            self.content_type = cached[0].get('content_type', None)
+            return cached[1]
+        if status != 200:
+            raise six.moves.urllib.error.HTTPError(url, status, 'unable to load', resp_headers, None)
+
+        self.content_type = resp_headers.get('Content-Type', None)
+        self.__write_cache(path, resp_headers, body)
+        return body
+
+
 class DictGetter(Getter):
     """ a getter accept a dict as parameter without loading from file / url
 
@@ -164,8 +164,6 @@ class Primitive(object):
         ctx = {} if ctx == None else ctx
         if 'name' not in ctx and hasattr(obj, 'name'):
             ctx['name'] = obj.name
-        if 'guard' not in ctx:
-            ctx['guard'] = CycleGuard()
         if 'addp_schema' not in ctx:
             # Schema Object of additionalProperties
             ctx['addp_schema'] = None
@@ -182,65 +180,83 @@ class Primitive(object):
             # default is in 'read' context
             ctx['read'] = True
 
-        # cycle guard
-        ctx['guard'].update(obj)
-
-        ret = None
-        if obj.type:
-            creater, _2nd = self.get(_type=obj.type, _format=obj.format)
-            if not creater:
-                raise ValueError('Can\'t resolve type from:(' + str(obj.type) + ', ' + str(obj.format) + ')')
-
-            ret = creater(obj, val, ctx)
-            if _2nd:
-                val = _2nd(obj, ret, val, ctx)
-                ctx['2nd_pass'] = _2nd
-        elif len(obj.properties) or obj.additionalProperties:
-            ret = Model()
-            val = ret.apply_with(obj, val, ctx)
-
-        if isinstance(ret, (Date, Datetime, Byte, File)):
-            # it's meanless to handle allOf for these types.
-            return ret
-
-        def _apply(o, r, v, c):
-            if hasattr(ret, 'apply_with'):
-                v = r.apply_with(o, v, c)
-            else:
-                _2nd = c['2nd_pass']
-                if _2nd == None:
-                    _, _2nd = self.get(_type=o.type, _format=o.format)
+        # cycle guard, shared by nested produce calls. Only a container
+        # could contain itself, other values are not tracked. The same
+        # Schema might be met again for nested values, but not for the same value.
+        guard = None
+        if isinstance(val, (list, dict)):
+            guard = ctx.get('guard', None)
+            if guard == None:
+                guard = ctx['guard'] = CycleGuard()
+            guard.enter(obj, val)
+        try:
+            ret = None
+            if obj.type:
+                creater, _2nd = self.get(_type=obj.type, _format=obj.format)
+                if not creater:
+                    raise ValueError('Can\'t resolve type from:(' + str(obj.type) + ', ' + str(obj.format) + ')')
+
+                ret = creater(obj, val, ctx)
                 if _2nd:
-                    _2nd(o, r, v, c)
-                    # update it back to context
-                    c['2nd_pass'] = _2nd
-            return v
-
-        # handle allOf for Schema Object
-        allOf = getattr(obj, 'allOf', None)
-        if allOf:
-            not_applied = []
-            for a in allOf:
-                a = deref(a)
-                if not ret:
-                    # try to find right type for this primitive.
-                    ret = self.produce(a, val, ctx)
-                    is_member = hasattr(ret, 'apply_with')
+                    val = _2nd(obj, ret, val, ctx)
+                    ctx['2nd_pass'] = _2nd
+            elif len(obj.properties) or obj.additionalProperties:
+                ret = Model()
+                val = ret.apply_with(obj, val, ctx)
+
+            if isinstance(ret, (Date, Datetime, Byte, File)):
+                # it's meanless to handle allOf for these types.
+                return ret
+
+            def _apply(o, r, v, c):
+                if hasattr(ret, 'apply_with'):
+                    v = r.apply_with(o, v, c)
                 else:
-                    val = _apply(a, ret, val, ctx)
-
-                if not ret:
-                    # if we still can't determine the type,
-                    # keep this Schema object for later use.
-                    not_applied.append(a)
-            if ret:
-                for a in not_applied:
-                    val = _apply(a, ret, val, ctx)
+                    _2nd = c['2nd_pass']
+                    if _2nd == None:
+                        _, _2nd = self.get(_type=o.type, _format=o.format)
+                    if _2nd:
+                        _2nd(o, r, v, c)
+                        # update it back to context
+                        c['2nd_pass'] = _2nd
+                return v
+
+            # handle allOf for Schema Object
+            allOf = getattr(obj, 'allOf', None)
+            if allOf:
+                # Schema(s) along 'allOf' are tracked by themselves, the value
+                # might be replaced at each level, ex. by Model.apply_with.
+                if 'all_of' not in ctx:
+                    ctx['all_of'] = CycleGuard()
+                ctx['all_of'].enter(obj)
+                try:
+                    not_applied = []
+                    for a in allOf:
+                        a = deref(a)
+                        if not ret:
+                            # try to find right type for this primitive.
+                            ret = self.produce(a, val, ctx)
+                            is_member = hasattr(ret, 'apply_with')
+                        else:
+                            val = _apply(a, ret, val, ctx)
+
+                        if not ret:
+                            # if we still can't determine the type,
+                            # keep this Schema object for later use.
+                            not_applied.append(a)
+                    if ret:
+                        for a in not_applied:
+                            val = _apply(a, ret, val, ctx)
+                finally:
+                    ctx['all_of'].leave()
+
+            if ret != None and hasattr(ret, 'cleanup'):
+                val = ret.cleanup(val, ctx)
 
-        if ret != None and hasattr(ret, 'cleanup'):
-            val = ret.cleanup(val, ctx)
-
-        return ret
+            return ret
+        finally:
+            if guard != None:
+                guard.leave()
 
     def is_primitive(self, _type):
         """ check if a given object refering to a primitive
@@ -1,6 +1,5 @@
 from __future__ import absolute_import
 from ..errs import ValidationError, SchemaError
-import functools
 import six
 
 
@@ -45,7 +44,7 @@ class Array(list):
                 val = set(val)
 
         if obj.items and len(val):
-            self.extend(map(functools.partial(ctx['factory'].produce, obj.items), val))
+            self.extend(ctx['factory'].produce(obj.items, v, dict(guard=ctx.get('guard', None))) for v in val)
             val = []
 
         # init array as list
@@ -26,7 +26,7 @@ class Model(dict):
                 if pobj.readOnly == True and ctx['read'] == False:
                     raise Exception('read-only property is set in write context.')
 
-                self[k] = ctx['factory'].produce(pobj, v)
+                self[k] = ctx['factory'].produce(pobj, v, dict(guard=ctx.get('guard', None)))
 
             # TODO: patternProperties here
             # TODO: fix bug, everything would not go into additionalProperties, instead of recursive
@@ -42,7 +42,7 @@ class Model(dict):
         for k in other_prop:
             p = obj.properties[k]
             if p.is_set("default"):
-                self[k] = ctx['factory'].produce(p, p.default)
+                self[k] = ctx['factory'].produce(p, p.default, dict(guard=ctx.get('guard', None)))
 
         not_found = set(obj.required) - set(six.iterkeys(self))
         if len(not_found):
@@ -69,7 +69,7 @@ class Model(dict):
         elif ctx['addp_schema'] != None:
             obj = ctx['addp_schema']
             for k, v in six.iteritems(val):
-                self[k] = ctx['factory'].produce(obj.additionalProperties, v)
+                self[k] = ctx['factory'].produce(obj.additionalProperties, v, dict(guard=ctx.get('guard', None)))
             ctx['addp_schema'] = None
 
         return {}
@@ -1,29 +1,92 @@
 from __future__ import absolute_import
-from .utils import jr_split, jp_split
-from .getter import UrlGetter, LocalGetter
+from .utils import jr_split, jp_split, normalize_jr
+from .getter import UrlGetter, LocalGetter, ArchiveGetter, split_archive
+from .errs import LoadError
 import six
 import os
 import inspect
+import threading
+import collections
 import logging
 
+try:
+    # a backport, 'futures', is required on python 2
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+except ImportError:
+    ThreadPoolExecutor = None
+
 
 logger = logging.getLogger(__name__)
 
 
+def _collect_refs(obj):
+    """ collect values of '$ref' in a loaded json/yaml
+    """
+    ret, stk = [], [obj]
+    while len(stk) > 0:
+        o = stk.pop()
+        if isinstance(o, dict):
+            r = o.get('$ref', None)
+            if isinstance(r, six.string_types):
+                ret.append(r)
+            stk.extend(six.itervalues(o))
+        elif isinstance(o, list):
+            stk.extend(o)
+
+    return ret
+
+
+class CachePolicy:
+    """ Enum of policies to cache loaded documents in Resolver
+    """
+
+    # keep all loaded documents
+    keep_all_ = 1
+
+    # keep recently used documents within a budget in bytes
+    lru_ = 2
+
+    # release all loaded documents once App is prepared
+    release_after_prepare_ = 3
+
+
 class Resolver(object):
     """ JSON Reference Resolver:
     resolving a JSON reference to a raw object (dict),
     then return and cache it.
     """
 
-    def __init__(self, url_load_hook=None, default_getter=None):
+    def __init__(self, url_load_hook=None, default_getter=None, max_workers=1, cache_policy=CachePolicy.keep_all_, cache_budget=None, shared_cache=None):
         """
         args:
          - url_load_hook: a way to redirect url to a accessible place, for self testing
          - default_getter: the default getter used when none is provided in 'resolve' method
+         - max_workers: maximum number of documents loaded concurrently in 'resolve_all'
+         - cache_policy: how loaded documents are cached, refer to CachePolicy
+         - cache_budget: maximum size in bytes of cached documents, for CachePolicy.lru_
+         - shared_cache: pyswagg.cache.SharedCache shared with other resolvers
         """
-        # a map from url to loaded json/yaml
-        self.__cache = {}
+        if cache_policy == CachePolicy.lru_ and not cache_budget:
+            raise ValueError('cache_budget is required for LRU cache policy')
+
+        # a map from url to loaded json/yaml, ordered by the last access
+        self.__cache = collections.OrderedDict()
+        self.__cache_policy = cache_policy
+        self.__cache_budget = cache_budget
+        self.__lock = threading.Lock()
+
+        # a map from url to size in bytes of loaded json/yaml
+        self.__sizes = {}
+
+        # a map from url to content hash of loaded json/yaml
+        self.__digests = {}
+
+        # a map from url to (mtime, size) of loaded json/yaml, for
+        # those Getter.peek_stat is supported.
+        self.__stats = {}
+
+        # a map from url to a map from JSON pointer to resolved object
+        self.__ptrs = {}
 
         # things to make unittest easier,
         # all urls to load json would go through this hook
@@ -32,50 +95,351 @@ class Resolver(object):
         # default getter for all resolving
         self.__default_getter = default_getter
 
-    def resolve(self, jref, getter=None):
+        # size of thread pool to load documents
+        self.__max_workers = max_workers
+
+        # a map from url of document whose '$ref' are prefetched
+        # to urls of documents referenced by it
+        self.__prefetched = {}
+
+        # documents loaded by other resolvers in this process
+        self.__shared = shared_cache
+
+    @property
+    def cache_policy(self):
+        """ policy to cache loaded documents
+
+        :type: int, one of CachePolicy
         """
+        return self.__cache_policy
+
+    @property
+    def shared_cache(self):
+        """ cache shared with other resolvers, None when not shared
+
+        :type: pyswagg.cache.SharedCache
         """
-        url, jp = jr_split(jref)
+        return self.__shared
 
+    @property
+    def cached(self):
+        """ urls of cached documents, the least recently used first
+
+        :type: list of str
+        """
+        with self.__lock:
+            return list(self.__cache.keys())
+
+    @property
+    def cache_size(self):
+        """ total size in bytes of cached documents, those with unknown size are not counted
+
+        :type: int
+        """
+        with self.__lock:
+            return sum(self.__sizes.get(u, None) or 0 for u in self.__cache)
+
+    def release(self, urls=None):
+        """ drop cached documents, they would be loaded again when resolved
+
+        :param list urls: urls of documents to release, all of them when None
+        """
+        with self.__lock:
+            urls = list(self.__cache.keys()) if urls == None else urls
+            for u in urls:
+                self.__cache.pop(u, None)
+                self.__ptrs.pop(u, None)
+            self.__unmark_prefetched(urls)
+
+    def __unmark_prefetched(self, urls):
+        """ documents dropped from cache, along with those referring to them,
+        should be prefetched again. Called with the lock held.
+        """
+        todo = set(urls)
+        while todo:
+            for u in todo:
+                self.__prefetched.pop(u, None)
+            todo = set(u for u, refs in six.iteritems(self.__prefetched) if not refs.isdisjoint(todo))
+
+    def __evict(self, keep):
+        """ drop least recently used documents until the budget is met,
+        the document just loaded is always kept.
+        """
+        if self.__cache_policy != CachePolicy.lru_:
+            return
+
+        size = sum(self.__sizes.get(u, None) or 0 for u in self.__cache)
+        for u in list(self.__cache.keys()):
+            if size <= self.__cache_budget:
+                break
+            if u == keep:
+                continue
+
+            logger.info('evict [{0}] from cache'.format(u))
+            self.__cache.pop(u)
+            self.__ptrs.pop(u, None)
+            self.__unmark_prefetched([u])
+            size -= self.__sizes.get(u, None) or 0
+
+    @property
+    def digests(self):
+        """ content hash of every document loaded by this resolver
+
+        :type: dict of url to str
+        """
+        return dict(self.__digests)
+
+    def location(self, url):
+        """ the location used to load an url, after applying url_load_hook
+
+        :param str url: url of the document
+        :rtype: str
+        """
+        return self.__url_load_hook(url) if self.__url_load_hook else url
+
+    def __prepare_getter(self, url, getter):
+        """ initialize the getter to load an url
+        """
         # apply hook when use this url to load
         # note that we didn't cache App with this local_url
-        local_url = self.__url_load_hook(url) if self.__url_load_hook else url
+        local_url = self.location(url)
 
         logger.info('{0} patch to {1}'.format(url, local_url))
 
+        if not getter:
+            getter = self.__default_getter or UrlGetter
+            p = six.moves.urllib.parse.urlparse(local_url)
+            if p.scheme == 'file' and p.path:
+                path = os.path.join(p.netloc, six.moves.urllib.parse.unquote(p.path))
+                getter = ArchiveGetter(path) if split_archive(path) else LocalGetter(path)
+
+        if inspect.isclass(getter):
+            # default initialization is passing the url
+            # you can override this behavior by passing an
+            # initialized getter object.
+            getter = getter(local_url)
+
+        return getter
+
+    def digest(self, url, getter=None):
+        """ content hash of the document located by 'url' at this moment,
+        the document would be loaded, but not parsed or cached. When the getter
+        reports the same (mtime, size) as when it's loaded, it's not loaded and
+        the known content hash is returned.
+
+        :param str url: url of the document
+        :param getter: customized Getter
+        :return: the content hash, None when unable to load it
+        :rtype: str
+        """
+        try:
+            getter = self.__prepare_getter(url, getter)
+            st = getter.peek_stat()
+            with self.__lock:
+                known, digest = self.__stats.get(url, None), self.__digests.get(url, None)
+            if st != None and st == known:
+                return digest
+
+            ret = getter.peek_digest()
+        except (StopIteration, IndexError):
+            return None
+
+        if st != None and ret == digest:
+            # touched without changes
+            with self.__lock:
+                self.__stats[url] = st
+        return ret
+
+    def load(self, url, getter=None):
+        """ load a document without caching it, for documents consumed once,
+        ex. the root document loaded in streaming mode.
+
+        :param str url: url of the document
+        :param getter: customized Getter
+        :return: the loaded document, and if it's exclusively owned by the caller,
+        ie. it's parsed from json and safe to be modified.
+        :rtype: (dict, bool)
+        """
+        getter = self.__prepare_getter(url, getter)
+
+        obj = six.advance_iterator(getter)
+        self.__digests[url] = getattr(getter, 'digest', None)
+        self.__sizes[url] = getattr(getter, 'size', None)
+        self.__stats[url] = getattr(getter, 'stat', None)
+        return obj, getattr(getter, 'exclusive', False)
+
+    def stream(self, url, keys, refs=None, getter=None):
+        """ parse a document incrementally without caching it, refer to
+        pyswagg.getter.Getter.stream for details.
+
+        :param str url: url of the document
+        :param keys: names of top-level values split into members
+        :param set refs: values of '$ref' are collected into it when provided
+        :param getter: customized Getter
+        :return: generator of (key, name, json), None when unable to stream it
+        """
+        getter = self.__prepare_getter(url, getter)
+
+        items = getattr(getter, 'stream', lambda *args: None)(keys, refs)
+        if items == None:
+            return None
+
+        def _items():
+            for i in items:
+                yield i
+            self.__digests[url] = getter.digest
+            self.__sizes[url] = getter.size
+            self.__stats[url] = getter.stat
+        return _items()
+
+    def resolve(self, jref, getter=None):
+        """
+        """
+        url, jp = jr_split(jref)
+
         # check cache
-        obj = self.__cache.get(url, None)
+        with self.__lock:
+            obj = self.__cache.get(url, None)
+            if obj and self.__cache_policy == CachePolicy.lru_:
+                self.__cache[url] = self.__cache.pop(url)
+            ptrs = self.__ptrs.setdefault(url, {})
+
+        if not obj and self.__shared and not getter:
+            # loaded by other resolvers
+            found = self.__shared.get_raw(self.location(url))
+            if found:
+                obj = found[0]
+                with self.__lock:
+                    self.__cache[url] = obj
+                    self.__sizes[url], self.__digests[url] = found[1], found[2]
+                    self.__stats.pop(url, None)
+                    ptrs = self.__ptrs[url] = {}
+                    self.__evict(keep=url)
+
         if not obj:
             # load that object
-            if not getter:
-                getter = self.__default_getter or UrlGetter
-                p = six.moves.urllib.parse.urlparse(local_url)
-                if p.scheme == 'file' and p.path:
-                    getter = LocalGetter(os.path.join(p.netloc, six.moves.urllib.parse.unquote(p.path)))
-
-            if inspect.isclass(getter):
-                # default initialization is passing the url
-                # you can override this behavior by passing an
-                # initialized getter object.
-                getter = getter(local_url)
-
-            obj = six.advance_iterator(getter)
-            self.__cache[url] = obj if obj else None
-
-        if obj:
-            ts = jp_split(jp)[1:]
-            while len(ts) > 0:
-                t = ts.pop(0)
-                if isinstance(obj, list):
-                    obj = obj[int(t)]
-                elif isinstance(obj, dict):
-                    obj = obj[t]
-                else:
-                    raise Exception('Invalid type to resolve json-pointer: {0}'.format(str(type(obj))))
-        else:
+            obj, _ = self.load(url, getter)
+            if obj and self.__shared and not getter:
+                obj = self.__shared.put_raw(self.location(url), obj, self.__sizes[url], self.__digests[url])
+            with self.__lock:
+                self.__cache[url] = obj if obj else None
+                ptrs = self.__ptrs[url] = {}
+                self.__evict(keep=url)
+
+        if not obj:
             raise Exception('Unable to resolve: {0}'.format(jref))
 
+        # resolved json-pointers are remembered, loaded json/yaml is never changed.
+        if jp in ptrs:
+            return ptrs[jp]
+
+        for t in jp_split(jp)[1:]:
+            if isinstance(obj, list):
+                obj = obj[int(t)]
+            elif isinstance(obj, dict):
+                obj = obj[t]
+            else:
+                raise Exception('Invalid type to resolve json-pointer: {0}'.format(str(type(obj))))
+
+        ptrs[jp] = obj
         return obj
 
+    def resolve_all(self, jrefs, getter=None):
+        """ resolve a list of JSON references. Documents are loaded concurrently
+        when 'max_workers' > 1 and each of them could be loaded by its own getter,
+        ie. the getter is a class, not an initialized object shared by all of them.
+
+        :param list jrefs: list of JSON references
+        :param getter: customized Getter
+        :return: resolved objects, in the same order of 'jrefs'
+        :rtype: list
+        :raises LoadError: when any of them failed in concurrent mode
+        """
+        jrefs = list(jrefs)
+        if len(jrefs) <= 1 or not self.__concurrent(getter):
+            return [self.resolve(jref, getter) for jref in jrefs]
+
+        with ThreadPoolExecutor(max_workers=min(self.__max_workers, len(jrefs))) as pool:
+            fs = [pool.submit(self.resolve, jref, getter) for jref in jrefs]
+
+        ret, errors = [], []
+        for jref, f in zip(jrefs, fs):
+            try:
+                ret.append(f.result())
+            except Exception as e:
+                errors.append((jref, e))
+
+        if errors:
+            raise LoadError(errors)
+
+        return ret
+
+    def __concurrent(self, getter):
+        """ check if documents could be loaded concurrently with this getter,
+        they are loaded one by one when concurrent.futures is not available.
+        """
+        g = getter or self.__default_getter
+        return self.__max_workers > 1 and ThreadPoolExecutor != None and (g == None or inspect.isclass(g))
+
+    def __try_resolve(self, url):
+        """ resolve an url, return None when failed
+        """
+        try:
+            self.resolve(url)
+        except Exception as e:
+            logger.info('unable to prefetch [{0}]: {1}'.format(url, e))
+            return None
+        return url
+
+    def prefetch(self, jref, raw=None, refs=None):
+        """ load documents referenced by '$ref' in the document of 'jref', along
+        with those referenced by them, concurrently. Documents are scanned for
+        '$ref' once they are loaded, without waiting for others.
+
+        Loaded documents are cached. Failures are ignored here, they would be
+        raised again when those documents are really resolved.
+
+        :param str jref: JSON reference to a loaded document
+        :param dict raw: the document of 'jref', when it's not cached
+        :param refs: values of '$ref' in the document of 'jref', when it's not kept at all
+        """
+        if not self.__concurrent(None):
+            return
+
+        url, _ = jr_split(jref)
+        with self.__lock:
+            if url in self.__prefetched:
+                return
+
+        with ThreadPoolExecutor(max_workers=self.__max_workers) as pool:
+            submitted, pending = set(), set()
+
+            def _scan(u, obj=None):
+                with self.__lock:
+                    if u in self.__prefetched:
+                        return
+                    obj = obj or self.__cache.get(u, None)
+
+                urls = set()
+                for r in (_collect_refs(obj) if u != url or refs == None else refs):
+                    ru, _ = jr_split(normalize_jr(r, u))
+                    if ru and ru != u:
+                        urls.add(ru)
+
+                with self.__lock:
+                    self.__prefetched[u] = urls
+                    todo = [ru for ru in urls if ru != url and ru not in self.__cache and ru not in submitted]
+
+                for ru in todo:
+                    submitted.add(ru)
+                    pending.add(pool.submit(self.__try_resolve, ru))
+
+            _scan(url, raw)
+            while len(pending) > 0:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for f in done:
+                    if f.result():
+                        _scan(f.result())
+
 
 SwaggerResolver = Resolver
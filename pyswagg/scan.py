@@ -1,6 +1,9 @@
 from __future__ import absolute_import
 from .spec.base import BaseObj
 import six
+import timeit
+import heapq
+import collections
 
 
 def default_tree_traversal(root, leaves):
@@ -19,6 +22,165 @@ def default_tree_traversal(root, leaves):
         yield path, obj
 
 
+def fused_tree_traversal(root, leaves):
+    """ tree traversal for fused stages, children are collected after
+    handlers of a node are done, so changes made by them are visible to
+    stages in the same traversal.
+    """
+    objs = [('#', root)]
+    while len(objs) > 0:
+        path, obj = objs.pop()
+
+        yield path, obj
+
+        if obj.__class__ not in leaves:
+            objs.extend(map(lambda i: (path + '/' + i[0],) + (i[1],), six.iteritems(obj._children_)))
+
+
+def shallow_traversal(root, leaves):
+    """ tree traversal visiting only the root """
+    yield '#', root
+
+
+def based_traversal(nexter, base):
+    """ wrap a tree traversal over a subtree, JSON pointers are
+    reported from the root of the whole tree.
+
+    :param str base: JSON pointer of the subtree
+    """
+    def _nexter(root, leaves):
+        for path, obj in nexter(root, leaves):
+            yield base + path[1:], obj
+    return _nexter
+
+
+class NodeIndex(object):
+    """ flat index of objects in a tree, a map from JSON pointer to object,
+    grouped by their concrete classes and kept in traversal order.
+    """
+
+    def __init__(self):
+        # sequence number of the next new entry
+        self.__next = 0
+
+        # a map from JSON pointer to (sequence number, object)
+        self.__objs = {}
+
+        # a map from class to an ordered map from JSON pointer to sequence number
+        self.__by_cls = {}
+
+    def __len__(self):
+        return len(self.__objs)
+
+    def __contains__(self, path):
+        return path in self.__objs
+
+    @property
+    def classes(self):
+        """ classes of indexed objects
+
+        :type: list of class
+        """
+        return [c for c, v in six.iteritems(self.__by_cls) if v]
+
+    def clear(self):
+        self.__next = 0
+        self.__objs.clear()
+        self.__by_cls.clear()
+
+    def add(self, path, obj):
+        """ index an object, an existing entry of the same path is replaced
+        but keep its order.
+
+        :param str path: JSON pointer of that object
+        :param obj: the object to index
+        """
+        old = self.__objs.get(path, None)
+        if old:
+            seq = old[0]
+            if old[1].__class__ is not obj.__class__:
+                self.__by_cls[old[1].__class__].pop(path, None)
+        else:
+            seq = self.__next
+            self.__next += 1
+
+        self.__objs[path] = (seq, obj)
+        self.__by_cls.setdefault(obj.__class__, collections.OrderedDict())[path] = seq
+
+    def update(self, path, obj):
+        """ index a subtree, used when new objects are attached to the tree.
+
+        :param str path: JSON pointer of the root of that subtree
+        :param obj: the root of that subtree
+        """
+        for p, o in default_tree_traversal(obj, []):
+            self.add(path + p[1:], o)
+
+    def get(self, path, default=None):
+        """ get an indexed object by JSON pointer
+        """
+        return self.__objs[path][1] if path in self.__objs else default
+
+    def copy(self, excludes=()):
+        """ a copy of this index, in the same order. Subtrees to be replaced
+        could be dropped, objects indexed later are placed after others.
+
+        :param excludes: JSON pointers of roots of subtrees to be dropped
+        :rtype: NodeIndex
+        """
+        excludes = set(excludes)
+        prefixes = tuple(e + '/' for e in excludes)
+
+        ret = NodeIndex()
+        ret.__next = self.__next
+        for p, v in six.iteritems(self.__objs):
+            if p not in excludes and not p.startswith(prefixes):
+                ret.__objs[p] = v
+        for c, d in six.iteritems(self.__by_cls):
+            ret.__by_cls[c] = collections.OrderedDict((p, seq) for p, seq in six.iteritems(d) if p in ret.__objs)
+        return ret
+
+    def nodes(self, *classes):
+        """ iterate through indexed objects of these classes (including subclasses)
+        in traversal order, all objects when no class is provided.
+
+        :return: generator of (JSON pointer, object)
+        """
+        # entries are copied, handlers are free to update this index
+        # during iteration.
+        ds = [d for c, d in six.iteritems(self.__by_cls) if not classes or issubclass(c, classes)]
+        if len(ds) == 1:
+            ps = list(ds[0])
+        else:
+            ps = [p for _, p in heapq.merge(*[[(seq, p) for p, seq in six.iteritems(d)] for d in ds])]
+
+        for p in ps:
+            yield p, self.__objs[p][1]
+
+    def recorder(self, nexter):
+        """ wrap a tree traversal to record what's visited
+        """
+        def _nexter(root, leaves):
+            for path, obj in nexter(root, leaves):
+                self.add(path, obj)
+                yield path, obj
+        return _nexter
+
+    def traversal(self, classes):
+        """ a tree traversal over indexed objects of these classes
+        """
+        def _nexter(root, leaves):
+            if not classes:
+                return iter([])
+            return self.nodes(*classes)
+        return _nexter
+
+
+# cache of dispatch tables, a map from types of scanners in route
+# to a map from class of object to its handlers.
+_dispatch_tables = {}
+
+
 class DispatcherMeta(type):
     """ metaclass for Dispatcher
     """
@@ -52,6 +214,8 @@ class Dispatcher(six.with_metaclass(DispatcherMeta, object)):
         else:
             cls.obj_route[t] = [f]
 
+        _dispatch_tables.clear()
+
     @classmethod
     def register(cls, target):
         """
@@ -75,6 +239,7 @@ class Dispatcher(six.with_metaclass(DispatcherMeta, object)):
 
         # avoid bound error
         cls.result_fn = [f]
+        _dispatch_tables.clear()
         return f
 
 
@@ -94,33 +259,231 @@ class Scanner(object):
         """
         ret = []
         for r in route:
-            for attr in r.__class__.__dict__:
-                o = getattr(r, attr)
+            # not by getattr, properties of scanners are not triggered
+            for o in six.itervalues(r.__class__.__dict__):
                 if type(o) == DispatcherMeta:
                     ret.append((r, o.obj_route, o.result_fn[0]))
 
         return ret
 
-    def scan(self, route, root, nexter=default_tree_traversal, leaves=[]):
+    @staticmethod
+    def __resolve(merged_r, cls):
+        """ resolve handlers for a class of object
+
+        :return: tuple of (index in route, handler, result function)
+        """
+        ret = []
+        for idx, (_, r, res) in enumerate(merged_r):
+            for c in cls.__mro__[:-1]:
+                if c is BaseObj:
+                    break
+                for f in r.get(c, []):
+                    ret.append((idx, f, res))
+
+        return tuple(ret)
+
+    def __binder(self, route, merged_r, bound):
+        """ a function to bind handlers for a class of object into 'bound',
+        the dispatch table is shared among scans with the same types of scanners.
         """
+        table = _dispatch_tables.setdefault(tuple(r.__class__ for r in route), {})
+
+        def _bind(cls):
+            rs = table.get(cls, None)
+            if rs == None:
+                rs = table[cls] = self.__resolve(merged_r, cls)
+
+            hs = bound[cls] = tuple((
+                merged_r[idx][0],
+                f.__get__(merged_r[idx][0]),
+                res.__get__(merged_r[idx][0]) if res else None
+            ) for idx, f, res in rs)
+            return hs
+
+        return _bind
+
+    def handles(self, route, cls):
+        """ check if there is any handler in route for a class of object
+
+        :param list route: list of scanners
+        :param cls: class of object
+        :rtype: bool
+        """
+        table = _dispatch_tables.setdefault(tuple(r.__class__ for r in route), {})
+        rs = table.get(cls, None)
+        if rs == None:
+            rs = table[cls] = self.__resolve(self.__build_route(route), cls)
+        return len(rs) > 0
+
+    def scan(self, route, root, nexter=default_tree_traversal, leaves=[], timing=None):
+        """
+        :param dict timing: when provided, time spent in handlers is accumulated
+         into it, keyed by the object in route.
         """
         if root == None:
             raise ValueError('Can\'t scan because root==None')
 
-        merged_r = self.__build_route(route)
+        # a map from class of object to its bound handlers,
+        # an empty tuple for classes without handlers.
+        app, bound = self.app, {}
+        bind = self.__binder(route, self.__build_route(route), bound)
         for path, obj in nexter(root, leaves):
-            for the_self, r, res in merged_r:
-
-                def handle_cls(cls):
-                    f = r.get(cls, None)
-                    if f:
-                        for ff in f:
-                            ret = ff(the_self, path, obj, self.app)
-                            if res:
-                                res(the_self, ret)
-
-                for cls in obj.__class__.__mro__[:-1]:
-                    if cls is BaseObj:
-                        break
-                    handle_cls(cls)
+            hs = bound.get(obj.__class__, None)
+            if hs == None:
+                hs = bind(obj.__class__)
+
+            for the_self, f, res in hs:
+                if timing != None:
+                    begin = timeit.default_timer()
+
+                ret = f(path, obj, app)
+                if res:
+                    res(ret)
+
+                if timing != None:
+                    timing[the_self] = timing.get(the_self, 0) + timeit.default_timer() - begin
+
+
+class Stage(object):
+    """ a named stage of Pipeline
+    """
+
+    def __init__(self, name, route, requires, leaves, check=None):
+        self.name = name
+        self.route = route
+        self.requires = requires
+        self.leaves = leaves
+        self.check = check
+
+
+class Pipeline(object):
+    """ a series of scanning stages over the same tree.
+
+    Stages are dispatched per node in the order they are added. A stage could
+    declare other stages it 'requires', which should be finished on the whole
+    tree before it starts. Consecutive stages without such dependencies between
+    each other are fused into one traversal. A stage could also provide a 'check',
+    called once its traversal is finished, to stop the pipeline by raising.
+
+    When a NodeIndex is provided, it's rebuilt by the first traversal going
+    through the whole tree, and later traversals only visit indexed objects
+    of classes handled by their stages.
+    """
+
+    def __init__(self, scanner, index=None):
+        self.__scanner = scanner
+        self.__stages = []
+        self.__index = index
+
+        # time spent in handlers of each stage, in seconds
+        self.timing = collections.OrderedDict()
+
+        # list of (names of fused stages, time spent in that traversal)
+        self.passes = []
+
+    def add(self, name, route, requires=None, leaves=None, check=None):
+        """ append a stage
+
+        :param str name: name of this stage
+        :param list route: list of scanners, as 'route' in Scanner.scan
+        :param list requires: names of stages should be finished before this one
+        :param list leaves: classes this stage doesn't need to go through their children
+        :param check: callable without arguments, called after the traversal of this stage,
+         later traversals are skipped when it raises.
+        :return: self for chaining
+        """
+        names = set(s.name for s in self.__stages)
+        if name in names:
+            raise ValueError('duplicated stage: {0}'.format(name))
+
+        requires = set(requires or [])
+        if not requires <= names:
+            raise ValueError('stage {0} requires unknown stages: {1}'.format(name, sorted(requires - names)))
+
+        self.__stages.append(Stage(name, route, requires, set(leaves or []), check))
+        return self
+
+    @property
+    def groups(self):
+        """ stages grouped by traversals
+
+        :type: list of list of Stage
+        """
+        groups, cur = [], []
+        for s in self.__stages:
+            if s.requires & set(c.name for c in cur):
+                groups.append(cur)
+                cur = []
+            cur.append(s)
+
+        if cur:
+            groups.append(cur)
+        return groups
+
+    def run(self, root):
+        """ run all stages
+
+        :param root: the root object to scan
+        """
+        indexed = False
+        for group in self.groups:
+            # a class is a leaf only when all fused stages agree
+            leaves = set.intersection(*[s.leaves for s in group])
+            route = [r for s in group for r in s.route]
+
+            if self.__index == None or leaves:
+                nexter = fused_tree_traversal
+            elif not indexed:
+                self.__index.clear()
+                nexter = self.__index.recorder(fused_tree_traversal)
+                indexed = True
+            else:
+                nexter = self.__index.traversal(
+                    [c for c in self.__index.classes if self.__scanner.handles(route, c)])
+
+            timing = {}
+            begin = timeit.default_timer()
+            self.__scanner.scan(
+                route=route,
+                root=root,
+                nexter=nexter,
+                leaves=leaves,
+                timing=timing
+            )
+            self.__finish(group, timing, timeit.default_timer() - begin)
+
+    def run_subtrees(self, subtrees):
+        """ run all stages over some subtrees of a tree, a stage is finished
+        on all of them before stages requiring it start. The index is not involved.
+
+        :param list subtrees: list of (JSON pointer, object, shallow), only
+         the object itself is visited when shallow.
+        """
+        for group in self.groups:
+            leaves = set.intersection(*[s.leaves for s in group])
+            route = [r for s in group for r in s.route]
+
+            timing = {}
+            begin = timeit.default_timer()
+            for base, root, shallow in subtrees:
+                self.__scanner.scan(
+                    route=route,
+                    root=root,
+                    nexter=based_traversal(shallow_traversal if shallow else fused_tree_traversal, base),
+                    leaves=leaves,
+                    timing=timing
+                )
+            self.__finish(group, timing, timeit.default_timer() - begin)
+
+    def __finish(self, group, timing, elapsed):
+        """ record timing of a finished traversal, and run checks of its stages
+        """
+        self.passes.append((tuple(s.name for s in group), elapsed))
+
+        for s in group:
+            self.timing[s.name] = sum(timing.get(r, 0) for r in s.route)
+
+        for s in group:
+            if s.check:
+                s.check()
 
@@ -1,2 +1,2 @@
 from .type_reducer import TypeReduce
-from .cycle_detector import CycleDetector
+from .cycle_detector import CycleDetector, CycleDetection
@@ -1,5 +1,5 @@
 from __future__ import absolute_import
-from ..utils import walk
+from ..utils import find_cycles
 from ..scan import Dispatcher
 from ..spec.v2_0.objects import (
     Schema,
@@ -14,6 +14,7 @@ from ..spec.v2_0.parser import (
     PathItemContext,
     )
 import functools
+import threading
 import six
 
 def _out(app, parser, path):
@@ -24,21 +25,22 @@ def _out(app, parser, path):
 def _schema_out_obj(obj, out=None):
     out = [] if out == None else out
 
-    for o in six.itervalues(obj.properties):
-        out = _schema_out_obj(o, out)
+    stk = [obj]
+    while len(stk):
+        o = stk.pop()
 
-    for o in obj.allOf:
-        out = _schema_out_obj(o, out)
+        r = getattr(o, '$ref')
+        if r:
+            out.append(r)
 
-    if isinstance(obj.additionalProperties, Schema):
-        out = _schema_out_obj(obj.additionalProperties, out)
+        if o.items:
+            stk.append(o.items)
 
-    if obj.items:
-        out = _schema_out_obj(obj.items, out)
+        if isinstance(o.additionalProperties, Schema):
+            stk.append(o.additionalProperties)
 
-    r = getattr(obj, '$ref')
-    if r:
-        out.append(r)
+        stk.extend(o._peek_('allOf'))
+        stk.extend(six.itervalues(o._peek_('properties')))
 
     return out
 
@@ -47,48 +49,93 @@ def _schema_out(app, path):
     return [] if obj == None else _schema_out_obj(obj)
 
 
+class CycleDetection:
+    """ Enum of when to detect cycles after preparing App, cycles
+    are always detected right away in strict mode.
+    """
+
+    # detect when preparing
+    eager_ = 1
+
+    # detect when cycles are accessed
+    lazy_ = 2
+
+    # detect in a background thread
+    background_ = 3
+
+
 class CycleDetector(object):
-    """ circular detector """
+    """ circular detector, vertices are collected when scanning, and
+    cycles are detected in the whole reference graph at once.
+    """
 
     class Disp(Dispatcher): pass
 
     def __init__(self):
-        self.cycles = {
+        self.__starts = {
             'schema':[],
             'parameter':[],
             'response':[],
             'path_item':[]
         }
+        self.__app = None
+        self.__cycles = None
+        self.__lock = threading.Lock()
+
+    @property
+    def cycles(self):
+        """ cycles found, a map from kind of objects to list of cycles,
+        detected on the first access.
+
+        :type: dict of str to list of lists
+        """
+        with self.__lock:
+            if self.__cycles == None:
+                self.__cycles = self.__detect()
+            return self.__cycles
+
+    def __detect(self):
+        app, ret = self.__app, {}
+        for k, ofn in [
+            ('schema', functools.partial(_schema_out, app)),
+            ('parameter', functools.partial(_out, app, ParameterContext)),
+            ('response', functools.partial(_out, app, ResponseContext)),
+            ('path_item', functools.partial(_out, app, PathItemContext)),
+        ]:
+            ret[k] = find_cycles(self.__starts[k], ofn) if self.__starts[k] else []
+
+        # nothing to be referenced once detected
+        self.__app = None
+        return ret
+
+    def detect_in_background(self):
+        """ detect cycles in a daemon thread, accessing 'cycles' would wait for it.
+
+        :return: the thread
+        :rtype: threading.Thread
+        """
+        t = threading.Thread(target=lambda: self.cycles)
+        t.daemon = True
+        t.start()
+        return t
+
+    def __add(self, kind, path, app):
+        self.__app = app
+        self.__starts[kind].append(path)
 
     @Disp.register([Schema])
     def _schema(self, path, _, app):
-        self.cycles['schema'] = walk(
-            path,
-            functools.partial(_schema_out, app),
-            self.cycles['schema']
-        )
+        self.__add('schema', path, app)
 
     @Disp.register([Parameter])
     def _parameter(self, path, _, app):
-         self.cycles['parameter'] = walk(
-            path,
-            functools.partial(_out, app, ParameterContext),
-            self.cycles['parameter']
-        )
+        self.__add('parameter', path, app)
 
     @Disp.register([Response])
     def _response(self, path, _, app):
-        self.cycles['response'] = walk(
-            path,
-            functools.partial(_out, app, ResponseContext),
-            self.cycles['response']
-        )
+        self.__add('response', path, app)
 
     @Disp.register([PathItem])
     def _path_item(self, path, _, app):
-        self.cycles['path_item'] = walk(
-            path,
-            functools.partial(_out, app, PathItemContext),
-            self.cycles['path_item']
-        )
+        self.__add('path_item', path, app)
 
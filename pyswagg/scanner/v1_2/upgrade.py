@@ -282,7 +282,7 @@ class Upgrade(object):
 
             new_ref = objects.Schema(NullContext())
             new_ref.update_field('$ref', '#/definitions/' + s)
-            sub_o.allOf.append(new_ref)
+            sub_o.mutable_field('allOf').append(new_ref)
 
     @property
     def swagger(self):
@@ -20,9 +20,9 @@ def _compose(obj, guard=None):
 
     if obj.items != None:
         _compose(obj.items, guard)
-    for v in six.itervalues(obj.properties):
+    for v in six.itervalues(obj._peek_('properties')):
         _compose(v, guard)
-    for v in (obj.allOf or []):
+    for v in (obj._peek_('allOf') or []):
         _compose(v, guard)
 
     final = Schema(NullContext())
@@ -31,7 +31,7 @@ def _compose(obj, guard=None):
     # those 'allOf' are visited by the last CycleGuard,
     # we need use a new one
     guard = CycleGuard()
-    stk = list(obj.allOf)
+    stk = list(obj._peek_('allOf'))
     while len(stk) > 0:
         try:
             o = deref(stk.pop(), guard=guard)
@@ -39,11 +39,11 @@ def _compose(obj, guard=None):
             continue
         o = o.final if o.final else o
         final.merge(o, SchemaContext, exclude=['$ref', 'allOf'])
-        for n, p in six.iteritems(o.properties):
-            if n in obj.properties:
+        for n, p in six.iteritems(o._peek_('properties')):
+            if n in obj._peek_('properties'):
                 continue
-            final.properties[n] = p
-        stk.extend(o.allOf or [])
+            final.mutable_field('properties')[n] = p
+        stk.extend(o._peek_('allOf') or [])
     obj.update_field('final', final)
 
 
@@ -55,6 +55,10 @@ class Merge(object):
         obj.update_field('final', _merge(obj, app, Response, ResponseContext))
 
     @Disp.register([PathItem])
-    def _path_item(self, _, obj, app):
+    def _path_item(self, path, obj, app):
         obj.merge(_merge(obj, app, PathItem, PathItemContext), PathItemContext)
 
+        # Operation(s) from referenced PathItem are attached
+        if getattr(obj, '$ref') and obj is app.index.get(path):
+            app.index.update(path, obj)
+
@@ -2,7 +2,7 @@ from __future__ import absolute_import
 from ...scan import Dispatcher
 from ...spec.v2_0.objects import PathItem, Operation, Schema, Swagger
 from ...spec.v2_0.parser import PathItemContext
-from ...utils import jp_split, scope_split, final
+from ...utils import jp_split, jp_compose, scope_split, final
 import six
 import copy
 
@@ -22,13 +22,15 @@ class PatchObject(object):
         """
         if isinstance(app.root, Swagger):
             # produces/consumes
-            obj.update_field('produces', app.root.produces if len(obj.produces) == 0 else obj.produces)
-            obj.update_field('consumes', app.root.consumes if len(obj.consumes) == 0 else obj.consumes)
+            for k in ('produces', 'consumes'):
+                v = obj._peek_(k)
+                obj.update_field(k, app.root._peek_(k) if len(v) == 0 else v)
 
         # combine parameters from PathItem
         if obj._parent_:
-            if obj.parameters:
-                for p in obj._parent_.parameters:
+            n = len(obj._peek_('parameters') or [])
+            if obj._peek_('parameters'):
+                for p in obj._parent_._peek_('parameters'):
                     p_final = final(p)
                     for pp in obj.parameters:
                         if p_final.name == final(pp).name:
@@ -36,10 +38,16 @@ class PatchObject(object):
                     else:
                         obj.parameters.append(p)
             else:
-                obj.update_field('parameters', copy.copy(obj._parent_.parameters))
+                obj.update_field('parameters', copy.copy(obj._parent_._peek_('parameters')))
+
+            # index those inherited Parameter(s)
+            if obj is app.index.get(path):
+                for i, p in enumerate(obj.parameters[n:], n):
+                    app.index.update(jp_compose(str(i), base=path + '/parameters'), p)
 
         # schemes
-        obj.update_field('cached_schemes', app.schemes if len(obj.schemes) == 0 else obj.schemes)
+        schemes = obj._peek_('schemes')
+        obj.update_field('cached_schemes', app.schemes if len(schemes) == 0 else schemes)
 
         # primitive factory
         setattr(obj, '_prim_factory', app.prim_factory)
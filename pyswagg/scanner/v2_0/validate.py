@@ -24,8 +24,9 @@ class Validate(object):
     def _validate_schema(self, path, obj, _):
         errs = []
 
-        for v in obj.required:
-            if v in obj.properties and obj.properties[v].readOnly:
+        props = obj._peek_('properties')
+        for v in obj._peek_('required'):
+            if v in props and props[v].readOnly:
                 errs.append('ReadOnly property in required list: {0}'.format(v))
             # TODO: validator runs before Resolver, so we can't go through all 'allOf'
             #       Schema objects to look for the 'required' property, it's a limitation now.
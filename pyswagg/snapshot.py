@@ -0,0 +1,117 @@
+from __future__ import absolute_import
+from .utils import replace_file
+import six
+import os
+import pickle
+import hashlib
+import tempfile
+import weakref
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+# bump this when the layout of snapshot changed
+SNAPSHOT_FORMAT = 3
+
+
+def _reduce_proxy(p):
+    """ pickle a weakref.proxy as a new proxy to the same referent,
+    the referent is reached via any bound method of it.
+    """
+    return weakref.proxy, (p.__reduce_ex__.__self__,)
+
+
+class _Pickler(pickle.Pickler):
+    """ pickler for prepared object graph, which contains
+    - weakref.proxy to objects in the same graph, ex. Schema.ref_obj
+    - objects provided by App, ex. Primitive, MimeCodec, they are not
+      part of snapshot and would be replaced by those of the restoring App.
+    """
+
+    dispatch_table = six.moves.copyreg.dispatch_table.copy()
+    dispatch_table[weakref.ProxyType] = _reduce_proxy
+    dispatch_table[weakref.CallableProxyType] = _reduce_proxy
+
+    def __init__(self, f, external):
+        pickle.Pickler.__init__(self, f, pickle.HIGHEST_PROTOCOL)
+        self.__external = dict((id(v), k) for k, v in six.iteritems(external))
+
+    def persistent_id(self, obj):
+        return self.__external.get(id(obj), None)
+
+
+class _Unpickler(pickle.Unpickler):
+    """ unpickler for snapshot dumped by _Pickler
+    """
+
+    def __init__(self, f, external):
+        pickle.Unpickler.__init__(self, f)
+        self.__external = external
+
+    def persistent_load(self, pid):
+        return self.__external[pid]
+
+
+def snapshot_path(cache_dir, url, subset=None):
+    """ location of the snapshot for an url, snapshots of different subsets
+    of the same document are kept separately.
+
+    :param str cache_dir: folder to keep snapshots
+    :param str url: url of the root document
+    :param pyswagg.subset.Subset subset: the subset used to load that document
+    :rtype: str
+    """
+    key = url if subset == None else '{0}#{1!r}'.format(url, subset.key)
+    return os.path.join(cache_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.snapshot')
+
+
+def write_snapshot(path, header, state, external):
+    """ write a snapshot, the header is pickled separately, so it could be
+    checked without restoring the whole object graph.
+
+    :param str path: where to write
+    :param dict header: things used to check if this snapshot is still valid
+    :param dict state: the object graph
+    :param dict external: objects not to be included, a map from name to object
+    """
+    folder = os.path.dirname(path)
+    if not os.path.isdir(folder):
+        os.makedirs(folder)
+
+    # write to a temporary file then rename, readers in other processes
+    # would never see a partial snapshot.
+    fd, tmp = tempfile.mkstemp(dir=folder, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(header, f, pickle.HIGHEST_PROTOCOL)
+            _Pickler(f, external).dump(state)
+        replace_file(tmp, path)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def read_snapshot(path, check, external):
+    """ read a snapshot
+
+    :param str path: where to read
+    :param func check: accept header and return True when this snapshot is valid
+    :param dict external: objects not included in snapshot, a map from name to object
+    :return: the object graph, None when missing or invalid.
+    :rtype: dict
+    """
+    if not os.path.isfile(path):
+        return None
+
+    try:
+        with open(path, 'rb') as f:
+            if not check(pickle.load(f)):
+                logger.info('snapshot is out of date: [{0}]'.format(path))
+                return None
+            return _Unpickler(f, external).load()
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, KeyError) as e:
+        logger.warning('unable to read snapshot [{0}]: {1}'.format(path, e))
+        return None
@@ -4,7 +4,9 @@ import six
 import copy
 import functools
 import weakref
+import operator
 import itertools
+import threading
 
 
 class ContainerType:
@@ -20,8 +22,9 @@ class ContainerType:
     # dict of list container, like: {'xx': [], 'xx': [], ...}
     dict_of_list_ = 3
 
-def container_apply(ct, v, f, fd=None, fdl=None):
+def container_apply(ct, v, f, fd=None, fdl=None, consume=False):
     """
+    :param bool consume: drop items from the container once applied
     """
     ret = None
     if v == None:
@@ -31,15 +34,19 @@ def container_apply(ct, v, f, fd=None, fdl=None):
         ret = f(ct, v)
     elif ct == ContainerType.list_:
         ret = []
-        for vv in v:
+        for i, vv in enumerate(v):
             ret.append(f(ct, vv))
+            if consume:
+                v[i] = None
     elif ct == ContainerType.dict_:
         ret = {}
-        for k, vv in six.iteritems(v):
+        for k in list(v.keys()) if consume else v:
+            vv = v.pop(k) if consume else v[k]
             ret[k] = fd(ct, vv, k) if fd else f(ct, vv)
     elif ct == ContainerType.dict_of_list_:
         ret = {}
-        for k, vv in six.iteritems(v):
+        for k in list(v.keys()) if consume else v:
+            vv = v.pop(k) if consume else v[k]
             if fdl:
                 fdl(ct, vv, k)
             ret[k] = []
@@ -65,6 +72,16 @@ class Context(object):
     # this parsing context.
     __swagger_ref_obj__ = None
 
+    # when True, children in the json object are dropped once parsed,
+    # they would be released before the whole tree is parsed.
+    # it's propagated to child contexts.
+    _consume = False
+
+    # names of children in dict containers kept as placeholders holding
+    # their json objects, they are parsed on their first access.
+    # It's not propagated.
+    _lazy = ()
+
     def __init__(self, parent_obj, backref):
         """
         constructor
@@ -115,6 +132,21 @@ class Context(object):
         else:
             self._parent_obj[self._backref] = obj
 
+    @classmethod
+    def compile(kls):
+        """ compile this context into a plan used by the builder,
+        it's compiled on the first use, and again when __swagger_child__
+        is replaced.
+
+        :return: the plan
+        :rtype: _Plan
+        """
+        plan = kls.__dict__.get('_plan_', None)
+        if plan == None or plan.decl is not kls.__swagger_child__:
+            plan = _Plan(kls)
+            setattr(kls, '_plan_', plan)
+        return plan
+
     def parse(self, obj=None):
         """ major part do parsing.
 
@@ -127,54 +159,401 @@ class Context(object):
         if not isinstance(obj, dict):
             raise ValueError('invalid obj passed: ' + str(type(obj)))
 
-        def _apply(x, kk, ct, v):
-            if key not in self._obj:
-                self._obj[kk] = {} if ct == None else []
-            with x(self._obj, kk) as ctx:
-                ctx.parse(obj=v)
+        if self._obj != None:
+            _build(self.__class__, obj, self._obj, self._consume, self._lazy)
+        else:
+            self._obj = obj
+
+    def parse_items(self, items, accept=None):
+        """ parsing from items of a json object streamed in, refer to _build_items.
 
-        def _apply_dict(x, kk, ct, v, k):
-            if k not in self._obj[kk]:
-                self._obj[kk][k] = {} if ct == ContainerType.dict_ else []
-            with x(self._obj[kk], k) as ctx:
-                ctx.parse(obj=v)
+        :param items: iterable of (key, name, json), refer to pyswagg.getter.Getter.stream
+        :param accept: a callable checking top-level values streamed so far
+        :return: the json object when it's not accepted, otherwise None
+        """
+        return _build_items(self.__class__, items, self._obj, self._lazy, accept)
 
-        def _apply_dict_before_list(kk, ct, v, k):
-            self._obj[kk][k] = []
 
-        if hasattr(self, '__swagger_child__'):
-            # to nested objects
-            for key, (ct, ctx_kls) in six.iteritems(self.__swagger_child__):
+def _defined_by(kls, name):
+    """ the class in MRO providing an attribute """
+    for k in kls.__mro__:
+        if name in k.__dict__:
+            return k
+
+
+class _Plan(object):
+    """ a Context subclass compiled for the builder, its children are
+    flattened and how its object is produced is decided once.
+    """
+
+    # objects are created and linked to children by the builder
+    fast_ = 1
+
+    # objects are created by Context.produce
+    produce_ = 2
+
+    # parsing is customized, the builder would call Context.parse
+    opaque_ = 3
+
+    __slots__ = ('decl', 'children', 'mode', 'ref')
+
+    def __init__(self, kls):
+        self.decl = kls.__swagger_child__
+        self.children = tuple((k, ct, c) for k, (ct, c) in six.iteritems(self.decl))
+        self.ref = getattr(kls, '__swagger_ref_object__', None)
+
+        if any(_defined_by(kls, n) is not Context for n in ('__init__', '__enter__', '__exit__', 'parse')):
+            self.mode = _Plan.opaque_
+        elif (_defined_by(kls, 'produce') is not Context or
+              _defined_by(kls, 'is_produced') is not Context or
+              not (isinstance(self.ref, type) and issubclass(self.ref, BaseObj)) or
+              _defined_by(self.ref, '__init__') is not BaseObj):
+            self.mode = _Plan.produce_
+        else:
+            self.mode = _Plan.fast_
+
+
+def _build(kls, obj, placeholder, consume=False, lazy=()):
+    """ fill the object placeholder of a context from a json object,
+    it's the same as parsing recursively with child contexts, but
+    children are built in post-order with a stack.
+
+    :param kls: the Context subclass
+    :param dict obj: json object to be parsed
+    :param dict placeholder: object placeholder of that context
+    :param bool consume: drop children from json object once parsed
+    :param lazy: names of children of that context built into placeholders, refer to _lazy_obj_
+    :return: the object placeholder
+    """
+    # an item in the stack is either
+    # - a tuple of (context, json, container, key, siblings) to be entered
+    # - a list of [context, plan, json, placeholder, children, container, key, siblings]
+    #   to be produced once its children are done
+    stk = [[kls, kls.compile(), obj, placeholder, [], None, None, None]]
+    enter = True
+    while stk:
+        if enter:
+            _, plan, obj, d, kids, _, _, _ = stk[-1]
+
+            # only children of the root are built lazily
+            root = len(stk) == 1
+            for key, ct, ctx_kls in plan.children:
+                lz = root and key in lazy and ctx_kls.compile().mode == _Plan.fast_
                 items = obj.get(key, None)
 
                 # create an empty child, even it's None in input.
                 # this makes other logic easier.
                 if ct == ContainerType.list_:
-                    self._obj[key] = []
+                    d[key] = []
                 elif ct:
-                    self._obj[key] = {}
+                    d[key] = {}
 
                 if items == None:
                     continue
+                if consume:
+                    del obj[key]
+
+                if ct == None:
+                    d[key] = None
+                    stk.append((ctx_kls, items, d, key, kids))
+                elif ct == ContainerType.list_:
+                    c = d[key] = [None] * len(items)
+                    for i, v in enumerate(items):
+                        stk.append((ctx_kls, v, c, i, kids))
+                        if consume:
+                            items[i] = None
+                else:
+                    c = d[key]
+                    for k in list(items.keys()) if consume else items:
+                        v = items.pop(k) if consume else items[k]
+                        if ct == ContainerType.dict_:
+                            c[k] = None
+                            if lz and isinstance(v, dict):
+                                c[k] = _lazy_obj_(ctx_kls, v, consume)
+                                kids.append(c[k])
+                            else:
+                                stk.append((ctx_kls, v, c, k, kids))
+                        else:
+                            l = c[k] = [None] * len(v)
+                            for i, vv in enumerate(v):
+                                stk.append((ctx_kls, vv, l, i, kids))
+            enter = False
+
+        t = stk.pop()
+        if isinstance(t, tuple):
+            ctx_kls, obj, c, k, kids = t
+            plan = ctx_kls.compile()
+            if plan.mode != _Plan.opaque_ and obj != None:
+                if not isinstance(obj, dict):
+                    raise ValueError('invalid obj passed: ' + str(type(obj)))
+
+                stk.append([ctx_kls, plan, obj, {}, [], c, k, kids])
+                enter = True
+                continue
 
-                container_apply(ct, items,
-                    functools.partial(_apply, ctx_kls, key),
-                    functools.partial(_apply_dict, ctx_kls, key),
-                    functools.partial(_apply_dict_before_list, key)
-                )
+            tmp = {'t': {}}
+            with ctx_kls(tmp, 't') as ctx:
+                ctx._consume = consume
+                ctx.parse(obj=obj)
+            o = tmp['t']
+        else:
+            ctx_kls, plan, obj, d, children, c, k, kids = t
+
+            # update placeholder with obj
+            for key, v in six.iteritems(obj):
+                if key not in d:
+                    d[key] = v
+
+            if c == None:
+                # the root, produced by its context
+                return d
+
+            if plan.mode == _Plan.fast_:
+                o = plan.ref.__new__(plan.ref)
+                o._parent__ = None
+                o._init_fields(d)
+                for child in children:
+                    if isinstance(child, BaseObj):
+                        child._parent__ = o
+                c[k] = o
+                kids.append(o)
+                continue
 
-        # update _obj with obj
-        if self._obj != None:
-            for key in (set(obj.keys()) - set(self._obj.keys())):
-                self._obj[key] = obj[key]
+            ctx = ctx_kls(None, None)
+            ctx._obj = d
+            ctx._consume = consume
+            o = ctx.produce()
+
+        # objects not produced by the builder are checked, the same as
+        # BaseObj._assign_parent
+        if o != None and not ctx_kls.is_produced(o):
+            raise ValueError('Object is not instance of {0} but {1}'.format(ctx_kls.__swagger_ref_object__.__name__, o.__class__.__name__))
+
+        c[k] = o
+        kids.append(o)
+
+
+def _build_items(kls, items, placeholder, lazy=(), accept=None):
+    """ fill the object placeholder of a context from items of a json object
+    streamed in. Members of dict containers are built once they are streamed in,
+    their json objects are dropped at the same time, other children are built
+    at the end.
+
+    :param kls: the Context subclass
+    :param items: iterable of (key, name, json), 'name' is the key of a member in the
+     dict container of 'key', or None when 'json' is the whole value of 'key'
+    :param dict placeholder: object placeholder of that context
+    :param lazy: names of children of that context built into placeholders, refer to _lazy_obj_
+    :param accept: a callable checking top-level values streamed so far, members are
+     kept as json until it returns True, ex. the version of document is known.
+    :return: the json object when 'accept' never returns True, otherwise None
+    """
+    children = dict((key, c) for key, ct, c in kls.compile().children if ct == ContainerType.dict_)
+
+    rest, built, ok = {}, {}, accept == None
+    for key, name, v in items:
+        if name == None:
+            rest[key] = v
+            ok = ok or bool(accept(rest))
+        elif ok and key in children:
+            ctx_kls = children[key]
+            if key in lazy and ctx_kls.compile().mode == _Plan.fast_ and isinstance(v, dict):
+                o = _lazy_obj_(ctx_kls, v, True)
+            else:
+                tmp = {'t': {}}
+                with ctx_kls(tmp, 't') as ctx:
+                    ctx._consume = True
+                    ctx.parse(obj=v)
+                o = tmp['t']
+
+            if o != None and not ctx_kls.is_produced(o):
+                raise ValueError('Object is not instance of {0} but {1}'.format(ctx_kls.__swagger_ref_object__.__name__, o.__class__.__name__))
+            built.setdefault(key, {})[name] = o
         else:
-            self._obj = obj
+            rest.setdefault(key, {})[name] = v
+
+    if not ok:
+        return rest
+
+    _build(kls, rest, placeholder, True, lazy)
+    for key, c in six.iteritems(built):
+        placeholder[key].update(c)
+    return None
+
+
+# placeholders are materialized one at a time
+_lazy_lock_ = threading.RLock()
+
+
+def _lazy_class_(ref):
+    """ the class of placeholders for a subclass of BaseObj, it shares
+    the same layout, and becomes that class once materialized.
+    """
+    kls = ref.__dict__.get('_lazy_kls_', None)
+    if kls == None:
+        def __getattribute__(self, name):
+            _materialize_(self)
+            return object.__getattribute__(self, name)
+
+        kls = type(ref)('Lazy' + ref.__name__, (ref,), {
+            '__getattribute__': __getattribute__,
+            '__module__': ref.__module__,
+        })
+        setattr(ref, '_lazy_kls_', kls)
+    return kls
+
+
+def _lazy_obj_(ctx_kls, obj, consume=False):
+    """ a placeholder of the object produced by a parsing context, the json
+    object is kept and parsed when any attribute of the placeholder is accessed,
+    ex. fields, dump, compare or being traversed by scanners. It's an instance
+    of that object's class all the time.
+
+    :param ctx_kls: the Context subclass, compiled as _Plan.fast_
+    :param dict obj: json object to be parsed
+    :param bool consume: drop children from json object once parsed
+    """
+    ref = ctx_kls.compile().ref
+    o = ref.__new__(_lazy_class_(ref))
+    o._parent__ = None
+    object.__getattribute__(o, '__dict__')['_lazy_'] = (ctx_kls, obj, consume)
+    return o
+
+
+def _materialize_(o):
+    """ parse the json object kept by a placeholder, and turn it into
+    the object it stands for.
+    """
+    d = object.__getattribute__(o, '__dict__')
+    if '_lazy_' not in d:
+        return
+
+    with _lazy_lock_:
+        if '_lazy_' not in d:
+            return
+
+        ctx_kls, obj, consume = d['_lazy_']
+        plan = ctx_kls.compile()
+        fields = _build(ctx_kls, obj, {}, consume)
+
+        # fields are ready before it's seen as materialized by other threads
+        plan.ref._init_fields(o, fields)
+        for key, ct, _ in plan.children:
+            container_apply(ct, fields.get(key, None), functools.partial(_adopt_, o))
+        del d['_lazy_']
+        o.__class__ = plan.ref
+
+
+def _adopt_(parent, _, obj):
+    if isinstance(obj, BaseObj):
+        obj._parent__ = parent
+
+
+class _SharedList(list):
+    """ the empty list shared by all fields defaulted to [], it's read-only,
+    and replaced by a private copy once the field is accessed as an attribute.
+    """
+
+    __slots__ = ()
+
+    def _readonly_(self, *args, **kwargs):
+        raise TypeError('shared default value is read-only, call BaseObj.mutable_field to get a private copy')
+
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly_
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly_
+
+    def __copy__(self):
+        return []
+
+    def __deepcopy__(self, memo):
+        return []
+
+    def __reduce__(self):
+        return '_EMPTY_LIST'
+
+
+class _SharedDict(dict):
+    """ the empty dict shared by all fields defaulted to {}, it's read-only,
+    and replaced by a private copy once the field is accessed as an attribute.
+    """
+
+    __slots__ = ()
+
+    def _readonly_(self, *args, **kwargs):
+        raise TypeError('shared default value is read-only, call BaseObj.mutable_field to get a private copy')
+
+    update = setdefault = pop = popitem = clear = _readonly_
+    __setitem__ = __delitem__ = __ior__ = _readonly_
+
+    def __copy__(self):
+        return {}
+
+    def __deepcopy__(self, memo):
+        return {}
+
+    def __reduce__(self):
+        return '_EMPTY_DICT'
+
+
+_EMPTY_LIST = _SharedList()
+_EMPTY_DICT = _SharedDict()
+
+# shared defaults are compared as what they are declared
+_SHARED_TYPES = {_SharedList: list, _SharedDict: dict}
+
+
+def _shared_default_(default):
+    """ the value shared by all objects for a default value,
+    and if it should be copied for each object.
+
+    :return: a tuple of (value, need copy)
+    """
+    if isinstance(default, list) and len(default) == 0:
+        return _EMPTY_LIST, False
+    if isinstance(default, dict) and len(default) == 0:
+        return _EMPTY_DICT, False
+    return default, isinstance(default, (list, dict, set))
+
+
+def _copy_on_read_(slot):
+    """ getter of a field defaulted to a shared value, a private copy is made
+    on the first access, so it could be changed in place like other values.
+    """
+    get = operator.attrgetter(slot)
+
+    def _get(self):
+        v = get(self)
+        if v.__class__ in _SHARED_TYPES:
+            v = _SHARED_TYPES[v.__class__]()
+            setattr(self, slot, v)
+        return v
+    return _get
 
 
 class BaseObj(object):
     """ Base implementation of all referencial objects,
     """
 
+    # fields are kept in slots generated by FieldMeta, '__dict__' is
+    # only allocated when something else is attached, ex. '_prim_factory'
+    # of Operation.
+    # keys set from Swagger API document are recorded in a bitmask of
+    # fields, other keys are kept in a set allocated when needed.
+    __slots__ = ('_parent__', '__set_mask', '__set_keys', '__weakref__', '__dict__')
+
+    # a map from name of field to its slot, generated by FieldMeta
+    __private_names__ = {}
+
+    # a map from name of field to its bit in the mask, generated by FieldMeta
+    __field_bits__ = {}
+
+    # a list of (name, slot, default value, need copy) of swagger fields,
+    # generated by FieldMeta.
+    __field_defaults__ = ()
+
+    # slots of internal fields, generated by FieldMeta
+    __internal_slots__ = ()
+
     # fields that need re-named.
     __swagger_rename__ = {}
 
@@ -203,16 +582,31 @@ class BaseObj(object):
         if not issubclass(type(ctx), Context):
             raise TypeError('should provide args[0] as Context, not: ' + ctx.__class__.__name__)
 
-        self.__origin_keys = set([k for k in six.iterkeys(ctx._obj)])
+        self._init_fields(ctx._obj)
+        self._assign_parent(ctx)
 
-        # handle fields
-        for name, default in six.iteritems(self.__swagger_fields__):
-            setattr(self, self.get_private_name(name), ctx._obj.get(name, copy.copy(default)))
+    def _init_fields(self, obj):
+        """ fields initialization, internal usage only
 
-        for name, default in six.iteritems(self.__internal_fields__):
-            setattr(self, self.get_private_name(name), None)
+        :param dict obj: object placeholder of the parsing context
+        """
+        bits, mask, keys = self.__field_bits__, 0, None
+        for k in obj:
+            b = bits.get(k, 0)
+            if b:
+                mask |= b
+            else:
+                keys = keys or set()
+                keys.add(k)
+        self.__set_mask, self.__set_keys = mask, keys
 
-        self._assign_parent(ctx)
+        # handle fields, default values are shared unless they are
+        # mutable and not empty.
+        for name, slot, default, cp in self.__field_defaults__:
+            setattr(self, slot, obj[name] if name in obj else (copy.copy(default) if cp else default))
+
+        for slot in self.__internal_slots__:
+            setattr(self, slot, None)
 
     def _assign_parent(self, ctx):
         """ parent assignment, internal usage only
@@ -229,7 +623,7 @@ class BaseObj(object):
 
         # set self as childrent's parent
         for name, (ct, ctx) in six.iteritems(ctx.__swagger_child__):
-            obj = getattr(self, name)
+            obj = self._peek_(name)
             if obj == None:
                 continue
 
@@ -240,6 +634,10 @@ class BaseObj(object):
 
         :param str f: name of the private attribute to be accessed.
         """
+        n = self.__private_names__.get(f, None)
+        if n:
+            return n
+
         f = self.__swagger_rename__[f] if f in self.__swagger_rename__.keys() else f
         return '_' + self.__class__.__name__ + '__' + f
  
@@ -254,7 +652,36 @@ class BaseObj(object):
             raise AttributeError('{0} is not in {1}'.format(n, self.__class__.__name__))
 
         setattr(self, n, obj)
-        self.__origin_keys.add(f)
+
+        b = self.__field_bits__.get(f, 0)
+        if b:
+            self.__set_mask |= b
+        else:
+            self.__set_keys = self.__set_keys or set()
+            self.__set_keys.add(f)
+
+    def mutable_field(self, f):
+        """ get a field to be changed in place, empty default values are shared
+        among objects and read-only, a private copy would be made for them. It's
+        the same as accessing it as an attribute.
+
+        :param str f: name of field to be changed.
+        :return: value of that field
+        """
+        n = self.get_private_name(f)
+        v = getattr(self, n)
+        if v.__class__ in _SHARED_TYPES:
+            v = copy.copy(v)
+            setattr(self, n, v)
+        return v
+
+    def _peek_(self, f):
+        """ get a field without making a private copy of a shared default value,
+        for reading only.
+
+        :param str f: name of field
+        """
+        return getattr(self, self.__private_names__.get(f, f))
 
     def resolve(self, ts):
         """ resolve a list of tokens to an child object
@@ -265,9 +692,7 @@ class BaseObj(object):
             ts = [ts]
 
         obj = self
-        while len(ts) > 0:
-            t = ts.pop(0)
-
+        for t in ts:
             if issubclass(obj.__class__, BaseObj):
                 obj = getattr(obj, t)
             elif isinstance(obj, list):
@@ -294,7 +719,7 @@ class BaseObj(object):
             if name in exclude:
                 continue
 
-            v = getattr(other, name)
+            v = other._peek_(name)
             if v == default:
                 continue
 
@@ -305,19 +730,19 @@ class BaseObj(object):
                 # readonly.
                 if isinstance(v, list):
                     try:
-                        self.update_field(name, list(set((getattr(self, name) or []) + v)))
+                        self.update_field(name, list(set((self._peek_(name) or []) + v)))
                     except TypeError:
-                        self.update_field(name, list((getattr(self, name) or []) + v))
+                        self.update_field(name, list((self._peek_(name) or []) + v))
                 elif isinstance(v, dict):
                     d = copy.copy(v)
-                    d.update(getattr(self, name) or {})
+                    d.update(self._peek_(name) or {})
                     self.update_field(name, d)
-                elif getattr(self, name) == default:
+                elif self._peek_(name) == default:
                     self.update_field(name, v)
                 continue
             else:
                 # for child, stop when src object has something
-                if getattr(self, name) != default:
+                if self._peek_(name) != default:
                     continue
 
             ct, cctx = childs[0][1], childs[0][2]
@@ -340,7 +765,10 @@ class BaseObj(object):
         :return: True if the key is setted. False otherwise, it means we would get value
         from default from Field.
         """
-        return k in self.__origin_keys
+        b = self.__field_bits__.get(k, 0)
+        if b:
+            return (self.__set_mask & b) != 0
+        return self.__set_keys != None and k in self.__set_keys
 
     def compare(self, other, base=None):
         """ comparison, will return the first difference """
@@ -354,7 +782,7 @@ class BaseObj(object):
             if isinstance(s, six.string_types) and isinstance(o, six.string_types):
                 return s == o, name
 
-            if s.__class__ != o.__class__:
+            if _SHARED_TYPES.get(s.__class__, s.__class__) != _SHARED_TYPES.get(o.__class__, o.__class__):
                 return False, name
 
             if isinstance(s, BaseObj):
@@ -384,7 +812,7 @@ class BaseObj(object):
             return True, name
 
         for n in names:
-            same, n = cmp_func(jp_compose(n, base), getattr(self, n), getattr(other, n))
+            same, n = cmp_func(jp_compose(n, base), self._peek_(n), other._peek_(n))
             if not same:
                 return same, n
 
@@ -417,7 +845,7 @@ class BaseObj(object):
 
         for name, default in six.iteritems(self.__swagger_fields__):
             # only dump a field when its value is not equal to default value
-            v = getattr(self, name)
+            v = self._peek_(name)
             if v != default:
                 d = _dump_(v)
                 if d != None:
@@ -469,16 +897,46 @@ class BaseObj(object):
                     down(jp_compose(k, name), v)
 
         for n in names:
-            down(jp_compose(n), getattr(self, n))
+            down(jp_compose(n), self._peek_(n))
 
         return ret
 
 
-def _method_(name):
-    """ getter factory """
-    def _getter_(self):
-        return getattr(self, self.get_private_name(name))
-    return _getter_
+def _compile_init_fields_(bits, defaults, internal_slots):
+    """ generate BaseObj._init_fields specialized for fields of a class,
+    each slot is assigned by a statement instead of looping through a table.
+    """
+    ns = {'copy': copy}
+    src = [
+        'def _init_fields(self, obj, get_bit=bits.get):',
+        '    mask, keys = 0, None',
+        '    for k in obj:',
+        '        b = get_bit(k, 0)',
+        '        if b:',
+        '            mask |= b',
+        '        else:',
+        '            keys = keys or set()',
+        '            keys.add(k)',
+        '    self._BaseObj__set_mask, self._BaseObj__set_keys = mask, keys',
+        '    get = obj.get',
+    ]
+    for i, (name, slot, default, cp) in enumerate(defaults):
+        ns['d{0}'.format(i)] = default
+        if cp:
+            src.append('    self.{0} = obj[{1!r}] if {1!r} in obj else copy.copy(d{2})'.format(slot, name, i))
+        else:
+            src.append('    self.{0} = get({1!r}, d{2})'.format(slot, name, i))
+    for slot in internal_slots:
+        src.append('    self.{0} = None'.format(slot))
+
+    ns['bits'] = bits
+    six.exec_('\n'.join(src), ns)
+    return ns['_init_fields']
+
+
+def _slot_name_(name):
+    """ name of the slot keeping a field, fields like '$ref' are not identifiers """
+    return '_f_' + ''.join(c if c.isalnum() or c == '_' else '_x{0:x}_'.format(ord(c)) for c in name)
 
 
 class FieldMeta(type):
@@ -487,11 +945,30 @@ class FieldMeta(type):
     def __new__(metacls, name, bases, spc):
         """ scan through MRO to get a merged list of fields,
         and create those fields.
+
+        Each field is kept in a slot, shared by subclasses, and accessed
+        by a precomputed getter. Each field is also assigned a bit to record
+        if it's set.
         """
+        # slots provided by bases
+        inherited = set()
+        for b in bases:
+            for k in b.__mro__:
+                inherited.update(k.__dict__.get('__slots__', ()))
+
+        slots, private = [], {}
         def init_fields(fields, rename):
-            for name in six.iterkeys(fields):
-                name = rename[name] if name in rename.keys() else name
-                spc[name] = property(_method_(name))
+            for name, default in six.iteritems(fields):
+                new_name = rename[name] if name in rename.keys() else name
+                slot = _slot_name_(new_name)
+                if slot not in inherited and slot not in slots:
+                    slots.append(slot)
+
+                private[name] = private[new_name] = slot
+                if _shared_default_(default)[0].__class__ in _SHARED_TYPES:
+                    spc[new_name] = property(_copy_on_read_(slot))
+                else:
+                    spc[new_name] = property(operator.attrgetter(slot))
 
         def _default_(name, default):
             spc[name] = spc[name] if name in spc else default
@@ -522,6 +999,27 @@ class FieldMeta(type):
         if '__internal_fields__' in spc.keys():
             init_fields(spc['__internal_fields__'], {})
 
+        # bits are assigned in sorted order, masks in pickled objects
+        # should be the same across processes.
+        bits = {}
+        for i, n in enumerate(sorted(
+                set(spc.get('__swagger_fields__', {}).keys()) |
+                set(spc.get('__internal_fields__', {}).keys()))):
+            bits[n] = 1 << i
+        for n, new_n in six.iteritems(rename):
+            if n in bits:
+                bits[new_n] = bits[n]
+
+        defaults = []
+        for n, default in six.iteritems(spc.get('__swagger_fields__', {})):
+            defaults.append((n, private[n]) + _shared_default_(default))
+
+        spc['__slots__'] = tuple(slots)
+        spc['__private_names__'] = private
+        spc['__field_bits__'] = bits
+        spc['__field_defaults__'] = tuple(defaults)
+        spc['__internal_slots__'] = tuple(private[n] for n in spc.get('__internal_fields__', {}))
+        spc['_init_fields'] = _compile_init_fields_(bits, spc['__field_defaults__'], spc['__internal_slots__'])
         return type.__new__(metacls, name, bases, spc)
 
 
@@ -179,11 +179,13 @@ class ResourceListContext(Context):
 
         # replace each element in 'apis' with Resource
         self._obj['apis'] = {}
+        urls = list(urls)
+        # load all of them first, it might be done concurrently,
+        # depends on the resolver.
+        ress = resolver.resolve_all([url for url, _ in urls], getter)
         # get into resource object
-        for url, name in urls:
+        for (url, name), res in zip(urls, ress):
             # here we assume Resource is always a dict
             self._obj['apis'][name] = {}
-            res = resolver.resolve(url, getter)
             with ResourceContext(self._obj['apis'], name) as ctx:
                 ctx.parse(obj=res)
-
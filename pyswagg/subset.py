@@ -0,0 +1,181 @@
+from __future__ import absolute_import
+from .utils import jp_split, jr_split, normalize_jr
+from .spec.v2_0.parser import PathItemContext
+import six
+import fnmatch
+
+
+# keys of Operation(s) in a PathItem
+_METHODS = frozenset(k for k in PathItemContext.__swagger_child__ if k != 'parameters')
+
+# kinds of reusable objects in a Swagger 2.0 document, kept only when reachable
+_REUSABLE = ('definitions', 'parameters', 'responses')
+
+
+class Subset(object):
+    """ a slice of a Swagger 2.0 document, made of Operation(s) selected by
+    tags, path globs, HTTP methods or operationIds, plus parameters, responses and
+    definitions reachable from them through '$ref'. Everything else under those
+    sections is dropped before parsing.
+
+    An Operation is selected when it matches all criteria provided, and any value of
+    each criterion. A PathItem with '$ref' is kept as a whole when any Operation of the
+    PathItem it refers to is selected, or only checked by its path when it refers to another document.
+
+    Pass it to App.load or App.create:
+        App.create(url, subset=Subset(tags=['billing']))
+    """
+
+    def __init__(self, tags=None, paths=None, methods=None, operation_ids=None):
+        """
+        :param list tags: tags of Operation(s)
+        :param list paths: globs of paths, ex. '/billing/*', matched by fnmatch
+        :param list methods: HTTP methods, case insensitive
+        :param list operation_ids: operationId(s)
+        """
+        self.__tags = None if tags == None else frozenset(tags)
+        self.__paths = None if paths == None else tuple(paths)
+        self.__methods = None if methods == None else frozenset(m.lower() for m in methods)
+        self.__operation_ids = None if operation_ids == None else frozenset(operation_ids)
+
+    @property
+    def key(self):
+        """ criteria of this subset, comparable and hashable
+
+        :type: tuple
+        """
+        def _sorted(v):
+            return None if v == None else tuple(sorted(v))
+
+        return (_sorted(self.__tags), _sorted(self.__paths), _sorted(self.__methods), _sorted(self.__operation_ids))
+
+    def __eq__(self, other):
+        return isinstance(other, Subset) and self.key == other.key
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return 'Subset(tags={0}, paths={1}, methods={2}, operation_ids={3})'.format(*self.key)
+
+    def match_path(self, path):
+        """ check if a path is selected
+
+        :param str path: path of a PathItem, ex. '/pets/{id}'
+        :rtype: bool
+        """
+        return self.__paths == None or any(fnmatch.fnmatchcase(path, p) for p in self.__paths)
+
+    def match(self, path, method, op):
+        """ check if an Operation is selected
+
+        :param str path: path of the PathItem
+        :param str method: HTTP method of the Operation
+        :param dict op: json object of the Operation
+        :rtype: bool
+        """
+        if self.__methods != None and method.lower() not in self.__methods:
+            return False
+        if self.__operation_ids != None and op.get('operationId', None) not in self.__operation_ids:
+            return False
+        if self.__tags != None and self.__tags.isdisjoint(op.get('tags', None) or []):
+            return False
+        return self.match_path(path)
+
+    def __select(self, path, item):
+        """ the selected part of a PathItem, None when nothing is selected """
+        ret, found = {}, False
+        for k, v in six.iteritems(item):
+            if k not in _METHODS:
+                ret[k] = v
+            elif isinstance(v, dict) and self.match(path, k, v):
+                ret[k] = v
+                found = True
+
+        return ret if found else None
+
+    def apply(self, obj, url=None):
+        """ make the subset of a json object of Swagger 2.0 document, the
+        original one is not modified, and unchanged parts are shared.
+
+        :param dict obj: the json object
+        :param str url: url of that document, used to tell local '$ref' from others
+        :return: the subset
+        :rtype: dict
+        """
+        url = jr_split(url)[0] if url else url
+
+        def _local(r):
+            u, jp = jr_split(normalize_jr(r, url))
+            return jp if (not u or u == url) else None
+
+        def _resolve(jp):
+            o = obj
+            for t in jp_split(jp)[1:]:
+                o = o.get(t, None) if isinstance(o, dict) else None
+            return o
+
+        paths, todo = {}, []
+        for p, item in six.iteritems(obj.get('paths', None) or {}):
+            if not isinstance(item, dict):
+                continue
+
+            r = item.get('$ref', None)
+            if isinstance(r, six.string_types):
+                jp = _local(r)
+                target = _resolve(jp) if jp else None
+                if self.__select(p, target) if isinstance(target, dict) else self.match_path(p):
+                    paths[p] = item
+                    todo.append(item)
+                continue
+
+            selected = self.__select(p, item)
+            if selected:
+                paths[p] = selected
+                todo.append(selected)
+
+        # follow local '$ref' from selected Operation(s)
+        reached, done = dict((k, set()) for k in _REUSABLE), set()
+        while todo:
+            o = todo.pop()
+            if isinstance(o, list):
+                todo.extend(o)
+                continue
+            if not isinstance(o, dict):
+                continue
+
+            todo.extend(six.itervalues(o))
+            r = o.get('$ref', None)
+            jp = _local(r) if isinstance(r, six.string_types) else None
+            if not jp or jp in done:
+                continue
+            done.add(jp)
+
+            ts = jp_split(jp)[1:]
+            if len(ts) < 2:
+                continue
+            if ts[0] in reached:
+                if ts[1] not in reached[ts[0]]:
+                    reached[ts[0]].add(ts[1])
+                    todo.append((obj.get(ts[0], None) or {}).get(ts[1], None))
+            elif ts[0] == 'paths':
+                # a PathItem referred is kept as a whole
+                item = (obj.get('paths', None) or {}).get(ts[1], None)
+                if isinstance(item, dict) and paths.get(ts[1], None) is not item:
+                    paths[ts[1]] = item
+                    todo.append(item)
+            else:
+                # kept along with the rest of the document
+                todo.append(_resolve(jp))
+
+        ret = dict(obj)
+        if 'paths' in obj:
+            ret['paths'] = dict((k, paths[k]) for k in obj['paths'] if k in paths)
+        for kind, names in six.iteritems(reached):
+            if isinstance(obj.get(kind, None), dict):
+                ret[kind] = dict((k, v) for k, v in six.iteritems(obj[kind]) if k in names)
+
+        return ret
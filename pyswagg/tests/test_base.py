@@ -3,6 +3,8 @@ from pyswagg.spec import base
 import unittest
 import six
 import copy
+import pickle
+import weakref
 
 
 class GrandChildObj(six.with_metaclass(base.FieldMeta, base.BaseObj)):
@@ -96,7 +98,33 @@ class SwaggerBaseTestCase(unittest.TestCase):
         """
         o1 = TObj(base.NullContext())
         o2 = TObj(base.NullContext())
-        self.assertTrue(id(o1.a) != id(o2.a))
+
+        # empty defaults are shared until accessed
+        shared = o2._peek_('a')
+        self.assertTrue(o1._peek_('a') is shared)
+        self.assertRaises(TypeError, shared.append, 1)
+        self.assertEqual(copy.copy(shared).__class__, list)
+        self.assertTrue(pickle.loads(pickle.dumps(shared, pickle.HIGHEST_PROTOCOL)) is shared)
+
+        # compared and dumped as those declared, without making copies
+        self.assertEqual(o2.compare(TObj(base.NullContext())), (True, ''))
+        self.assertEqual(o2.dump(), None)
+        self.assertTrue(o2._peek_('a') is shared)
+
+        # a private copy is made on access, and could be changed in place
+        o1.a.append(1)
+        o1.b['k'] = 1
+        self.assertEqual((o1.a, o1.b), ([1], {'k': 1}))
+        self.assertEqual((o2.a, o2.b), ([], {}))
+        self.assertTrue(o2.a is o2.a)
+        self.assertFalse(o2.a is shared)
+        self.assertEqual(o2.a.__class__, list)
+        self.assertFalse(o1.is_set('a'))
+
+        # the same as those made by mutable_field
+        o1.mutable_field('a').append(2)
+        self.assertTrue(o1.mutable_field('a') is o1.a)
+        self.assertEqual(o1.a, [1, 2])
 
     def test_merge(self):
         """ test merge function """
@@ -260,6 +288,64 @@ class SwaggerBaseTestCase(unittest.TestCase):
         else:
             self.fail('ValueError not raised')
 
+    def test_compile(self):
+        """ contexts are compiled, and children are built without recursion """
+        class NestedContext(base.Context):
+            __swagger_ref_object__ = TObj
+
+        setattr(NestedContext, '__swagger_child__', {
+            'a': (base.ContainerType.list_, ChildContext),
+            'd': (None, NestedContext),
+        })
+
+        depth = 5000
+        obj = cur = {}
+        for i in range(depth):
+            cur['a'] = [{'g': {'name': str(i)}}, None]
+            cur['d'] = {}
+            cur = cur['d']
+
+        tmp = {'t': {}}
+        with NestedContext(tmp, 't') as ctx:
+            ctx._consume = True
+            ctx.parse(obj)
+
+        t, i = tmp['t'], 0
+        while t.d:
+            self.assertEqual(t.a[0].g.name, str(i))
+            self.assertTrue(isinstance(t.a[1], ChildObj))
+            self.assertTrue(t.a[0]._parent_ is t)
+            self.assertTrue(t.d._parent_ is t)
+            self.assertTrue(t.is_set('d'))
+            t, i = t.d, i + 1
+        self.assertEqual(i, depth)
+
+        # children are dropped when consumed
+        self.assertEqual(obj, {})
+
+        # compiled again when children are replaced
+        self.assertEqual(len(NestedContext.compile().children), 2)
+        setattr(NestedContext, '__swagger_child__', {'d': (None, NestedContext)})
+        self.assertEqual(len(NestedContext.compile().children), 1)
+
+        # objects of nested context are also checked
+        class ChildNotOkContext(base.Context):
+            __swagger_ref_object__ = ChildObj
+
+            @classmethod
+            def is_produced(kls, obj):
+                return False
+
+        class TestNotOkContext(base.Context):
+            __swagger_ref_object__ = TObj
+            __swagger_child__ = {'a': (base.ContainerType.list_, ChildNotOkContext)}
+
+        class ParentContext(base.Context):
+            __swagger_ref_object__ = TObj
+            __swagger_child__ = {'d': (None, TestNotOkContext)}
+
+        self.assertRaises(ValueError, ParentContext(tmp, 't').parse, {'d': {'a': [{}]}})
+
     def test_produce(self):
         """ test produce function """
         class TestBoolContext(base.Context):
@@ -381,3 +467,82 @@ class SwaggerBaseTestCase(unittest.TestCase):
         self.assertEqual(d.c, 3)
         self.assertEqual(d.d, 4)
 
+
+    def test_slots(self):
+        """ fields are kept in slots """
+        class A(six.with_metaclass(base.FieldMeta, base.BaseObj)):
+            __swagger_fields__ = {'a': None, '$ref': None}
+
+        class B(six.with_metaclass(base.FieldMeta, A)):
+            __swagger_fields__ = {'b': []}
+            __internal_fields__ = {'i': None}
+
+        class Bx(base.Context):
+            __swagger_ref_object__ = B
+
+        tmp = {'t': {}}
+        with Bx(tmp, 't') as ctx:
+            ctx.parse({'a': 1, 'b': [2], '$ref': '#/c'})
+        b = tmp['t']
+
+        # slots of parent are not duplicated
+        self.assertEqual(sorted(A.__slots__), sorted([b.get_private_name('a'), b.get_private_name('$ref')]))
+        self.assertEqual(sorted(B.__slots__), sorted([b.get_private_name('b'), b.get_private_name('i')]))
+
+        self.assertEqual((b.a, b.b, getattr(b, '$ref'), b.i), (1, [2], '#/c', None))
+        self.assertRaises(AttributeError, setattr, b, 'a', 2)
+
+        # nothing else is allocated, unless attached
+        self.assertEqual(getattr(b, '__dict__', {}), {})
+        b.extra = 1
+        self.assertEqual(b.__dict__, {'extra': 1})
+
+        b.update_field('i', 'x')
+        self.assertEqual(b.i, 'x')
+        self.assertTrue(b.is_set('i'))
+
+        # weakref
+        self.assertEqual(weakref.proxy(b).a, 1)
+        self.assertEqual(weakref.ref(b)(), b)
+
+    def test_pickle(self):
+        """ objects in slots are pickled """
+        tmp = {'t': {}}
+        obj = {'a': [{}], 'b': {'bb': {'g': {'name': 'n'}}}, 'd': {}}
+        with TContext(tmp, 't') as ctx:
+            ctx.parse(obj)
+
+        t = pickle.loads(pickle.dumps(tmp['t'], pickle.HIGHEST_PROTOCOL))
+        self.assertEqual(t.dump(), tmp['t'].dump())
+        self.assertEqual(t.b['bb'].g.name, 'n')
+        self.assertTrue(t.b['bb']._parent_ is t)
+        self.assertTrue(t.is_set('a'))
+        self.assertFalse(t.is_set('f'))
+
+    def test_is_set(self):
+        """ keys set are recorded in a bitmask """
+        class A(six.with_metaclass(base.FieldMeta, base.BaseObj)):
+            __swagger_fields__ = {'a': None, 'b': None, 'c': None}
+            __swagger_rename__ = {'c': 'cc'}
+
+        class B(six.with_metaclass(base.FieldMeta, A)):
+            __swagger_fields__ = {'d': None}
+            __internal_fields__ = {'i': None}
+
+        class Bx(base.Context):
+            __swagger_ref_object__ = B
+
+        tmp = {'t': {}}
+        with Bx(tmp, 't') as ctx:
+            ctx.parse({'a': 1, 'c': 2, 'x-ext': 3})
+        b = tmp['t']
+
+        self.assertEqual([b.is_set(k) for k in ['a', 'b', 'c', 'cc', 'd', 'i', 'x-ext', 'y']],
+                         [True, False, True, True, False, False, True, False])
+        self.assertEqual(len(set(B.__field_bits__.values())), 5)
+
+        b.update_field('d', 4)
+        b.update_field('i', 5)
+        self.assertTrue(b.is_set('d'))
+        self.assertTrue(b.is_set('i'))
+        self.assertFalse(b.is_set('b'))
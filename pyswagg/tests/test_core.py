@@ -1,9 +1,16 @@
 from pyswagg import App, utils
 from .utils import get_test_data_folder
 from pyswagg.spec.base import BaseObj
+from pyswagg.getter import LocalGetter, DictGetter
+from pyswagg import getter as getter_mod
+from pyswagg.resolve import Resolver
 import pyswagg
 import unittest
 import httpretty
+import tempfile
+import shutil
+import copy
+import json
 import os
 import six
 
@@ -100,3 +107,163 @@ class SwaggerCoreTestCase(unittest.TestCase):
         req.prepare(scheme='https', handle_files=False)
         self.assertEqual(req.url, 'https://test.com/t1')
 
+
+
+class SnapshotTestCase(unittest.TestCase):
+    """ test snapshot of prepared App """
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.spec_dir = tempfile.mkdtemp()
+        shutil.copy(os.path.join(get_test_data_folder(version='2.0', which='wordnik'), 'swagger.json'), self.spec_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+        shutil.rmtree(self.spec_dir)
+
+    def _create_without_prepare(self):
+        """ create App with App.prepare disabled """
+        origin = App.prepare
+        def _prepare(*a, **k):
+            raise Exception('should be restored from snapshot')
+        App.prepare = _prepare
+        try:
+            return App.create(self.spec_dir, cache_dir=self.cache_dir)
+        finally:
+            App.prepare = origin
+
+    def test_restore(self):
+        """ the restored App should be the same as the prepared one """
+        app = App.create(self.spec_dir, cache_dir=self.cache_dir)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+        restored = self._create_without_prepare()
+        self.assertNotEqual(id(app.root), id(restored.root))
+        self.assertEqual(utils._diff_(app.dump(), restored.dump()), [])
+        self.assertEqual(sorted(app.op.keys()), sorted(restored.op.keys()))
+        self.assertEqual(restored.schemes, app.schemes)
+
+        # $ref should be resolved to objects in the restored graph
+        s = restored.resolve('#/definitions/Pet').properties['category']
+        self.assertEqual(s.ref_obj.name, 'Category')
+
+        # objects owned by App should be replaced
+        op = restored.op['getPetById']
+        self.assertEqual(id(op._prim_factory), id(restored.prim_factory))
+        req, _ = op(petId=1)
+        req.prepare()
+        self.assertEqual(req.path, '/pet/1')
+
+    def test_invalidate(self):
+        """ snapshot should be dropped when any document changed """
+        App.create(self.spec_dir, cache_dir=self.cache_dir)
+
+        path = os.path.join(self.spec_dir, 'swagger.json')
+        with open(path) as f:
+            spec = json.load(f)
+        spec['definitions']['Pet']['properties']['nickname'] = {'type': 'string'}
+        with open(path, 'w') as f:
+            json.dump(spec, f)
+
+        self.assertRaises(Exception, self._create_without_prepare)
+
+        app = App.create(self.spec_dir, cache_dir=self.cache_dir)
+        self.assertTrue('nickname' in app.resolve('#/definitions/Pet').properties)
+
+        # the snapshot is refreshed
+        restored = self._create_without_prepare()
+        self.assertTrue('nickname' in restored.resolve('#/definitions/Pet').properties)
+
+    def test_strict_mismatch(self):
+        """ snapshot prepared in different mode should not be used """
+        App.create(self.spec_dir, strict=False, cache_dir=self.cache_dir)
+        self.assertRaises(Exception, self._create_without_prepare)
+
+
+class StreamLoadTestCase(unittest.TestCase):
+    """ test App loaded in streaming mode """
+
+    def test_same_result(self):
+        """ make sure streaming mode produce the same App """
+        for which in ['wordnik', os.path.join('ex', 'reuse'), 'bitbucket']:
+            path = os.path.join(get_test_data_folder(version='2.0', which=which), 'swagger.json')
+            origin = App.create(path, strict=False)
+
+            app = App.create(path, strict=False, stream=True)
+            self.assertEqual(utils._diff_(app.dump(), origin.dump()), [])
+
+            # memory-mapped files
+            threshold, LocalGetter.__mmap_threshold__ = LocalGetter.__mmap_threshold__, 1
+            try:
+                app = App.create(path, strict=False, stream=True)
+            finally:
+                LocalGetter.__mmap_threshold__ = threshold
+            self.assertEqual(utils._diff_(app.dump(), origin.dump()), [])
+            self.assertEqual(sorted(app.op.keys()), sorted(origin.op.keys()))
+
+    def test_not_consume_dict(self):
+        """ dict provided by getter should not be modified """
+        path = get_test_data_folder(version='2.0', which='wordnik')
+        with open(os.path.join(path, 'swagger.json'), 'r') as f:
+            spec = json.load(f)
+        expected = copy.deepcopy(spec)
+
+        getter = DictGetter([path], {os.path.join(path, 'swagger.json'): spec})
+        app = App.load(path, resolver=Resolver(default_getter=getter), stream=True)
+        app.prepare()
+        self.assertEqual(spec, expected)
+        self.assertEqual(utils._diff_(app.dump(), App.create(path).dump()), [])
+
+    @unittest.skipIf(getter_mod.ijson == None, 'ijson is not installed')
+    def test_iter_items(self):
+        """ members of split values are yielded one by one, with '$ref' collected """
+        refs = set()
+        doc = b'{"swagger": "2.0", "paths": {"/a": {"$ref": "a.json"}, "/b": {}}, "tags": [{"name": "t", "x": {"$ref": "b.json"}}]}'
+        items = list(getter_mod._iter_items(getter_mod.ijson.basic_parse(six.BytesIO(doc)), ['paths'], refs))
+        self.assertEqual(items, [
+            ('swagger', None, '2.0'),
+            ('paths', '/a', {'$ref': 'a.json'}),
+            ('paths', '/b', {}),
+            ('tags', None, [{'name': 't', 'x': {'$ref': 'b.json'}}]),
+        ])
+        self.assertEqual(refs, set(['a.json', 'b.json']))
+
+    @unittest.skipIf(getter_mod.ijson == None, 'ijson is not installed')
+    def test_incremental(self):
+        """ json documents are parsed along streaming when ijson is available """
+        path = os.path.join(get_test_data_folder(version='2.0', which=os.path.join('ex', 'reuse')), 'swagger.json')
+        origin = App.create(path, strict=False)
+
+        streamed = []
+        class _Resolver(Resolver):
+            def stream(self, *args, **kwargs):
+                ret = super(_Resolver, self).stream(*args, **kwargs)
+                streamed.append(ret != None)
+                return ret
+
+        resolver = _Resolver()
+        app = App.load(path, resolver=resolver, stream=True)
+        app.prepare(strict=False)
+        self.assertEqual(streamed, [True])
+        self.assertEqual(utils._diff_(app.dump(), origin.dump()), [])
+        self.assertTrue(resolver.digests[utils.normalize_url(path)])
+
+        # the version is known after 'paths', members are kept until then
+        with open(path, 'r') as f:
+            spec = json.load(f)
+        tmp = os.path.join(tempfile.mkdtemp(), 'reuse')
+        shutil.copytree(os.path.dirname(path), tmp)
+        try:
+            with open(os.path.join(tmp, 'swagger.json'), 'w') as f:
+                f.write('{"paths": ' + json.dumps(spec.pop('paths')) + ', ' + json.dumps(spec)[1:])
+            app = App.create(os.path.join(tmp, 'swagger.json'), strict=False, stream=True)
+            origin = App.create(os.path.join(tmp, 'swagger.json'), strict=False)
+        finally:
+            shutil.rmtree(os.path.dirname(tmp))
+        self.assertEqual(utils._diff_(app.dump(), origin.dump()), [])
+
+    def test_v1_2(self):
+        """ documents other than Swagger 2.0 are parsed as a whole """
+        path = get_test_data_folder(version='1.2', which='wordnik')
+        app = App.create(path, stream=True)
+        self.assertEqual(utils._diff_(app.dump(), App.create(path).dump()), [])
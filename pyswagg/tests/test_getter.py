@@ -1,9 +1,17 @@
 from pyswagg import App
-from pyswagg.getter import UrlGetter, DictGetter, SimpleGetter
+from pyswagg.getter import UrlGetter, DictGetter, SimpleGetter, HttpGetter, LocalGetter, Parsers
 from pyswagg.resolve import Resolver
-from pyswagg.utils import _diff_
+from pyswagg.utils import _diff_, deref
 from .utils import get_test_data_folder
 import unittest
+import threading
+import tempfile
+import hashlib
+import shutil
+import gzip
+import zipfile
+import tarfile
+import six
 import os
 import json
 
@@ -204,3 +212,250 @@ class GetterTestCase(unittest.TestCase):
         # should raise some specific error
         self.assertRaises(_MyCustomException, App.load, path, getter=_MyCustomGetter)
 
+
+_recorded_parsers = Parsers()
+
+def _record_json(s):
+    _record_json.called.append(s)
+    return json.loads(s)
+_record_json.called = []
+_recorded_parsers.register('json', _record_json)
+
+class _IndentedGetter(SimpleGetter):
+    __simple_getter_callback__ = lambda url: '\n   {"swagger": "2.0", "info": {}}'
+    __parsers__ = _recorded_parsers
+
+
+class ParsersTestCase(unittest.TestCase):
+    """ test parser backends of getter """
+
+    def test_find(self):
+        """ parsers are picked by extension, content type, then content """
+        p = Parsers()
+        self.assertEqual(p.find(' \n {"a": 1}'), 'json')
+        self.assertEqual(p.find('[1, 2]'), 'json')
+        self.assertEqual(p.find('a: 1'), 'yaml')
+        self.assertEqual(p.find('{"a": 1}', path='/tmp/swagger.yaml'), 'yaml')
+        self.assertEqual(p.find('a: 1', path='http://test.com/swagger.json?v=1'), 'json')
+        self.assertEqual(p.find('{"a": 1}', content_type='application/x-yaml; charset=utf-8'), 'yaml')
+        self.assertEqual(p.find('a: 1', content_type='application/vnd.test+json'), 'json')
+        self.assertEqual(p.find('a: 1', path='http://test.com/api', content_type='text/plain'), 'yaml')
+
+    def test_parse(self):
+        """ json failed to parse is treated as yaml """
+        p = Parsers()
+        self.assertEqual(p.parse('a: 1', path='swagger.json'), {'a': 1})
+        self.assertEqual(p.parse('\n\t{"a": [1, 18446744073709551616]}'), {'a': [1, 18446744073709551616]})
+
+        p.unregister('yaml')
+        self.assertRaises(Exception, p.parse, 'a: 1', path='swagger.json')
+
+    def test_getter(self):
+        """ make sure json with leading spaces is parsed by json parser """
+        g = _IndentedGetter('http://test.com/api-docs')
+        self.assertEqual(six.advance_iterator(g), {'swagger': '2.0', 'info': {}})
+        self.assertEqual(len(_record_json.called), 1)
+
+
+
+class _SpecHandler(six.moves.BaseHTTPServer.BaseHTTPRequestHandler):
+    """ serve documents in server.docs with ETag, and record requests """
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = self.server.docs.get(self.path, None)
+        etag = '"{0}"'.format(hashlib.sha1(body).hexdigest()) if body != None else None
+        self.server.requests.append((self.path, self.client_address, self.headers.get('If-None-Match')))
+
+        if body == None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        elif self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        else:
+            self.send_response(200)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def log_message(self, *a):
+        pass
+
+
+class _SpecServer(six.moves.socketserver.ThreadingMixIn, six.moves.BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class HttpGetterTestCase(unittest.TestCase):
+    """ test HttpGetter against a local http server """
+
+    def setUp(self):
+        with open(os.path.join(get_test_data_folder(version='2.0', which='wordnik'), 'swagger.json'), 'rb') as f:
+            self.spec = f.read()
+
+        self.server = _SpecServer(('127.0.0.1', 0), _SpecHandler)
+        self.server.docs = {'/swagger.json': self.spec}
+        self.server.requests = []
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs=dict(poll_interval=0.05))
+        self.thread.daemon = True
+        self.thread.start()
+
+        self.url = 'http://127.0.0.1:{0}/swagger.json'.format(self.server.server_address[1])
+        self.cache_dir = tempfile.mkdtemp()
+
+        class _Getter(HttpGetter):
+            __cache_dir__ = self.cache_dir
+
+        class _OfflineGetter(_Getter):
+            __offline__ = True
+
+        self.getter, self.offline_getter = _Getter, _OfflineGetter
+
+    def tearDown(self):
+        HttpGetter._pool.clear()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.cache_dir)
+
+    def test_revalidate(self):
+        """ cached document is revalidated with ETag, on the same connection """
+        app = App.load(self.url, getter=self.getter)
+        app.prepare()
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(self.server.requests[0][2], None)
+
+        again = App.load(self.url, getter=self.getter)
+        again.prepare()
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(self.server.requests[1][2], '"{0}"'.format(hashlib.sha1(self.spec).hexdigest()))
+        # keep-alive connection is reused
+        self.assertEqual(self.server.requests[0][1], self.server.requests[1][1])
+        self.assertEqual(_diff_(app.dump(), again.dump()), [])
+
+    def test_modified(self):
+        """ a modified document should be loaded again """
+        App.load(self.url, getter=self.getter)
+
+        spec = json.loads(self.spec.decode('utf-8'))
+        spec['info']['title'] = 'modified'
+        self.server.docs['/swagger.json'] = json.dumps(spec).encode('utf-8')
+
+        app = App.load(self.url, getter=self.getter)
+        self.assertEqual(app.raw.info.title, 'modified')
+
+        # cache is updated
+        app = App.load(self.url, getter=self.offline_getter)
+        self.assertEqual(app.raw.info.title, 'modified')
+
+    def test_offline(self):
+        """ load from cache only when offline """
+        self.assertRaises(ValueError, App.load, self.url, getter=self.offline_getter)
+        self.assertEqual(len(self.server.requests), 0)
+
+        App.load(self.url, getter=self.getter)
+        self.assertEqual(len(self.server.requests), 1)
+
+        app = App.load(self.url, getter=self.offline_getter)
+        app.prepare()
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_not_found(self):
+        """ http error should be raised """
+        self.assertRaises(six.moves.urllib.error.HTTPError, App.load, self.url + '.missing', getter=self.getter)
+
+
+class ArchiveTestCase(unittest.TestCase):
+    """ test loading from compressed files and archives """
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.reuse = get_test_data_folder(version='2.0', which=os.path.join('ex', 'reuse'))
+        self.origin = App.create(os.path.join(self.reuse, 'swagger.json'))
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def _members(self, folder):
+        for root, _, files in os.walk(folder):
+            for f in files:
+                p = os.path.join(root, f)
+                yield p, os.path.relpath(p, folder).replace(os.sep, '/')
+
+    def test_gzip(self):
+        """ gzip-ed files are loaded transparently """
+        for p, name in self._members(self.reuse):
+            dst = os.path.join(self.folder, name + '.gz')
+            if not os.path.isdir(os.path.dirname(dst)):
+                os.makedirs(os.path.dirname(dst))
+            with open(p, 'rb') as src, gzip.open(dst, 'wb') as f:
+                f.write(src.read())
+
+        app = App.create(os.path.join(self.folder, 'swagger.json.gz'))
+        self.assertEqual(_diff_(app.dump(), self.origin.dump(), exclude=['$ref']), [])
+
+        # locate swagger.json.gz in folder
+        app = App.load(self.folder, getter=LocalGetter)
+        self.assertEqual(app.raw.host, self.origin.root.host)
+
+    def test_zip(self):
+        """ load a spec tree from a zip bundle """
+        path = os.path.join(self.folder, 'spec.zip')
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as z:
+            for p, name in self._members(self.reuse):
+                z.write(p, name)
+
+        app = App.create(path)
+        self.assertEqual(app.url, 'file://' + path + '/swagger.json')
+        self.assertEqual(_diff_(app.dump(), self.origin.dump(), exclude=['$ref']), [])
+
+        # relative $ref are resolved in archive
+        self.assertEqual(deref(app.resolve('#/definitions/QQ')).description, 'Another simple model')
+
+    def test_tar_v1_2(self):
+        """ load Swagger 1.2 from a tar.gz bundle """
+        wordnik = get_test_data_folder(version='1.2', which='wordnik')
+        path = os.path.join(self.folder, 'spec.tar.gz')
+        with tarfile.open(path, 'w:gz') as t:
+            for p, name in self._members(wordnik):
+                t.add(p, './' + name)
+
+        app = App.create(path)
+        self.assertEqual(_diff_(app.dump(), App.create(wordnik).dump(), exclude=['$ref']), [])
+
+    def test_cache(self):
+        """ archive is read once, and read again when modified """
+        path = os.path.join(self.folder, 'spec.zip')
+        with zipfile.ZipFile(path, 'w') as z:
+            for p, name in self._members(self.reuse):
+                z.write(p, name)
+
+        opened = []
+        class _CountedZipFile(zipfile.ZipFile):
+            def __init__(self, *args, **kwargs):
+                opened.append(args[0])
+                super(_CountedZipFile, self).__init__(*args, **kwargs)
+
+        origin = zipfile.ZipFile
+        zipfile.ZipFile = _CountedZipFile
+        try:
+            App.create(path)
+            self.assertEqual(opened, [path])
+
+            App.create(path)
+            self.assertEqual(opened, [path])
+
+            # modified
+            with origin(path, 'a') as z:
+                z.writestr('README', 'hello')
+            os.utime(path, (0, 0))
+            App.create(path)
+            self.assertEqual(opened, [path, path])
+        finally:
+            zipfile.ZipFile = origin
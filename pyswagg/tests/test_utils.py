@@ -2,9 +2,12 @@ from pyswagg import utils, errs
 from .utils import is_windows, is_py2
 from datetime import datetime
 import unittest
+import pickle
 import functools
 import six
 import os
+import shutil
+import tempfile
 
 
 class SwaggerUtilsTestCase(unittest.TestCase):
@@ -85,6 +88,108 @@ class SwaggerUtilsTestCase(unittest.TestCase):
         self.assertEqual(d['get'], 1)
         self.assertEqual(d['something-get'], 2)
 
+    def test_scope_dict_index(self):
+        """ ScopeDict, lookup through indexes """
+        d = utils.ScopeDict({
+            'a!b!c': 1,
+            'x!ab!c': 2,
+            'd!e': 3,
+            'f!ge': 4,
+            'h!xyz': 5,
+        })
+        d.sep = '!'
+
+        self.assertEqual(d['ab!c'], 2)
+        self.assertEqual(d['x', 'ab', 'c'], 2)
+        self.assertRaises(ValueError, d.__getitem__, 'b!c')
+        self.assertRaises(ValueError, d.__getitem__, 'c')
+
+        # suffixes not delimited by separators
+        self.assertEqual(d['e'], 3)
+        self.assertEqual(d['yz'], 5)
+        self.assertRaises(KeyError, d.__getitem__, 'z!c')
+        self.assertRaises(KeyError, d.__getitem__, 'w')
+
+        # indexes are rebuilt when changed
+        d['y!w'] = 6
+        self.assertEqual(d['w'], 6)
+        del d['x!ab!c']
+        self.assertEqual(d['c'], 1)
+        d.update({'q!yz': 7})
+        self.assertEqual(d['yz'], 7)
+
+        d.sep = '#'
+        self.assertRaises(ValueError, d.__getitem__, 'yz')
+        self.assertEqual(d['y!w'], 6)
+
+        # indexes are not pickled
+        d = utils.ScopeDict({'a!b': 1})
+        d.sep = '!'
+        self.assertEqual(d['b'], 1)
+        dd = pickle.loads(pickle.dumps(d))
+        self.assertEqual(dd['b'], 1)
+        dd['c!b'] = 2
+        self.assertRaises(ValueError, dd.__getitem__, 'b')
+
+    def test_replace_file(self):
+        """ replace_file, with and without os.replace """
+        folder = tempfile.mkdtemp()
+        replace = getattr(os, 'replace', None)
+        try:
+            src, dst = os.path.join(folder, 'src'), os.path.join(folder, 'dst')
+            for fallback in [False, True]:
+                if fallback and replace:
+                    del os.replace
+                for p, content in [(src, 'new'), (dst, 'old')]:
+                    with open(p, 'w') as f:
+                        f.write(content)
+
+                utils.replace_file(src, dst)
+                self.assertFalse(os.path.exists(src))
+                with open(dst) as f:
+                    self.assertEqual(f.read(), 'new')
+        finally:
+            if replace:
+                os.replace = replace
+            shutil.rmtree(folder)
+
+    def test_path_trie(self):
+        """ PathTrie """
+        t = utils.PathTrie()
+        t.add('get', '/v1/pets/{id}', 1)
+        t.add('GET', '/v1/pets/mine', 2)
+        t.add('delete', '/v1/pets/{id}', 3)
+        t.add('get', '/v1/pets/{id}.json', 4)
+        t.add('get', '/v1/pets/{id}/photos/{photo}', 5)
+        t.add('get', '/v1/{kind}/mine/{x}', 6)
+        self.assertEqual(len(t), 6)
+
+        self.assertEqual(t.match('get', '/v1/pets/1'), (1, {'id': '1'}))
+        self.assertEqual(t.match('GET', '/v1/pets/mine'), (2, {}))
+        # literal segments first, templated ones are tried when no method matched
+        self.assertEqual(t.match('delete', '/v1/pets/mine'), (3, {'id': 'mine'}))
+        # partially templated segments first
+        self.assertEqual(t.match('get', '/v1/pets/1.json'), (4, {'id': '1'}))
+        self.assertEqual(t.match('get', '/v1/pets/a%2Fb/photos/%E2%9C%93'), (5, {'id': 'a/b', 'photo': u'\u2713'}))
+        # backtracking
+        self.assertEqual(t.match('get', '/v1/pets/mine/2'), (6, {'kind': 'pets', 'x': '2'}))
+
+        self.assertEqual(t.match('post', '/v1/pets/1'), None)
+        self.assertEqual(t.match('get', '/v1/pets'), None)
+        self.assertEqual(t.match('get', '/v2/pets/1'), None)
+
+        # empty segments are kept, except the leading one
+        self.assertEqual(t.match('get', '/v1/pets/mine/'), None)
+        self.assertEqual(t.match('get', '//v1/pets/mine'), None)
+        self.assertEqual(t.match('get', '/v1//pets/mine'), None)
+        self.assertEqual(t.match('get', '/v1/pets//'), None)
+        self.assertEqual(t.match('get', 'v1/pets/mine'), (2, {}))
+
+        t.add('get', '/', 7)
+        t.add('get', '/v1/pets/', 8)
+        self.assertEqual(t.match('get', '/'), (7, {}))
+        self.assertEqual(t.match('get', '/v1/pets/'), (8, {}))
+
     def test_dict_to_tuple(self):
         """ get_dict_as_tuple """
         self.assertEqual(
@@ -179,6 +284,27 @@ class SwaggerUtilsTestCase(unittest.TestCase):
         c.update(1)
         self.assertRaises(errs.CycleDetectionError, c.update, 1)
 
+        # compared by identity
+        a, b = [], []
+        c.update(a)
+        c.update(b)
+        self.assertRaises(errs.CycleDetectionError, c.update, a)
+
+    def test_cycle_guard_path(self):
+        c, a, b = utils.CycleGuard(), [], []
+        c.enter(a, 1)
+        c.enter(b, 1)
+        c.enter(a, 2)
+        self.assertEqual(c.path, [a, b, a])
+        self.assertRaises(errs.CycleDetectionError, c.enter, a, 1)
+
+        # objects left are allowed to be entered again
+        c.leave()
+        c.leave()
+        c.enter(b, 1)
+        self.assertRaises(errs.CycleDetectionError, c.enter, a, 1)
+        self.assertEqual(c.path, [a, b])
+
     @unittest.skipUnless(not is_windows(), 'make no sense on windows')
     def test_normalize_url(self):
         self.assertEqual(utils.normalize_url(None), None)
@@ -430,6 +556,42 @@ class WalkTestCase(unittest.TestCase):
             [2, 3 ,4, 2]
             ]))
 
+    def test_find_cycles(self):
+        """ find_cycles should report the same cycles as walk """
+        confs = [
+            {0: [0]},
+            {0: [1], 1: [2], 2: [3], 3: [4], 4: [5], 5: [1]},
+            {0: [6], 1: [6], 2: [0], 3: [1], 4: [4], 5: [3], 6: [3], 7: [4], 8: [0]},
+            {0: [1], 1: [2], 2: [3], 3: [0, 5], 4: [2], 5: [4]},
+            {0: [1, 2], 1: [2, 3], 2: [3, 4], 3: [4, 5], 4: [5, 6], 5: [6, 7], 6: [7], 7: []},
+            {0: [1, 4], 1: [2], 2: [0, 3], 3: [4, 5], 4: [1, 2], 5: [4]},
+            {0: [1, 1, 0], 1: [0, 2], 2: [2, 1]},
+        ]
+        for conf in confs:
+            out = functools.partial(WalkTestCase._out, conf)
+
+            cyc = []
+            for i in sorted(conf.keys()):
+                cyc = utils.walk(i, out, cyc)
+
+            self.assertEqual(sorted(utils.find_cycles(sorted(conf.keys()), out)), sorted(cyc))
+
+        # only those reachable from start vertices
+        self.assertEqual(utils.find_cycles([7], functools.partial(WalkTestCase._out, confs[2])), [[4, 4]])
+
+    def test_scc(self):
+        """ strongly connected components, in reverse topological order """
+        edges = {0: [1], 1: [2], 2: [0, 3], 3: [4], 4: [3], 5: []}
+        self.assertEqual(
+            [sorted(c) for c in utils.scc([0, 5], edges)],
+            [[3, 4], [0, 1, 2], [5]]
+        )
+
+        # deep graph would not hit the recursion limit
+        edges = dict((i, [i + 1]) for i in range(100000))
+        edges[100000] = [0]
+        self.assertEqual(len(utils.scc([0], edges)), 1)
+
     def test_case_insensitive_dict(self):
         """ test utils.CaseInsensitiveDict
         """
@@ -454,3 +616,33 @@ class WalkTestCase(unittest.TestCase):
         else:
             # should not reach here
             self.assertTrue(False)
+
+    def test_json_pointer_trie(self):
+        """ test utils.JsonPointerTrie
+        """
+        t = utils.JsonPointerTrie()
+        t['#/definitions/User'] = 'user'
+        t['#/definitions/User/properties'] = 'props'
+        t['#/paths/~1a~1b'] = 'path'
+        self.assertEqual(len(t), 3)
+        self.assertTrue('#/definitions/User' in t)
+        self.assertFalse('#/definitions' in t)
+
+        # the longest prefix is picked
+        self.assertEqual(t.longest_prefix('#/definitions/User/properties/id'), ('props', ['id']))
+        self.assertEqual(t.longest_prefix('#/definitions/User/required'), ('user', ['required']))
+        self.assertEqual(t.longest_prefix('#/definitions/User'), ('user', []))
+        self.assertEqual(t.longest_prefix('#/paths/~1a~1b/get'), ('path', ['get']))
+
+        # prefixes are compared token by token, not by string
+        self.assertEqual(t.longest_prefix('#/definitions/UserX'), None)
+        self.assertEqual(t.longest_prefix('#/paths/~1a'), None)
+
+        t['#'] = 'root'
+        self.assertEqual(t.longest_prefix('#/definitions/UserX'), ('root', ['definitions', 'UserX']))
+        self.assertEqual(sorted(t.items()), sorted([
+            ('#', 'root'),
+            ('#/definitions/User', 'user'),
+            ('#/definitions/User/properties', 'props'),
+            ('#/paths/~1a~1b', 'path'),
+        ]))
@@ -1,4 +1,5 @@
 from pyswagg import App, errs, utils
+from pyswagg.getter import LocalGetter
 from ..utils import get_test_data_folder
 from pyswagg.spec.v2_0.objects import (
     Schema,
@@ -6,6 +7,9 @@ from pyswagg.spec.v2_0.objects import (
 )
 import unittest
 import httpretty
+import tempfile
+import shutil
+import time
 import os
 import six
 
@@ -216,3 +220,50 @@ class AppTestCase(unittest.TestCase):
             'user!##!User'
         ]))
 
+
+
+class _SlowGetter(LocalGetter):
+    """ a getter taking more time for resources listed earlier """
+
+    __delay__ = {'pet': 0.3, 'user': 0.2, 'store': 0.1}
+
+    def load(self, path):
+        time.sleep(self.__delay__.get(os.path.splitext(os.path.basename(path))[0], 0))
+        return super(_SlowGetter, self).load(path)
+
+
+class ConcurrentLoadTestCase(unittest.TestCase):
+    """ test loading resources concurrently """
+
+    def test_same_result(self):
+        """ the loaded App should be the same as the one loaded serially """
+        path = get_test_data_folder(version='1.2', which='wordnik')
+        app = App.load(path, getter=_SlowGetter, max_workers=4)
+        app.prepare()
+
+        self.assertEqual(list(app.raw.apis.keys()), ['pet', 'user', 'store'])
+        self.assertEqual(utils._diff_(app.dump(), App.create(path).dump()), [])
+
+    def test_aggregated_error(self):
+        """ all failures should be reported at once """
+        folder = tempfile.mkdtemp()
+        try:
+            shutil.copy(os.path.join(get_test_data_folder(version='1.2', which='wordnik'), 'resource_list.json'), folder)
+            shutil.copy(os.path.join(get_test_data_folder(version='1.2', which='wordnik'), 'user.json'), folder)
+
+            try:
+                App.load(folder, max_workers=4)
+            except errs.LoadError as e:
+                self.assertEqual(
+                    sorted(os.path.basename(u) for u, _ in e.errors),
+                    ['pet', 'store']
+                )
+            else:
+                self.fail('LoadError is not raised')
+        finally:
+            shutil.rmtree(folder)
+
+    def test_conflict_with_resolver(self):
+        """ max_workers should be passed to customized Resolver """
+        from pyswagg.resolve import Resolver
+        self.assertRaises(ValueError, App.load, get_test_data_folder(version='1.2', which='wordnik'), resolver=Resolver(), max_workers=2)
@@ -1,9 +1,12 @@
 from pyswagg import App, utils, primitives, errs
 from ..utils import get_test_data_folder
-from ...scanner import CycleDetector
+from ...scanner import CycleDetector, CycleDetection
 from ...scan import Scanner
 import unittest
 import os
+import json
+import shutil
+import tempfile
 import six
 
 
@@ -88,3 +91,62 @@ class CircularRefTestCase(unittest.TestCase):
         s = app.resolve('#/definitions/s1')
         self.assertRaises(errs.CycleDetectionError, app.prim_factory.produce, s, {})
 
+
+    def test_produce_recursive(self):
+        """ nested values of recursive Schema(s) are not cycles, unless the value refers to itself """
+        app = App.create(get_test_data_folder(
+            version='2.0',
+            which=os.path.join('circular', 'schema'),
+            ),
+            strict=False
+        )
+
+        s = app.resolve('#/definitions/s12')
+        m = app.prim_factory.produce(s, {'id': {'name': {'id': {'name': {}}}}})
+        self.assertEqual(m, {'id': {'name': {'id': {'name': {}}}}})
+
+        v = {}
+        v['id'] = {'name': v}
+        self.assertRaises(errs.CycleDetectionError, app.prim_factory.produce, s, v)
+
+    def test_produce_all_of(self):
+        """ cycles along 'allOf' are detected, whatever values are handled at each level """
+        folder = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(folder, 'swagger.json'), 'w') as f:
+                json.dump({
+                    'swagger': '2.0',
+                    'info': {'title': 'test', 'version': '1.0'},
+                    'paths': {},
+                    'definitions': {
+                        'a': {'allOf': [{'$ref': '#/definitions/b'}]},
+                        'b': {'allOf': [{'$ref': '#/definitions/a'}]},
+                    }
+                }, f)
+
+            app = App.create(os.path.join(folder, 'swagger.json'), strict=False)
+        finally:
+            shutil.rmtree(folder)
+
+        s = app.resolve('#/definitions/a')
+        self.assertRaises(errs.CycleDetectionError, app.prim_factory.produce, s, {})
+
+    def test_cycle_detection(self):
+        """ cycles could be detected lazily or in background when not strict """
+        folder = get_test_data_folder(version='2.0', which=os.path.join('circular', 'schema'))
+        expected = App.create(folder, strict=False).cycles
+
+        self.assertEqual(len(expected['schema']), 6)
+        for mode in [CycleDetection.lazy_, CycleDetection.background_]:
+            app = App.create(folder, strict=False, cycle_detection=mode)
+            self.assertEqual(app.cycles, expected)
+
+        # always detected in strict mode
+        self.assertRaises(errs.CycleDetectionError, App.create, folder, cycle_detection=CycleDetection.lazy_)
+
+        # when prepared lazily, detected when accessed
+        app = App.create(folder, lazy=True)
+        for _ in range(2):
+            self.assertRaises(errs.CycleDetectionError, app.resolve, '#/definitions/s1')
+        self.assertRaises(errs.CycleDetectionError, app.warm_up)
+        self.assertEqual(App.create(folder, strict=False, lazy=True).cycles, expected)
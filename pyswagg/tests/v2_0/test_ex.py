@@ -1,8 +1,18 @@
 from pyswagg import App
+from pyswagg.resolve import Resolver, CachePolicy
+from pyswagg.getter import LocalGetter
+from pyswagg.cache import SharedCache
+from pyswagg.subset import Subset
+from pyswagg import utils
 from ..utils import get_test_data_folder
 from ...utils import deref, final
 from ...spec.v2_0.parser import PathItemContext
+from ...spec.v2_0.objects import Schema, Operation
 import unittest
+import tempfile
+import shutil
+import json
+import threading
 import os
 import six
 
@@ -154,3 +164,588 @@ class ReuseTestCase(unittest.TestCase):
         o2 = self.app.resolve('file:///reuse/operations.json#/health')
         self.assertNotEqual(id(o1), id(o2), PathItemContext)
 
+
+
+class PrefetchTestCase(unittest.TestCase):
+    """ test case for prefetching external documents concurrently """
+
+    def _load(self, url, max_workers):
+        r = Resolver(url_load_hook=_gen_hook(get_test_data_folder(version='2.0', which='ex')), max_workers=max_workers)
+        return App.load(url=url, resolver=r), r
+
+    def test_prefetch(self):
+        """ all referenced documents are loaded before parsing """
+        app, r = self._load('file:///reuse/swagger.json', 4)
+        self.assertEqual(sorted(r.digests), [
+            'file:///reuse/definitions/definitions/models.json',
+            'file:///reuse/definitions/models.json',
+            'file:///reuse/operations.json',
+            'file:///reuse/parameters/parameters.json',
+            'file:///reuse/responses.json',
+            'file:///reuse/swagger.json',
+        ])
+
+        app.prepare()
+        # nothing more to load
+        self.assertEqual(len(r.digests), 6)
+
+        serial, r = self._load('file:///reuse/swagger.json', 1)
+        self.assertEqual(list(r.digests), ['file:///reuse/swagger.json'])
+        serial.prepare()
+
+        self.assertEqual(app.dump(), serial.dump())
+
+    def test_prefetch_released(self):
+        """ released documents are prefetched again """
+        app, r = self._load('file:///reuse/swagger.json', 4)
+        app.prepare()
+
+        prefetched, try_resolve = [], r._Resolver__try_resolve
+        def _try_resolve(url):
+            prefetched.append(url)
+            return try_resolve(url)
+        r._Resolver__try_resolve = _try_resolve
+
+        # nothing to prefetch when everything is loaded
+        r.prefetch('file:///reuse/swagger.json')
+        self.assertEqual(prefetched, [])
+
+        r.release(['file:///reuse/responses.json'])
+        r.prefetch('file:///reuse/swagger.json')
+        self.assertEqual(prefetched, ['file:///reuse/responses.json'])
+
+    def test_without_futures(self):
+        """ documents are loaded one by one when concurrent.futures is not available """
+        from pyswagg import resolve
+
+        kls = resolve.ThreadPoolExecutor
+        resolve.ThreadPoolExecutor = None
+        try:
+            app, r = self._load('file:///reuse/swagger.json', 4)
+            self.assertEqual(list(r.digests), ['file:///reuse/swagger.json'])
+            app.prepare()
+        finally:
+            resolve.ThreadPoolExecutor = kls
+
+        serial, _ = self._load('file:///reuse/swagger.json', 1)
+        serial.prepare()
+        self.assertEqual(app.dump(), serial.dump())
+
+    def test_missing_document(self):
+        """ failure in prefetching should not be raised until it's resolved """
+        folder = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(folder, 'swagger.json'), 'w') as f:
+                json.dump({
+                    'swagger': '2.0',
+                    'info': {'title': 'test', 'version': '1.0'},
+                    'paths': {},
+                    'definitions': {
+                        'User': {
+                            'type': 'object',
+                            # not a reference, but looks like one
+                            'example': {'$ref': 'not_existed.json#/User'},
+                        }
+                    }
+                }, f)
+
+            app = App.load(os.path.join(folder, 'swagger.json'), max_workers=4)
+            app.prepare()
+            self.assertRaises(Exception, app.resolve, utils.normalize_jr('not_existed.json#/User', app.url))
+        finally:
+            shutil.rmtree(folder)
+
+
+class CachePolicyTestCase(unittest.TestCase):
+    """ test case for cache policies of Resolver """
+
+    def _create(self, **kwargs):
+        r = Resolver(url_load_hook=_gen_hook(get_test_data_folder(version='2.0', which='ex')), **kwargs)
+        app = App.load(url='file:///reuse/swagger.json', resolver=r)
+        app.prepare()
+        return app, r
+
+    def test_keep_all(self):
+        """ all loaded documents are cached by default """
+        _, r = self._create()
+        self.assertEqual(sorted(r.cached), sorted(r.digests))
+
+    def test_lru(self):
+        """ cached documents are kept within the budget """
+        app, r = self._create(cache_policy=CachePolicy.lru_, cache_budget=1000)
+        self.assertTrue(r.cache_size <= 1000)
+        self.assertTrue(len(r.cached) < len(r.digests))
+        self.assertEqual(app.dump(), self._create()[0].dump())
+
+        # evicted documents are loaded again on demand
+        evicted = [u for u in r.digests if u not in r.cached]
+        self.assertTrue(len(evicted) > 0)
+        self.assertTrue(isinstance(r.resolve(evicted[0]), dict))
+        self.assertEqual(r.cached[-1], evicted[0])
+
+        self.assertRaises(ValueError, Resolver, cache_policy=CachePolicy.lru_)
+
+    def test_release_after_prepare(self):
+        """ nothing is cached after prepared """
+        app, r = self._create(cache_policy=CachePolicy.release_after_prepare_)
+        self.assertEqual(r.cached, [])
+        self.assertEqual(r.cache_size, 0)
+
+        # resolving still works
+        self.assertEqual(final(app.s('pets').get.responses['400']).description, 'Entity not found')
+        self.assertEqual(r.resolve('file:///reuse/responses.json#/NotFoundError')['description'], 'Entity not found')
+
+    def test_release_raw(self):
+        """ release raw documents explicitly """
+        app, r = self._create()
+        digests = r.digests
+
+        app.release_raw()
+        self.assertEqual(r.cached, [])
+        self.assertEqual(app.resolve('file:///reuse/operations.json#/health').get.summary, 'Returns server health information')
+        self.assertEqual(r.digests, digests)
+
+
+class ReloadTestCase(unittest.TestCase):
+    """ test case for App.reload """
+
+    def setUp(self):
+        self.folder = os.path.join(tempfile.mkdtemp(), 'reuse')
+        shutil.copytree(get_test_data_folder(version='2.0', which=os.path.join('ex', 'reuse')), self.folder)
+        self.app = App.create(os.path.join(self.folder, 'swagger.json'))
+
+    def tearDown(self):
+        shutil.rmtree(os.path.dirname(self.folder))
+
+    def _update_response(self, description):
+        path = os.path.join(self.folder, 'responses.json')
+        with open(path) as f:
+            obj = json.load(f)
+        obj['NotFoundError']['description'] = description
+        with open(path, 'w') as f:
+            json.dump(obj, f)
+        return utils.normalize_url(path)
+
+    def test_reload(self):
+        """ only changed documents and their dependents are reloaded """
+        self.assertEqual(self.app.reload(), [])
+
+        url = utils.normalize_url(os.path.join(self.folder, 'parameters', 'parameters.json'))
+        param = self.app.resolve(url + '#/query/skip')
+        old_op = self.app.s('pets').get
+
+        changed = self._update_response('Not here')
+        self.assertEqual(self.app.reload(), [changed])
+
+        # objects already referred are untouched
+        self.assertEqual(final(old_op.responses['400']).description, 'Entity not found')
+        self.assertEqual(final(self.app.s('pets').get.responses['400']).description, 'Not here')
+
+        # objects of unchanged documents are reused
+        self.assertTrue(self.app.resolve(url + '#/query/skip') is param)
+
+        # everything is swapped in together
+        ops = [o for _, o in self.app.index.nodes(Operation)]
+        self.assertEqual(len(ops), 2)
+        for o in ops:
+            self.assertTrue(getattr(self.app.root.paths[o.path], o.method) is o)
+        self.assertEqual(sorted(id(o) for o in self.app.op.values()), sorted(id(o) for o in ops if o.operationId))
+
+        self.assertEqual(self.app.reload(), [])
+
+    def test_watch(self):
+        """ reload in background """
+        done, got = threading.Event(), []
+
+        def _on_reload(changed):
+            got.extend(changed)
+            done.set()
+
+        w = self.app.watch(interval=0.05, on_reload=_on_reload)
+        try:
+            changed = self._update_response('Not here')
+            self.assertTrue(done.wait(10))
+        finally:
+            w.stop()
+
+        self.assertEqual(got, [changed])
+        self.assertEqual(final(self.app.s('pets').get.responses['400']).description, 'Not here')
+
+    def _check_members(self, lazy):
+        app = App.load(os.path.join(self.folder, 'swagger.json'))
+        app.prepare(lazy=lazy)
+        root = app.root
+        health, pets = app.resolve('#/paths/~1health/get'), app.resolve('#/paths/~1pets/get')
+        user = app.resolve('#/definitions/User')
+
+        changed = self._update_response('Not here')
+        self.assertEqual(app.reload(), [changed])
+
+        # only members depending on changed documents are prepared again
+        self.assertFalse(app.root is root)
+        self.assertFalse(app.resolve('#/paths/~1pets/get') is pets)
+        self.assertTrue(app.resolve('#/paths/~1health/get') is health)
+        self.assertTrue(app.resolve('#/definitions/User') is user)
+        self.assertTrue(app.root.paths['/health'] is root.paths['/health'])
+
+        self.assertEqual(final(pets.responses['400']).description, 'Entity not found')
+        self.assertEqual(final(app.resolve('#/paths/~1pets/get').responses['400']).description, 'Not here')
+
+        # the same as an App loaded from scratch
+        app.warm_up()
+        origin = App.create(os.path.join(self.folder, 'swagger.json'))
+        self.assertEqual(utils._diff_(app.dump(), origin.dump()), [])
+        self.assertEqual(sorted(p for p, _ in app.index.nodes()), sorted(p for p, _ in origin.index.nodes()))
+        self.assertEqual(sorted(app.op.keys()), sorted(origin.op.keys()))
+        self.assertEqual(app.cycles, origin.cycles)
+
+    def test_reload_members(self):
+        """ members of the root document are prepared again only when they depend on changed documents """
+        self._check_members(lazy=False)
+
+    def test_reload_members_lazy(self):
+        """ the same for App prepared lazily """
+        self._check_members(lazy=True)
+
+    def test_reload_via_members(self):
+        """ members referring to reloaded members are prepared again """
+        path = os.path.join(self.folder, 'definitions', 'models.json')
+        with open(path) as f:
+            obj = json.load(f)
+        obj['models']['Model']['description'] = 'changed'
+        with open(path, 'w') as f:
+            json.dump(obj, f)
+
+        pets = self.app.s('pets').get
+        self.assertEqual(self.app.reload(), [utils.normalize_url(path)])
+
+        # '#/paths/~1pets' refers to '#/definitions/User'
+        self.assertFalse(self.app.s('pets').get is pets)
+        self.assertEqual(deref(self.app.resolve('#/definitions/User')).description, 'changed')
+        self.assertEqual(deref(self.app.s('pets').get.responses['200'].schema.items).description, 'changed')
+
+    def test_stat_first(self):
+        """ unchanged documents are not read when polled """
+        count = [0]
+        peek_digest = LocalGetter.peek_digest
+
+        def _peek_digest(getter):
+            count[0] += 1
+            return peek_digest(getter)
+
+        LocalGetter.peek_digest = _peek_digest
+        try:
+            self.assertEqual(self.app.reload(), [])
+            self.assertEqual(count[0], 0)
+
+            changed = self._update_response('Not here')
+            self.assertEqual(self.app.reload(), [changed])
+            self.assertEqual(count[0], 1)
+
+            # touched without changes
+            path = os.path.join(self.folder, 'parameters', 'parameters.json')
+            st = os.stat(path)
+            os.utime(path, (st.st_atime, st.st_mtime + 10))
+            self.assertEqual(self.app.reload(), [])
+            self.assertEqual(self.app.reload(), [])
+            self.assertEqual(count[0], 2)
+        finally:
+            LocalGetter.peek_digest = peek_digest
+
+
+class SharedCacheTestCase(unittest.TestCase):
+    """ test case for documents and objects shared by Apps """
+
+    def setUp(self):
+        self.folder = os.path.join(tempfile.mkdtemp(), 'reuse')
+        shutil.copytree(get_test_data_folder(version='2.0', which=os.path.join('ex', 'reuse')), self.folder)
+
+        # another root document referring to the same external documents,
+        # along with one referring back to it.
+        with open(os.path.join(self.folder, 'swagger.json')) as f:
+            obj = json.load(f)
+        obj['host'] = 'other.com'
+        obj['definitions']['Back'] = {'$ref': 'back.json#/Back'}
+        with open(os.path.join(self.folder, 'other.json'), 'w') as f:
+            json.dump(obj, f)
+        with open(os.path.join(self.folder, 'back.json'), 'w') as f:
+            json.dump({'Back': {'type': 'object', 'properties': {'u': {'$ref': 'other.json#/definitions/User'}}}}, f)
+
+    def tearDown(self):
+        shutil.rmtree(os.path.dirname(self.folder))
+
+    def _create(self, name, shared_cache=None):
+        return App.create(os.path.join(self.folder, name), shared_cache=shared_cache)
+
+    def test_shared(self):
+        """ external documents are prepared once """
+        cache = SharedCache()
+        app1 = self._create('swagger.json', cache)
+        stats = cache.stats
+        self.assertEqual(stats['obj_hits'], 0)
+        self.assertTrue(stats['raw_misses'] > 0)
+
+        app2 = self._create('other.json', cache)
+        stats = cache.stats
+        self.assertTrue(stats['obj_hits'] > 0)
+        self.assertTrue(stats['bytes_saved'] > 0)
+        self.assertTrue(0 < stats['hit_rate'] < 1)
+
+        # the same as not shared
+        self.assertEqual(app1.dump(), self._create('swagger.json').dump())
+        self.assertEqual(app2.dump(), self._create('other.json').dump())
+
+        # objects of external documents are shared
+        url = utils.normalize_url(os.path.join(self.folder, 'parameters', 'parameters.json'))
+        self.assertTrue(app1.resolve(url + '#/query/skip') is app2.resolve(url + '#/query/skip'))
+
+        # objects owned by each App are not shared
+        self.assertFalse(app1.s('pets').get is app2.s('pets').get)
+        self.assertEqual(app2.op['getHealth'].url, '//other.com/v1/health')
+        self.assertEqual(app1.op['getHealth'].url, '//test.com/v1/health')
+
+        # those referring to objects of root document are not shared
+        url = utils.normalize_url(os.path.join(self.folder, 'back.json'))
+        self.assertEqual(cache.get_obj(url, '#/Back'), None)
+
+    def test_concurrent(self):
+        """ Apps sharing the same cache are created concurrently """
+        cache, apps = SharedCache(), {}
+
+        def _run(i):
+            apps[i] = self._create('swagger.json' if i % 2 else 'other.json', cache)
+
+        ts = [threading.Thread(target=_run, args=(i,)) for i in range(6)]
+        for t in ts:
+            t.start()
+        for t in ts:
+            t.join()
+
+        expected = [self._create('other.json').dump(), self._create('swagger.json').dump()]
+        for i in range(6):
+            self.assertEqual(apps[i].dump(), expected[i % 2])
+
+    def test_invalidate(self):
+        """ changed documents are dropped from the shared cache when reloading """
+        cache = SharedCache()
+        app1, app2 = self._create('swagger.json', cache), self._create('other.json', cache)
+
+        path = os.path.join(self.folder, 'responses.json')
+        with open(path) as f:
+            obj = json.load(f)
+        obj['NotFoundError']['description'] = 'Not here'
+        with open(path, 'w') as f:
+            json.dump(obj, f)
+
+        self.assertEqual(app1.reload(), [utils.normalize_url(path)])
+        self.assertEqual(final(app1.s('pets').get.responses['400']).description, 'Not here')
+        self.assertEqual(final(self._create('other.json', cache).s('pets').get.responses['400']).description, 'Not here')
+
+        # not reloaded yet
+        self.assertEqual(final(app2.s('pets').get.responses['400']).description, 'Entity not found')
+
+        cache.clear()
+        self.assertEqual(cache.stats['documents'], 0)
+        self.assertEqual(cache.stats['hit_rate'], 0.0)
+
+
+class LazyTestCase(unittest.TestCase):
+    """ test case for App prepared lazily """
+
+    @classmethod
+    def setUpClass(kls):
+        kls.folder = get_test_data_folder(version='2.0', which='wordnik')
+        kls.expected = App.create(kls.folder)
+
+    def test_op(self):
+        """ Operation(s) are prepared when accessed """
+        app = App.create(self.folder, lazy=True)
+        self.assertEqual(sorted(app.op.keys()), sorted(self.expected.op.keys()))
+        self.assertEqual(len(app.index), 0)
+
+        op, expected = app.op['getPetById'], self.expected.op['getPetById']
+        self.assertEqual((op.method, op.path, op.url), (expected.method, expected.path, expected.url))
+        self.assertEqual(op.produces, expected.produces)
+        self.assertEqual([final(p).name for p in op.parameters], [final(p).name for p in expected.parameters])
+        self.assertEqual(op.responses['200'].schema.ref_obj.name, 'Pet')
+
+        # only objects reachable from that Operation are prepared
+        self.assertTrue('#/definitions/Pet' in app.index)
+        self.assertFalse('#/definitions/User' in app.index)
+
+        # by App.s and App.m
+        self.assertEqual(app.s('user/{username}').get.operationId, 'getUserByName')
+        self.assertEqual(app.m['Order'].name, 'Order')
+        self.assertEqual(app.m['Order'].final.dump(), self.expected.m['Order'].final.dump())
+
+    def test_access(self):
+        """ objects are prepared through any way to access them """
+        app = App.create(self.folder, lazy=True)
+        expected = self.expected.op['pet', 'getPetById']
+        self.assertEqual(app.op.get('pet!##!getPetById').url, expected.url)
+
+        app = App.create(self.folder, lazy=True)
+        self.assertEqual(sorted(op.url for op in app.op.values()), sorted(op.url for op in self.expected.op.values()))
+
+        app = App.create(self.folder, lazy=True)
+        self.assertEqual(dict((k, op.url) for k, op in app.op.items()), dict((k, op.url) for k, op in self.expected.op.items()))
+        self.assertEqual(app.op.pop('pet!##!getPetById').url, expected.url)
+
+        app = App.create(self.folder, lazy=True)
+        for k, v in six.iteritems(app.m):
+            self.assertEqual(v.final.dump(), self.expected.m[k].final.dump())
+
+        app = App.create(self.folder, lazy=True)
+        self.assertEqual(app.m.get('Pet').final.dump(), self.expected.m['Pet'].final.dump())
+
+        # by App.index
+        app = App.create(self.folder, lazy=True)
+        op = app.index.get('#/paths/~1pet~1{petId}/get')
+        self.assertEqual(op.url, expected.url)
+        self.assertEqual(op.responses['200'].schema.ref_obj.name, 'Pet')
+        self.assertFalse('#/definitions/User' in app.index)
+        self.assertEqual(
+            sorted(p for p, _ in app.index.nodes(Schema)),
+            sorted(p for p, _ in self.expected.index.nodes(Schema))
+        )
+
+    def test_warm_up(self):
+        """ the same as prepared eagerly after warming up """
+        app = App.create(self.folder, lazy=True)
+        app.op['getPetById']
+        app.warm_up()
+
+        self.assertEqual(app.dump(), self.expected.dump())
+        self.assertEqual(sorted(p for p, _ in app.index.nodes()), sorted(p for p, _ in self.expected.index.nodes()))
+        for p, o in self.expected.index.nodes():
+            self.assertEqual(app.index.get(p).compare(o), (True, ''))
+        self.assertEqual(app.cycles, self.expected.cycles)
+
+    def test_definitions(self):
+        """ definitions are parsed when accessed """
+        app = App.create(self.folder, lazy=True)
+        app.op['getPetById']
+
+        # only those reachable are parsed
+        pet, user = app.root.definitions['Pet'], app.root.definitions['User']
+        self.assertTrue(type(pet) is Schema)
+        self.assertFalse(type(user) is Schema)
+        self.assertTrue(isinstance(user, Schema))
+        self.assertTrue(user._parent_ is app.root)
+
+        # parsed on the first access of attributes
+        self.assertEqual(user.properties['id'].format, 'int64')
+        self.assertTrue(type(user) is Schema)
+        self.assertTrue(user.properties['id']._parent_ is user)
+
+    def test_definitions_as_eager(self):
+        """ dump, compare and validate the same as parsed eagerly """
+        app = App.load(self.folder, lazy=True)
+        expected = App.load(self.folder)
+        self.assertEqual(app.raw.compare(expected.raw), (True, ''))
+
+        app = App.load(self.folder, lazy=True)
+        self.assertEqual(app.raw.dump(), expected.raw.dump())
+
+        app = App.load(self.folder, lazy=True)
+        self.assertEqual(app.validate(strict=False), expected.validate(strict=False))
+        app.prepare()
+        self.assertEqual(app.dump(), self.expected.dump())
+
+
+class SubsetTestCase(unittest.TestCase):
+    """ test case for App loaded with a subset """
+
+    @classmethod
+    def setUpClass(kls):
+        kls.folder = get_test_data_folder(version='2.0', which='wordnik')
+        kls.expected = App.create(kls.folder)
+
+    def test_tags(self):
+        """ select by tags """
+        app = App.create(self.folder, subset=Subset(tags=['store']))
+        self.assertEqual(sorted(app.op.keys()), sorted(k for k in self.expected.op.keys() if k.startswith('store')))
+        self.assertEqual(sorted(app.m.keys()), ['Order'])
+        self.assertEqual(app.op['getOrderById'].dump(), self.expected.op['getOrderById'].dump())
+
+        # referred definitions are reachable
+        self.assertEqual(sorted(App.create(self.folder, subset=Subset(tags=['pet'])).m.keys()), ['ApiResponse', 'Category', 'Pet', 'Tag'])
+
+    def test_criteria(self):
+        """ all criteria are matched """
+        app = App.create(self.folder, subset=Subset(paths=['/user/*'], methods=['GET']))
+        self.assertEqual(sorted(app.op.keys()), ['user!##!getUserByName', 'user!##!loginUser', 'user!##!logoutUser'])
+        self.assertEqual(app.root.paths['/user/{username}'].put, None)
+
+        app = App.create(self.folder, subset=Subset(tags=['pet'], operation_ids=['getPetById', 'getOrderById']))
+        self.assertEqual(list(app.op.keys()), ['pet!##!getPetById'])
+
+        app = App.create(self.folder, subset=Subset(tags=['nothing']))
+        self.assertEqual(len(app.op), 0)
+        self.assertEqual(len(app.m), 0)
+
+    def test_reachable(self):
+        """ parameters, responses and definitions reachable through $ref """
+        obj = {
+            'swagger': '2.0',
+            'paths': {
+                '/a': {
+                    'parameters': [{'$ref': '#/parameters/p1'}],
+                    'get': {'tags': ['a'], 'responses': {'default': {'$ref': '#/responses/r1'}}},
+                    'put': {'tags': ['b'], 'parameters': [{'$ref': '#/parameters/p2'}], 'responses': {}},
+                },
+                '/b': {'$ref': '#/paths/~1c'},
+                '/c': {'get': {'tags': ['b'], 'responses': {}}, 'post': {'tags': ['c'], 'responses': {}}},
+            },
+            'definitions': {
+                'd1': {'type': 'object', 'properties': {'d': {'$ref': '#/definitions/d2'}}},
+                'd2': {'type': 'string'},
+                'd3': {'type': 'string'},
+            },
+            'parameters': {
+                'p1': {'name': 'p1', 'in': 'query', 'type': 'string'},
+                'p2': {'name': 'p2', 'in': 'query', 'type': 'string'},
+            },
+            'responses': {
+                'r1': {'description': 'r1', 'schema': {'$ref': '#/definitions/d1'}},
+            },
+        }
+
+        ret = Subset(tags=['a']).apply(obj)
+        self.assertEqual(sorted(ret['paths'].keys()), ['/a'])
+        self.assertEqual(sorted(ret['paths']['/a'].keys()), ['get', 'parameters'])
+        self.assertEqual(sorted(ret['definitions'].keys()), ['d1', 'd2'])
+        self.assertEqual(sorted(ret['parameters'].keys()), ['p1'])
+        self.assertEqual(sorted(ret['responses'].keys()), ['r1'])
+
+        # not modified
+        self.assertEqual(sorted(obj['paths']['/a'].keys()), ['get', 'parameters', 'put'])
+        self.assertEqual(len(obj['definitions']), 3)
+
+        ret = Subset(paths=['/c']).apply(obj)
+        self.assertEqual(sorted(ret['paths'].keys()), ['/c'])
+        self.assertEqual(ret['definitions'], {})
+
+        # PathItem(s) referred are kept as a whole
+        ret = Subset(tags=['b'], paths=['/a', '/b']).apply(obj)
+        self.assertEqual(sorted(ret['paths'].keys()), ['/a', '/b', '/c'])
+        self.assertEqual(sorted(ret['paths']['/a'].keys()), ['parameters', 'put'])
+        self.assertEqual(sorted(ret['paths']['/c'].keys()), ['get', 'post'])
+        self.assertEqual(sorted(ret['parameters'].keys()), ['p1', 'p2'])
+
+    def test_snapshot(self):
+        """ snapshots are only restored with the same subset """
+        cache_dir = tempfile.mkdtemp()
+        try:
+            App.create(self.folder, cache_dir=cache_dir, subset=Subset(tags=['store']))
+            self.assertEqual(len(App.create(self.folder, cache_dir=cache_dir).op), len(self.expected.op))
+            self.assertEqual(len(App.create(self.folder, cache_dir=cache_dir, subset=Subset(tags=['store'])).op), 4)
+
+            # kept separately, not overwritten by each other
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+            url = utils.normalize_url(self.folder)
+            self.assertEqual(len(App._load_snapshot(url, cache_dir).op), len(self.expected.op))
+            self.assertEqual(len(App._load_snapshot(url, cache_dir, subset=Subset(tags=['store'])).op), 4)
+            self.assertEqual(App._load_snapshot(url, cache_dir, subset=Subset(tags=['pet'])), None)
+        finally:
+            shutil.rmtree(cache_dir)
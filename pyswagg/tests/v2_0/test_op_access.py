@@ -26,6 +26,35 @@ class OperationAccessTestCase(unittest.TestCase):
         _check(self, path.resolve('post'))
         _check(self, path.post)
 
+    def test_match(self):
+        """ App.match """
+        op, params = self.app.match('GET', 'http://petstore.swagger.io/v2/pet/1?a=b#c')
+        self.assertEqual((op.operationId, params), ('getPetById', {'petId': '1'}))
+        self.assertTrue(op is self.app.op['getPetById'])
+
+        op, params = self.app.match('get', '/v2/pet/findByStatus')
+        self.assertEqual((op.operationId, params), ('findPetsByStatus', {}))
+        op, params = self.app.match('put', '/v2/user/login')
+        self.assertEqual((op.operationId, params), ('updateUser', {'username': 'login'}))
+        op, params = self.app.match('GET', '/v2/user/john%20doe')
+        self.assertEqual((op.operationId, params), ('getUserByName', {'username': 'john doe'}))
+
+        self.assertEqual(self.app.match('PATCH', '/v2/pet/1'), None)
+        self.assertEqual(self.app.match('GET', '/pet/1'), None)
+
+        # empty segments are not ignored
+        self.assertEqual(self.app.match('PUT', '/v2/pet/'), None)
+        self.assertEqual(self.app.match('PUT', '//v2//pet'), None)
+        self.assertEqual(self.app.match('GET', '/v2/pet//'), None)
+        self.assertEqual(self.app.match('PUT', '/v2/pet')[0], self.app.s('pet').put)
+
+        # prepared when matched
+        app = App.create(get_test_data_folder(version='2.0', which='wordnik'), lazy=True)
+        op, params = app.match('GET', '/v2/store/order/3')
+        self.assertEqual((op.operationId, params), ('getOrderById', {'orderId': '3'}))
+        self.assertEqual(op.url, self.app.op['getOrderById'].url)
+        self.assertTrue('#/definitions/Order' in app.index)
+
     def test_tag_operationId(self):
         """
         """
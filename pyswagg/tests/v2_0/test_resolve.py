@@ -3,6 +3,7 @@ from pyswagg.spec.v2_0 import objects
 from ..utils import get_test_data_folder
 from ...utils import final
 import unittest
+import weakref
 import os
 
 
@@ -68,6 +69,20 @@ class ResolveTestCase(unittest.TestCase):
 
         self.assertEqual(final(p.responses['default']).description, 'void, r1')
 
+    def test_index(self):
+        """ make sure resolving by index is the same as walking the tree """
+        # proxies to the same object are the same one when alive
+        for path, o in self.app.index.nodes():
+            r = self.app.resolve(path)
+            self.assertTrue(r is weakref.proxy(o))
+            self.assertTrue(self.app.root.resolve(utils.jp_split(path)[1:]) is o)
+
+        # parameters patched from PathItem
+        p = self.app.s('/a').get
+        for i in range(len(p.parameters)):
+            r = self.app.resolve(utils.jp_compose(str(i), base='#/paths/~1a/get/parameters'))
+            self.assertTrue(r is weakref.proxy(p.parameters[i]))
+
     def test_raises(self):
         """ make sure to raise for invalid input """
         self.assertRaises(ValueError, self.app.resolve, None)
@@ -0,0 +1,172 @@
+from pyswagg import App
+from pyswagg.scan import Scanner, Dispatcher, Pipeline, default_tree_traversal
+from pyswagg.spec.v2_0.objects import Operation, Schema, BaseSchema, Parameter, Items, Header
+from ..utils import get_test_data_folder
+import unittest
+import os
+
+
+class CountObject(object):
+    """ a scanner counting objects by class """
+
+    class Disp(Dispatcher): pass
+
+    def __init__(self):
+        self.total = {}
+
+    @Disp.register([Operation, Schema])
+    def _count(self, path, obj, _):
+        self.total[obj.__class__] = self.total.get(obj.__class__, 0) + 1
+
+
+class RecordOrder(object):
+    """ a scanner recording the order of handlers """
+
+    class Disp(Dispatcher): pass
+
+    def __init__(self):
+        self.order = []
+
+    @Disp.register([Schema])
+    def _schema(self, path, obj, _):
+        return 'schema'
+
+    @Disp.register([BaseSchema])
+    def _base(self, path, obj, _):
+        return 'base'
+
+    @Disp.result
+    def _result(self, r):
+        self.order.append(r)
+
+
+class DispatchTestCase(unittest.TestCase):
+    """ test dispatching in Scanner """
+
+    @classmethod
+    def setUpClass(kls):
+        kls.app = App.create(get_test_data_folder(version='2.0', which='wordnik'))
+
+    def test_mro(self):
+        """ handlers of parent classes are called after those of the class """
+        r, c = RecordOrder(), CountObject()
+        Scanner(self.app).scan(route=[r, c], root=self.app.root)
+
+        i = r.order.index('schema')
+        self.assertEqual(r.order[i + 1], 'base')
+        self.assertEqual(r.order.count('schema'), c.total[Schema])
+        self.assertTrue(r.order.count('base') > c.total[Schema])
+
+    def test_register_after_scan(self):
+        """ dispatch tables should be refreshed by new registration """
+        class _Late(object):
+            class Disp(Dispatcher): pass
+            def __init__(self):
+                self.count = 0
+
+        Scanner(self.app).scan(route=[_Late()], root=self.app.root)
+
+        def _parameter(self, path, obj, _):
+            self.count += 1
+        _Late.Disp.register([Parameter])(_parameter)
+
+        late = _Late()
+        Scanner(self.app).scan(route=[late], root=self.app.root)
+        self.assertTrue(late.count > 0)
+
+
+class PipelineTestCase(unittest.TestCase):
+    """ test Pipeline """
+
+    @classmethod
+    def setUpClass(kls):
+        kls.app = App.create(get_test_data_folder(version='2.0', which='wordnik'))
+
+    def test_fuse(self):
+        """ stages are fused until something required """
+        p = Pipeline(Scanner(self.app))
+        p.add('a', []).add('b', []).add('c', [], requires=['a']).add('d', []).add('e', [], requires=['b'])
+
+        self.assertEqual([[s.name for s in g] for g in p.groups], [['a', 'b'], ['c', 'd', 'e']])
+
+    def test_invalid_stage(self):
+        """ requiring unknown/later stages is not allowed """
+        p = Pipeline(Scanner(self.app))
+        p.add('a', [])
+        self.assertRaises(ValueError, p.add, 'b', [], requires=['c'])
+        self.assertRaises(ValueError, p.add, 'a', [])
+
+    def test_run(self):
+        """ fused stages should visit the same objects as separated scans """
+        c1, c2, c3 = CountObject(), CountObject(), CountObject()
+        p = Pipeline(Scanner(self.app))
+        p.add('c1', [c1]).add('c2', [c2], leaves=[Operation]).add('c3', [c3], requires=['c1'])
+        p.run(self.app.root)
+
+        c = CountObject()
+        Scanner(self.app).scan(route=[c], root=self.app.root)
+
+        self.assertEqual(c1.total, c.total)
+        self.assertEqual(c2.total, c.total)
+        self.assertEqual(c3.total, c.total)
+        self.assertEqual([names for names, _ in p.passes], [('c1', 'c2'), ('c3',)])
+        self.assertEqual(list(p.timing.keys()), ['c1', 'c2', 'c3'])
+
+    def test_check(self):
+        """ later traversals are skipped when a check raises """
+        def _check():
+            raise ValueError('stop')
+
+        c1, c2 = CountObject(), CountObject()
+        p = Pipeline(Scanner(self.app))
+        p.add('c1', [c1], check=_check).add('c2', [c2], requires=['c1'])
+        self.assertRaises(ValueError, p.run, self.app.root)
+        self.assertTrue(len(c1.total) > 0)
+        self.assertEqual(c2.total, {})
+        self.assertEqual([names for names, _ in p.passes], [('c1',)])
+
+    def test_app_timing(self):
+        """ make sure timing of preparation is reported """
+        self.assertEqual(sorted(self.app.timing.keys()), sorted([
+            'yaml_fixer', 'normalize_ref', 'resolve', 'validate', 'merge',
+            'type_reduce', 'cycle_detector', 'patch_object', 'aggregate'
+        ]))
+
+
+class NodeIndexTestCase(unittest.TestCase):
+    """ test NodeIndex kept in App """
+
+    def _check(self, app):
+        expected = [(p, id(o)) for p, o in default_tree_traversal(app.root, [])]
+        self.assertEqual(sorted(expected), sorted((p, id(o)) for p, o in app.index.nodes()))
+
+    def test_wordnik(self):
+        """ the index should reflect the tree """
+        app = App.create(get_test_data_folder(version='2.0', which='wordnik'))
+        self._check(app)
+
+        ops = list(app.index.nodes(Operation))
+        self.assertEqual(len(ops), 20)
+        self.assertTrue(('#/paths/~1pet~1{petId}/get', app.s('pet/{petId}').get) in ops)
+
+        # subclasses are included
+        self.assertEqual(
+            sorted(p for p, _ in app.index.nodes(BaseSchema)),
+            sorted(p for p, _ in app.index.nodes(Schema, Parameter, Items, Header))
+        )
+        self.assertEqual(app.index.get('#/definitions/Pet'), app.resolve('#/definitions/Pet'))
+
+    def test_attached_by_merge(self):
+        """ Operation(s) merged from referenced PathItem should be indexed """
+        app = App.create(get_test_data_folder(version='2.0', which=os.path.join('resolve', 'path_item')))
+        self._check(app)
+
+        self.assertEqual(
+            sorted(p for p, _ in app.index.nodes(Operation) if p.startswith('#/paths/~1a/')),
+            ['#/paths/~1a/get', '#/paths/~1a/post', '#/paths/~1a/put']
+        )
+
+    def test_attached_by_patch(self):
+        """ Parameter(s) inherited from PathItem should be indexed """
+        app = App.create(get_test_data_folder(version='2.0', which='patch'))
+        self._check(app)
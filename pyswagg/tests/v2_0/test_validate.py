@@ -1,4 +1,5 @@
 from pyswagg import App
+from pyswagg import errs
 from ..utils import get_test_data_folder
 import unittest
 import os
@@ -18,3 +19,15 @@ class ValidationTestCase(unittest.TestCase):
         self.assertEqual(sorted(errs), sorted([
             ((u'#/definitions/ReadOnly', 'Schema'), 'ReadOnly property in required list: protected')
         ]))
+
+    def test_strict_before_merge(self):
+        """ validation errors are raised before objects are merged """
+        path = get_test_data_folder(version='2.0', which=os.path.join('validate', 'req_and_readonly'))
+        app = App.load(path)
+        self.assertRaises(errs.ValidationError, app.prepare, strict=True)
+        self.assertEqual(app.root.paths['/k'].post.parameters[0].final, None)
+
+        # the same when prepared lazily
+        app = App.create(path, lazy=True)
+        self.assertRaises(errs.ValidationError, app.resolve, '#/paths/~1k/post')
+        self.assertEqual(app.root.paths['/k'].post.parameters[0].final, None)
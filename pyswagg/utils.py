@@ -42,11 +42,60 @@ def scope_split(scope, sep=private.SCOPE_SEPARATOR):
 
 class ScopeDict(dict):
     """ ScopeDict
+
+    Keys not found are looked up by suffix through indexes built on
+    the first miss, and dropped when this dict or its separator is changed:
+    - a map from every separator-delimited suffix of keys to those keys,
+      ex. 'c', 'b!##!c', 'a!##!b!##!c' for 'a!##!b!##!c'.
+    - a map from every other suffix of last components of keys to those keys,
+      ex. 'et' for 'a!##!get'. Built only when needed.
     """
     def __init__(self, *a, **k):
         self.__sep = private.SCOPE_SEPARATOR
+        self.__suffixes = None
+        self.__tails = None
         super(ScopeDict, self).__init__(*a, **k)
 
+    def __reset(self):
+        self.__suffixes = self.__tails = None
+
+    def __setitem__(self, k, v):
+        self.__reset()
+        super(ScopeDict, self).__setitem__(k, v)
+
+    def __delitem__(self, k):
+        self.__reset()
+        super(ScopeDict, self).__delitem__(k)
+
+    def update(self, *a, **k):
+        self.__reset()
+        super(ScopeDict, self).update(*a, **k)
+
+    def setdefault(self, k, default=None):
+        self.__reset()
+        return super(ScopeDict, self).setdefault(k, default)
+
+    def pop(self, *a):
+        self.__reset()
+        return super(ScopeDict, self).pop(*a)
+
+    def popitem(self):
+        self.__reset()
+        return super(ScopeDict, self).popitem()
+
+    def clear(self):
+        self.__reset()
+        super(ScopeDict, self).clear()
+
+    def __getstate__(self):
+        # indexes are not pickled
+        state = dict(self.__dict__)
+        state['_ScopeDict__suffixes'] = state['_ScopeDict__tails'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
     @property
     def sep(self):
         """ separator property
@@ -58,6 +107,59 @@ class ScopeDict(dict):
         """ update separater used here
         """
         self.__sep = sep
+        self.__reset()
+
+    def __index_suffixes(self):
+        """ a map from separator-delimited suffixes to keys """
+        if self.__suffixes == None:
+            sep, idx = self.__sep, {}
+            for ik in self.keys():
+                if not isinstance(ik, six.string_types):
+                    continue
+                i = len(ik)
+                while i >= 0:
+                    i = ik.rfind(sep, 0, i)
+                    idx.setdefault(ik[i + len(sep):] if i >= 0 else ik, []).append(ik)
+                    if i == 0:
+                        break
+            self.__suffixes = idx
+        return self.__suffixes
+
+    def __index_tails(self):
+        """ a map from suffixes of last components, not separator-delimited, to keys """
+        if self.__tails == None:
+            idx = {}
+            for s, iks in six.iteritems(self.__index_suffixes()):
+                if self.__sep in s:
+                    continue
+                for i in range(1, len(s)):
+                    idx.setdefault(s[i:], []).extend(iks)
+            self.__tails = idx
+        return self.__tails
+
+    def __match(self, k):
+        """ keys ending with 'k', and those of them with the same last component as 'k' """
+        sep, idx = self.__sep, self.__index_suffixes()
+        last_k = k.rsplit(sep, 1)[-1]
+        if not k or any(k.startswith(sep[i:]) for i in range(1, len(sep))):
+            # a separator might end within 'k', rare enough to go through all keys
+            ret = [ik for ik in self.keys() if isinstance(ik, six.string_types) and ik.endswith(k)]
+            return ret, [ik for ik in ret if ik.rsplit(sep, 1)[-1] == last_k]
+
+        same_last = idx.get(last_k, [])
+        if last_k != k:
+            # the last separator of 'k' is the last one of keys ending with 'k',
+            # they all have the same last component.
+            aligned = idx.get(k, [])
+            if len(aligned) > 1 or len(aligned) == len(same_last):
+                return aligned, aligned
+            ret = [ik for ik in same_last if ik.endswith(k)]
+            return ret, ret
+
+        if same_last:
+            # keys whose last component only ends with 'k' are not matched
+            return same_last, same_last
+        return self.__index_tails().get(k, []), []
 
     def __getitem__(self, *keys):
         """ to access an obj with key: 'n!##!m...!##!z', caller can pass as key:
@@ -72,10 +174,10 @@ class ScopeDict(dict):
         try:
             return super(ScopeDict, self).__getitem__(k)
         except KeyError as e:
-            ret = []
-            for ik in self.keys():
-                if ik.endswith(k):
-                    ret.append(ik)
+            if not isinstance(k, six.string_types):
+                raise e
+
+            ret, matched = self.__match(k)
             if len(ret) == 1:
                 return super(ScopeDict, self).__getitem__(ret[0])
             elif len(ret) > 1:
@@ -83,8 +185,6 @@ class ScopeDict(dict):
                 #  - a!##!get
                 #  - b!##!something-get
                 #  and access with 'get'
-                last_k = k.rsplit(self.__sep, 1)[-1]
-                matched = [r for r in ret if r.rsplit(self.__sep, 1)[-1] == last_k]
                 if len(matched) == 1:
                     return super(ScopeDict, self).__getitem__(matched[0])
 
@@ -93,17 +193,235 @@ class ScopeDict(dict):
             raise e
 
 
+class JsonPointerTrie(object):
+    """ a map from JSON pointer to object, organized as a trie of
+    tokens of JSON pointer, to look for the longest prefix of a JSON pointer.
+    """
+
+    def __init__(self):
+        # a node is a list: [has-value, value, map from token to child node]
+        self.__root = [False, None, {}]
+        self.__len = 0
+
+    def __len__(self):
+        return self.__len
+
+    def __setitem__(self, jp, obj):
+        node = self.__root
+        for t in jp_split(jp)[1:]:
+            node = node[2].setdefault(t, [False, None, {}])
+
+        if not node[0]:
+            self.__len += 1
+        node[0], node[1] = True, obj
+
+    def __getitem__(self, jp):
+        node = self.__root
+        for t in jp_split(jp)[1:]:
+            node = node[2].get(t, None)
+            if node == None:
+                raise KeyError(jp)
+
+        if not node[0]:
+            raise KeyError(jp)
+        return node[1]
+
+    def __contains__(self, jp):
+        try:
+            self[jp]
+        except KeyError:
+            return False
+        return True
+
+    def longest_prefix(self, jp):
+        """ find the object with the longest JSON pointer prefixing 'jp'
+
+        :param str jp: JSON pointer
+        :return: the object and the rest tokens of 'jp', None when not found
+        :rtype: tuple of (object, list of str)
+        """
+        ts = jp_split(jp)[1:]
+        node, found = self.__root, None
+        for i, t in enumerate(ts):
+            if node[0]:
+                found = (node[1], i)
+            node = node[2].get(t, None)
+            if node == None:
+                break
+        else:
+            if node[0]:
+                found = (node[1], len(ts))
+
+        return None if found == None else (found[0], ts[found[1]:])
+
+    def items(self):
+        """ iterate through (JSON pointer, object)
+        """
+        stk = [('#', self.__root)]
+        while len(stk) > 0:
+            jp, node = stk.pop()
+            if node[0]:
+                yield jp, node[1]
+            stk.extend((jp_compose(t, base=jp), n) for t, n in six.iteritems(node[2]))
+
+
+def _path_segments(path):
+    """ segments of a path, the leading '/' is skipped, ex. '/a//b/' -> ['a', '', 'b', ''] """
+    path = path[1:] if path.startswith('/') else path
+    return path.split('/') if path else []
+
+
+class PathTrie(object):
+    """ a map from HTTP method and path template, ex. '/pets/{id}', to object,
+    organized as a trie of segments of paths, to match paths of requests.
+
+    Literal segments are tried before templated ones, and segments partially
+    templated, ex. '{id}.json', are tried before those fully templated.
+    The cost of matching grows with the depth of a path, not with count of templates.
+    """
+
+    # a template in a segment of path
+    __param = re.compile(r'{([^{}/]+)}')
+
+    def __init__(self):
+        self.__root = self.__node()
+        self.__len = 0
+
+    @staticmethod
+    def __node():
+        # a node is a list: [map from method to object, map from literal segment
+        # to child node, list of (segment, compiled regex or None, names, child node)]
+        return [{}, {}, []]
+
+    def __len__(self):
+        return self.__len
+
+    def add(self, method, path, obj):
+        """ add an object
+
+        :param str method: HTTP method, case insensitive
+        :param str path: path template
+        :param obj: the object
+        """
+        node = self.__root
+        for seg in _path_segments(path):
+            names = self.__param.findall(seg)
+            if not names:
+                node = node[1].setdefault(seg, self.__node())
+                continue
+
+            found = [t for t in node[2] if t[0] == seg]
+            if found:
+                node = found[0][3]
+                continue
+
+            if seg == '{' + names[0] + '}':
+                t = (seg, None, names, self.__node())
+                node[2].append(t)
+            else:
+                regex = re.compile('^' + ''.join(
+                    '(.+?)' if i % 2 else re.escape(s) for i, s in enumerate(self.__param.split(seg))
+                ) + '$')
+                t = (seg, regex, names, self.__node())
+                # partially templated ones are more specific
+                node[2].insert(len([x for x in node[2] if x[1] != None]), t)
+            node = t[3]
+
+        method = method.lower()
+        if method not in node[0]:
+            self.__len += 1
+        node[0][method] = obj
+
+    def match(self, method, path):
+        """ find the object for a request
+
+        :param str method: HTTP method, case insensitive
+        :param str path: path of the request, segments are percent-decoded after being split
+        :return: the object and decoded values of templates, None when not found
+        :rtype: tuple of (object, dict of str to str)
+        """
+        method = method.lower()
+        segs = [six.moves.urllib.parse.unquote(s) for s in _path_segments(path)]
+
+        # depth-first, with a stack of (node, index of segment, values of templates)
+        stk = [(self.__root, 0, [])]
+        while stk:
+            node, i, values = stk.pop()
+            if i == len(segs):
+                if method in node[0]:
+                    return node[0][method], dict(values)
+                continue
+
+            seg, nexts = segs[i], []
+            child = node[1].get(seg, None)
+            if child != None:
+                nexts.append((child, i + 1, values))
+            for _, regex, names, child in node[2]:
+                if not seg:
+                    # templates in path are required, they are never empty
+                    break
+                if regex == None:
+                    nexts.append((child, i + 1, values + [(names[0], seg)]))
+                    continue
+                m = regex.match(seg)
+                if m:
+                    nexts.append((child, i + 1, values + list(zip(names, m.groups()))))
+
+            # tried in order
+            stk.extend(reversed(nexts))
+
+        return None
+
+
 class CycleGuard(object):
-    """ Guard for cycle detection
+    """ Guard for cycle detection, objects are compared by identity.
+
+    - update: objects visited would never be visited again.
+    - enter/leave: objects are only tracked along the current path,
+      ex. when producing nested values with recursive Schema(s).
     """
 
     def __init__(self):
-        self.__visited = []
+        # a map from id to visited object, keep them alive
+        # to make sure their ids are not reused.
+        self.__visited = {}
+
+        # the current path, and keys on it
+        self.__path = []
+        self.__on_path = set()
 
     def update(self, obj):
-        if obj in self.__visited:
+        if id(obj) in self.__visited:
             raise CycleDetectionError('Cycle detected: {0}'.format(getattr(obj, '$ref', None)))
-        self.__visited.append(obj)
+        self.__visited[id(obj)] = obj
+
+    def enter(self, obj, val=None):
+        """ step into an object along the current path
+
+        :param obj: the object
+        :param val: the value handled with that object, the same object
+         handling different values is not a cycle.
+        :raises CycleDetectionError: when already on the current path
+        """
+        k = (id(obj), id(val))
+        if k in self.__on_path:
+            raise CycleDetectionError('Cycle detected: {0}'.format(getattr(obj, '$ref', None)))
+        self.__on_path.add(k)
+        self.__path.append((obj, val))
+
+    def leave(self):
+        """ step out from the last object entered
+        """
+        obj, val = self.__path.pop()
+        self.__on_path.discard((id(obj), id(val)))
+
+    @property
+    def path(self):
+        """ objects along the current path
+
+        :type: list
+        """
+        return [obj for obj, _ in self.__path]
 
 
 # TODO: this function and datetime don't handle leap-second.
@@ -265,6 +583,10 @@ def jr_split(s):
 def deref(obj, guard=None):
     """ dereference $ref
     """
+    if guard == None and getattr(obj, 'ref_obj', None) == None:
+        # nothing to guard
+        return obj
+
     cur, guard = obj, guard or CycleGuard()
     guard.update(cur)
     while cur and getattr(cur, 'ref_obj', None) != None:
@@ -402,6 +724,22 @@ def _fullmatch(regex, chunk):
     if m and m.span()[1] == len(chunk):
         return m
 
+def replace_file(src, dst):
+    """ rename a file, and replace the destination when it exists.
+    os.replace is only available after python 3.3, and os.rename
+    doesn't replace existing files on Windows.
+
+    :param str src: path of the file to rename
+    :param str dst: path of the destination
+    """
+    if hasattr(os, 'replace'):
+        os.replace(src, dst)
+        return
+
+    if os.name == 'nt' and os.path.exists(dst):
+        os.remove(dst)
+    os.rename(src, dst)
+
 def derelativise_url(url):
     '''
     Normalizes URLs, gets rid of .. and .
@@ -479,6 +817,125 @@ def walk(start, ofn, cyc=None):
 
     return cyc
 
+def scc(vertices, edges):
+    """ Non recursive Tarjan's algorithm to find strongly connected components
+
+    :param vertices: vertices in graph
+    :param dict edges: a map from vertex to the list of its outgoing edges,
+     every vertex reachable should be included.
+    :return: strongly connected components, in reverse topological order
+    :rtype: list of lists
+    """
+    index, low, on_stk, stk, ret = {}, {}, set(), [], []
+
+    def _visit(v):
+        index[v] = low[v] = len(index)
+        stk.append(v)
+        on_stk.add(v)
+        return (v, iter(edges[v]))
+
+    for root in vertices:
+        if root in index:
+            continue
+
+        work = [_visit(root)]
+        while len(work):
+            v, it = work[-1]
+            for w in it:
+                if w not in index:
+                    work.append(_visit(w))
+                    break
+                elif w in on_stk:
+                    low[v] = min(low[v], index[w])
+            else:
+                work.pop()
+                if len(work):
+                    u = work[-1][0]
+                    low[u] = min(low[u], low[v])
+
+                if low[v] == index[v]:
+                    c = []
+                    while True:
+                        w = stk.pop()
+                        on_stk.discard(w)
+                        c.append(w)
+                        if w == v:
+                            break
+                    ret.append(c)
+
+    return ret
+
+def _elementary_cycles(c, edges):
+    """ Non recursive Johnson's algorithm to list elementary cycles in
+    a strongly connected component, each cycle starts from its minimum vertex.
+    """
+    remaining, cyc = set(c), []
+    out = lambda v: [w for w in edges[v] if w in remaining]
+
+    def _unblock(v, blocked, b):
+        stk = [v]
+        while len(stk):
+            u = stk.pop()
+            if u in blocked:
+                blocked.discard(u)
+                stk.extend(b.pop(u, []))
+
+    for s in sorted(c):
+        blocked, b = set([s]), {}
+        path, closed, work = [s], [False], [(s, iter(out(s)))]
+        while len(work):
+            v, it = work[-1]
+            for w in it:
+                if w == s:
+                    cyc.append(path + [s])
+                    closed[-1] = True
+                elif w not in blocked:
+                    blocked.add(w)
+                    path.append(w)
+                    closed.append(False)
+                    work.append((w, iter(out(w))))
+                    break
+            else:
+                work.pop()
+                path.pop()
+                if closed.pop():
+                    _unblock(v, blocked, b)
+                    if len(closed):
+                        closed[-1] = True
+                else:
+                    for w in out(v):
+                        b.setdefault(w, set()).add(v)
+
+        # cycles passing 's' are all found
+        remaining.discard(s)
+
+    return cyc
+
+def find_cycles(starts, ofn):
+    """ detect cycles reachable from vertices in 'starts'. The graph is built once,
+    then searched only in strongly connected components.
+
+    :param starts: start vertices in graph
+    :param ofn: function to get the list of outgoing edges of a vertex, called once for each vertex
+    :return: cycles, represented the same as 'walk'
+    :rtype: list of lists
+    """
+    edges, stk = {}, list(starts)
+    while len(stk):
+        v = stk.pop()
+        if v in edges:
+            continue
+        # duplicated edges lead to the same cycles
+        edges[v] = list(collections.OrderedDict.fromkeys(ofn(v)))
+        stk.extend(w for w in edges[v] if w not in edges)
+
+    cyc = []
+    for c in scc(starts, edges):
+        if len(c) > 1 or c[0] in edges[c[0]]:
+            cyc.extend(_elementary_cycles(c, edges))
+
+    return cyc
+
 def _diff_(src, dst, ret=None, jp=None, exclude=[], include=[]):
     """ compare 2 dict/list, return a list containing
     json-pointer indicating what's different, and what's diff exactly.
@@ -573,6 +1030,10 @@ def get_or_none(obj, *a):
     return ret
 
 def patch_path(base_path, path):
+    # compressed files are always named with extension
+    if path.endswith('.' + private.FILE_EXT_GZ):
+        return path[1:] if os.name == 'nt' and path.startswith('/') else path
+
     # try to get extension from base_path
     _, ext = os.path.splitext(base_path)
     if ext not in private.VALID_FILE_EXT:
@@ -23,6 +23,10 @@ setup(
         'Programming Language :: Python :: 3.4',
         'Topic :: Software Development :: Libraries :: Python Modules',
     ],
-    install_requires = ['six >= 1.7.2', 'pyaml>=15.03.1', 'validate_email']
+    install_requires = ['six >= 1.7.2', 'pyaml>=15.03.1', 'validate_email', 'futures; python_version < "3"'],
+    extras_require = {
+        # parse json documents incrementally in streaming mode
+        'stream': ['ijson>=3.0'],
+    }
 )
 